@@ -1,12 +1,23 @@
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from dotenv import load_dotenv
 import requests
 import datetime
 import pytz
 
+from ..utils.odds_snapshot import OddsSnapshot
+
 load_dotenv()  # Loads variables from .env into environment
 api_key = os.getenv("ODDS_API_KEY")
 
+# Seconds a fetched scores/odds payload is reused before the Odds API is called again
+ODDS_SNAPSHOT_TTL = float(os.getenv("ODDS_SNAPSHOT_TTL", "60"))
+# Most payloads (and parsed snapshots) kept per process; every distinct ?date= is a key
+ODDS_SNAPSHOT_MAX_ENTRIES = int(os.getenv("ODDS_SNAPSHOT_MAX_ENTRIES", "256"))
+
 SPORT_URL_TO_API_KEY = {
     "nfl": "americanfootball_nfl",
     "mlb": "baseball_mlb",
@@ -21,14 +32,138 @@ SPORT_URL_TO_API_KEY = {
 def convert_sport_url_to_api_key(sport_url_key):
     return SPORT_URL_TO_API_KEY.get(sport_url_key, sport_url_key)
 
+class _SnapshotCache:
+    """Per-key payload snapshots with single-flight refresh.
+
+    A fresh snapshot is returned as-is (callers share it and must not mutate
+    it). When a key is missing or older than ``ttl`` seconds, the first caller
+    fetches it and concurrent callers for the same key wait on that one
+    in-flight request instead of issuing their own. Failures are not cached.
+
+    Expired snapshots are dropped when touched or on the next write, and at
+    most ``maxsize`` are kept, least recently used going first.
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()  # key -> (fetched_at, payload), least recently used first
+        self._inflight = {}              # key -> Future
+
+    def get(self, key, fetch):
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot:
+                if time.monotonic() - snapshot[0] < self.ttl:
+                    self._snapshots.move_to_end(key)
+                    return snapshot[1]
+                del self._snapshots[key]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+
+        if not leader:
+            return flight.result()
+
+        try:
+            payload = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            now = time.monotonic()
+            self._snapshots[key] = (now, payload)
+            self._snapshots.move_to_end(key)
+            _evict(self._snapshots, now - self.ttl, self.maxsize)
+            del self._inflight[key]
+        flight.set_result(payload)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+
+def _evict(entries, expired_before, maxsize):
+    """Drop (stored_at, value) entries stored before ``expired_before``, then the LRU ones past ``maxsize``."""
+    for key in [k for k, (stored_at, _value) in entries.items() if stored_at < expired_before]:
+        del entries[key]
+    while len(entries) > maxsize:
+        entries.popitem(last=False)
+
+
+class _ParsedSnapshots:
+    """OddsSnapshots built from the cached payloads, bounded like _SnapshotCache.
+
+    An entry older than the payload TTL is dropped: its payloads have been (or
+    are about to be) replaced, and keeping it would keep them alive too.
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()  # (sport_key, date_str) -> (built_at, OddsSnapshot)
+
+    def get(self, key, scores, odds):
+        with self._lock:
+            entry = self._snapshots.get(key)
+            if entry:
+                snapshot = entry[1]
+                if snapshot.scores is scores and snapshot.odds is odds and time.monotonic() - entry[0] < self.ttl:
+                    self._snapshots.move_to_end(key)
+                    return snapshot
+                del self._snapshots[key]
+        snapshot = OddsSnapshot(scores, odds)
+        with self._lock:
+            now = time.monotonic()
+            self._snapshots[key] = (now, snapshot)
+            self._snapshots.move_to_end(key)
+            _evict(self._snapshots, now - self.ttl, self.maxsize)
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+
+_snapshots = _SnapshotCache(ODDS_SNAPSHOT_TTL, ODDS_SNAPSHOT_MAX_ENTRIES)
+_parsed = _ParsedSnapshots(ODDS_SNAPSHOT_TTL, ODDS_SNAPSHOT_MAX_ENTRIES)
+
+
+def clear_odds_snapshots():
+    """Drop every cached scores/odds payload (in-flight fetches still complete)."""
+    _snapshots.clear()
+    _parsed.clear()
+
+
+def _fetch_json(url):
+    response = requests.get(url)
+    response.raise_for_status()
+    return response.json()
+
+
+def _localize(date):
+    if date and date.tzinfo is None:
+        return pytz.timezone('US/Eastern').localize(date)
+    return date
+
+
 def get_odds_data(sport, date):
-    eastern_tz = pytz.timezone('US/Eastern')
+    """Return (scores, odds) for a sport, served from a shared snapshot.
+
+    Scores are cached per (sport, date) and odds per sport (the odds endpoint
+    takes no date), so every page, job and sitemap build inside the freshness
+    window reuses one pair of Odds API calls.
+    """
     sport_key = convert_sport_url_to_api_key(sport)
-    if date and date.tzinfo is None:
-        date = eastern_tz.localize(date)
+    date = _localize(date)
     date_str = date.strftime('%Y-%m-%d') if date else ''
     scores_url = f"https://api.the-odds-api.com/v4/sports/{sport_key}/scores/?daysFrom=2&apiKey={api_key}"
-    print(f"Scores URL: {scores_url}")
     if date_str:
         scores_url += f"&date={date_str}&dateFormat=iso"
     # Use 'bovada' for all soccer (matches seed jobs — bovada carries spreads/totals for soccer)
@@ -37,11 +172,22 @@ def get_odds_data(sport, date):
     odds_url = f"https://api.the-odds-api.com/v4/sports/{sport_key}/odds/?apiKey={api_key}&bookmakers={bookmaker}&markets=h2h,spreads,totals&oddsFormat=american"
 
     try:
-        scores_response = requests.get(scores_url)
-        odds_response = requests.get(odds_url)
-        scores_response.raise_for_status()
-        odds_response.raise_for_status()
-        return scores_response.json(), odds_response.json()
+        scores = _snapshots.get(('scores', sport_key, date_str), lambda: _fetch_json(scores_url))
+        odds = _snapshots.get(('odds', sport_key), lambda: _fetch_json(odds_url))
+        return scores, odds
     except requests.exceptions.RequestException as e:
         print(f"Error fetching odds data: {str(e)}")
-        return None, None
\ No newline at end of file
+        return None, None
+
+
+def get_odds_snapshot(sport, date):
+    """Return the shared OddsSnapshot for get_odds_data(sport, date), or None on fetch failure.
+
+    The snapshot is rebuilt only when the underlying payloads are refreshed.
+    """
+    scores, odds = get_odds_data(sport, date)
+    if scores is None or odds is None:
+        return None
+    date = _localize(date)
+    key = (convert_sport_url_to_api_key(sport), date.strftime('%Y-%m-%d') if date else '')
+    return _parsed.get(key, scores, odds)
@@ -1,11 +1,11 @@
-import os
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from dotenv import load_dotenv
 from utils.player_name_utils import normalize_name
 
+from db import get_engine
+
 load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
-engine = create_engine(DATABASE_URL)
+engine = get_engine()
 
 def get_team_id_for_player(player_name):
     normalized = normalize_name(player_name)
@@ -14,3 +14,18 @@ def get_team_id_for_player(player_name):
         if result:
             return result[0], result[1]
         return None, None
+
+def get_team_ids_for_players(player_names):
+    """Resolve many player names in one query: {player_name: (team_id, player_id)}, (None, None) when unknown."""
+    normalized = {name: normalize_name(name) for name in player_names}
+    if not normalized:
+        return {}
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT normalized_name, team_id, id FROM nba_players WHERE normalized_name = ANY(:names)"),
+            {"names": list(set(normalized.values()))}
+        ).fetchall()
+    found = {}
+    for normalized_name, team_id, player_id in rows:
+        found.setdefault(normalized_name, (team_id, player_id))
+    return {name: found.get(key, (None, None)) for name, key in normalized.items()}
@@ -1,10 +1,10 @@
-import os
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from dotenv import load_dotenv
 
+from db import get_engine
+
 load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
-engine = create_engine(DATABASE_URL)
+engine = get_engine()
 
 def get_team_id_by_odds_api_team_name(team_name):
     with engine.connect() as conn:
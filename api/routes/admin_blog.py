@@ -5,7 +5,9 @@ import re
 import requests as http_requests
 from flask import Blueprint, request, jsonify, abort
 from dotenv import load_dotenv
+from psycopg2.extras import RealDictCursor
 
+from db import connection
 from ..services.blog_service import BlogService
 
 load_dotenv()
@@ -40,10 +42,7 @@ def list_all_posts():
 @admin_blog_bp.route("/api/admin/blog/posts/<int:post_id>", methods=["GET"])
 def get_post_admin(post_id):
     try:
-        import psycopg2
-        import psycopg2.extras
-        DATABASE_URL = os.getenv("DATABASE_URL", "").replace("postgres://", "postgresql://")
-        with psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor) as conn:
+        with connection(cursor_factory=RealDictCursor) as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT * FROM blog_posts WHERE id = %s", (post_id,))
                 row = cur.fetchone()
@@ -94,15 +93,11 @@ def delete_post(post_id):
 @admin_blog_bp.route("/api/admin/blog/posts/<int:post_id>/fetch-game-data", methods=["POST"])
 def fetch_game_data(post_id):
     """Re-fetch game data for a blog post using optional overrides."""
-    import psycopg2
-    import psycopg2.extras
-
     body = request.get_json() or {}
 
     # Load existing post to get sport/teams if not overridden
-    DATABASE_URL = os.getenv("DATABASE_URL", "").replace("postgres://", "postgresql://")
     try:
-        with psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor) as conn:
+        with connection(cursor_factory=RealDictCursor) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT sport, sport_key, home_team, away_team, game_date FROM blog_posts WHERE id = %s",
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from cache import cache
 from ..services.database_service import DatabaseService
 from ..services.game_service import GameService
+from ..services.historical.base_service import BaseHistoricalService
 from ..utils.team_slugs import resolve_team_slug
 from ..external_requests.odds_api import convert_sport_url_to_api_key
 
@@ -30,14 +31,20 @@ def check_api_key():
 def get_historical_games(sport_key):
     """Get historical games from database for a sport"""
     limit = request.args.get('limit', 50, type=int)  # Default to 50 games
+
+    try:
+        after = BaseHistoricalService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
     
-    games, error = DatabaseService.get_historical_games(sport_key, limit)
+    games, next_cursor, error = DatabaseService.get_historical_games(sport_key, limit, after)
     
     if error:
         return jsonify({'error': error}), 500
     
     return jsonify({
         'games': games,
+        'next_cursor': next_cursor,
         'count': len(games),
         'sport': sport_key,
         'limit': limit
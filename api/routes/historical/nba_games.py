@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify, abort
 from dotenv import load_dotenv
 
 from ...services.historical.nba_service import NBAService
+from ...utils.json_stream import stream_json_array, wants_stream
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
@@ -35,7 +36,23 @@ def get_nba_games():
     end_date = request.args.get('end_date')
     team = request.args.get('team')
 
-    games, error = NBAService.get_games(limit, start_date, end_date, team)
+    try:
+        after = NBAService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    if wants_stream(request.args):
+        # Export mode: every matching game unless a limit is given, streamed as it is read
+        stream_limit = request.args.get('limit', type=int)
+        stream, error = NBAService.stream_games(stream_limit, start_date, end_date, team, after=after)
+        if error:
+            return jsonify({'error': error}), 500
+        return stream_json_array(stream, 'games', {
+            'sport': 'NBA',
+            'filters': {'limit': stream_limit, 'start_date': start_date, 'end_date': end_date, 'team': team},
+        })
+
+    games, next_cursor, error = NBAService.get_games(limit, start_date, end_date, team, after=after)
 
     if error:
         return jsonify({'error': error}), 500
@@ -49,6 +66,7 @@ def get_nba_games():
             'team': team
         },
         'games': games,
+        'next_cursor': next_cursor,
         'sport': 'NBA'
     })
 
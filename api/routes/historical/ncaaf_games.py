@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify, abort
 from dotenv import load_dotenv
 
 from ...services.historical.ncaaf_service import NCAAFService
+from ...utils.json_stream import stream_json_array, wants_stream
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
@@ -31,13 +32,32 @@ def get_ncaaf_games():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
 
-    games, error = NCAAFService.get_games(limit, start_date, end_date)
+    try:
+        after = NCAAFService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    if wants_stream(request.args):
+        # Export mode: every matching game unless a limit is given, streamed as it is read
+        stream_limit = request.args.get('limit', type=int)
+        stream, error = NCAAFService.stream_games(stream_limit, start_date, end_date, after=after)
+        if error:
+            return jsonify({'error': error}), 500
+        return stream_json_array(stream, 'games', {
+            'sport': 'NCAAF',
+            'limit': stream_limit,
+            'start_date': start_date,
+            'end_date': end_date,
+        })
+
+    games, next_cursor, error = NCAAFService.get_games(limit, start_date, end_date, after=after)
 
     if error:
         return jsonify({'error': error}), 500
 
     return jsonify({
         'games': games,
+        'next_cursor': next_cursor,
         'count': len(games) if games else 0,
         'sport': 'NCAAF',
         'limit': limit,
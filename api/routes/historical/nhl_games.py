@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify, abort
 from dotenv import load_dotenv
 
 from ...services.historical.nhl_service import NHLService
+from ...utils.json_stream import stream_json_array, wants_stream
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
@@ -33,7 +34,23 @@ def get_nhl_games():
     team = request.args.get('team')
     playoffs = request.args.get('playoffs', type=bool)
     
-    games, error = NHLService.get_games(limit, start_date, end_date, team, playoffs)
+    try:
+        after = NHLService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    if wants_stream(request.args):
+        # Export mode: every matching game unless a limit is given, streamed as it is read
+        stream_limit = request.args.get('limit', type=int)
+        stream, error = NHLService.stream_games(stream_limit, start_date, end_date, team, playoffs, after=after)
+        if error:
+            return jsonify({'error': error}), 500
+        return stream_json_array(stream, 'games', {
+            'sport': 'NHL',
+            'filters': {'limit': stream_limit, 'start_date': start_date, 'end_date': end_date, 'team': team, 'playoffs': playoffs},
+        })
+
+    games, next_cursor, error = NHLService.get_games(limit, start_date, end_date, team, playoffs, after=after)
     
     if error:
         return jsonify({'error': error}), 500
@@ -48,6 +65,7 @@ def get_nhl_games():
             'playoffs': playoffs
         },
         'games': games,
+        'next_cursor': next_cursor,
         'sport': 'NHL'
     })
 
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify, abort
 from dotenv import load_dotenv
 
 from ...services.historical.soccer_service import SoccerService
+from ...utils.json_stream import stream_json_array, wants_stream
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
@@ -33,13 +34,30 @@ def get_soccer_games():
     team = request.args.get('team')
     league = request.args.get('league')
     
-    games, error = SoccerService.get_games(limit, start_date, end_date, team, league)
+    try:
+        after = SoccerService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    if wants_stream(request.args):
+        # Export mode: every matching game unless a limit is given, streamed as it is read
+        stream_limit = request.args.get('limit', type=int)
+        stream, error = SoccerService.stream_games(stream_limit, start_date, end_date, team, league, after=after)
+        if error:
+            return jsonify({'error': error}), 500
+        return stream_json_array(stream, 'games', {
+            'sport': 'Soccer',
+            'filters': {'limit': stream_limit, 'start_date': start_date, 'end_date': end_date, 'team': team, 'league': league},
+        })
+
+    games, next_cursor, error = SoccerService.get_games(limit, start_date, end_date, team, league, after=after)
     
     if error:
         return jsonify({'error': error}), 500
     
     return jsonify({
         'games': games,
+        'next_cursor': next_cursor,
         'count': len(games) if games else 0,
         'sport': 'Soccer',
         'filters': {
@@ -60,13 +78,30 @@ def get_epl_games():
     end_date = request.args.get('end_date')
     team = request.args.get('team')
     
-    games, error = SoccerService.get_games(limit, start_date, end_date, team, "EPL")
+    try:
+        after = SoccerService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    if wants_stream(request.args):
+        # Export mode: every matching game unless a limit is given, streamed as it is read
+        stream_limit = request.args.get('limit', type=int)
+        stream, error = SoccerService.stream_games(stream_limit, start_date, end_date, team, "EPL", after=after)
+        if error:
+            return jsonify({'error': error}), 500
+        return stream_json_array(stream, 'games', {
+            'league': 'EPL',
+            'sport': 'Soccer',
+        })
+
+    games, next_cursor, error = SoccerService.get_games(limit, start_date, end_date, team, "EPL", after=after)
     
     if error:
         return jsonify({'error': error}), 500
     
     return jsonify({
         'games': games,
+        'next_cursor': next_cursor,
         'count': len(games) if games else 0,
         'league': 'EPL',
         'sport': 'Soccer'
@@ -98,7 +98,7 @@ def league_trends(league_slug: str):
         limit = int(request.args.get('limit', 50))
         min_trend_length = int(request.args.get('min_trend_length', request.args.get('minTrendLength', 3)))
 
-        games, error = SoccerService.get_games(limit=limit, start_date=game_date, end_date=game_date, league=league)
+        games, _, error = SoccerService.get_games(limit=limit, start_date=game_date, end_date=game_date, league=league)
         if error:
             return jsonify({'error': error}), 500
 
@@ -139,7 +139,7 @@ def analyze_soccer_trends_by_league(league_slug: str):
                     game_date = f"{date_param[0:4]}-{date_param[4:6]}-{date_param[6:8]}"
                 else:
                     game_date = date_param
-                games, err = _WCS.get_games(limit=1000, start_date=game_date, end_date=game_date)
+                games, _, err = _WCS.get_games(limit=1000, start_date=game_date, end_date=game_date)
                 if err:
                     return jsonify({'error': err}), 500
             results, error = WorldcupTrendsService.analyze_multiple_games_trends(
@@ -191,7 +191,7 @@ def analyze_soccer_trends_by_league(league_slug: str):
                 game_date = date_param
 
             # Fetch games for that league/date
-            games, err = SoccerService.get_games(limit=1000, start_date=game_date, end_date=game_date, league=league_db)
+            games, _, err = SoccerService.get_games(limit=1000, start_date=game_date, end_date=game_date, league=league_db)
             if err:
                 return jsonify({'error': err}), 500
 
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify, abort
 from dotenv import load_dotenv
 
 from ...services.historical.worldcup_service import WorldcupService
+from ...utils.json_stream import stream_json_array, wants_stream
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
@@ -28,13 +29,30 @@ def get_worldcup_games():
     end_date = request.args.get('end_date')
     team = request.args.get('team')
 
-    games, error = WorldcupService.get_games(limit, start_date, end_date, team)
+    try:
+        after = WorldcupService.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    if wants_stream(request.args):
+        # Export mode: every matching game unless a limit is given, streamed as it is read
+        stream_limit = request.args.get('limit', type=int)
+        stream, error = WorldcupService.stream_games(stream_limit, start_date, end_date, team, after=after)
+        if error:
+            return jsonify({'error': error}), 500
+        return stream_json_array(stream, 'games', {
+            'sport': 'World Cup',
+            'filters': {'limit': stream_limit, 'start_date': start_date, 'end_date': end_date, 'team': team},
+        })
+
+    games, next_cursor, error = WorldcupService.get_games(limit, start_date, end_date, team, after=after)
 
     if error:
         return jsonify({'error': error}), 500
 
     return jsonify({
         'games': games,
+        'next_cursor': next_cursor,
         'count': len(games) if games else 0,
         'sport': 'World Cup',
         'filters': {
@@ -4,7 +4,7 @@ import os
 import sys
 from collections import defaultdict
 from flask import Blueprint, request, jsonify
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from dotenv import load_dotenv
 
@@ -13,6 +13,7 @@ _project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
+from db import get_engine
 from jobs.mlb_historical_player_actuals_import_reverse import (
     get_historical_game_boxscore,
     build_player_stats_lookup_mlb,
@@ -23,7 +24,6 @@ from jobs.mlb_historical_player_actuals_import_reverse import (
 load_dotenv()
 
 INTERNAL_PASSWORD = os.getenv("INTERNAL_PASSWORD")
-DATABASE_URL = os.getenv("DATABASE_URL", "").replace("postgres://", "postgresql://")
 
 mlb_mismatch_bp = Blueprint("mlb_mismatch", __name__)
 
@@ -38,7 +38,7 @@ def check_internal_password():
 
 
 def _get_engine():
-    return create_engine(DATABASE_URL)
+    return get_engine()
 
 
 def score_candidate(odds_name: str, espn_name: str) -> float:
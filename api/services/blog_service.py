@@ -6,11 +6,12 @@ import json
 import logging
 from datetime import datetime, timezone, date, time
 
-import psycopg2
 import psycopg2.extras
 import anthropic
 from dotenv import load_dotenv
 
+import db
+
 
 class _DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -26,7 +27,6 @@ load_dotenv(override=True)
 
 logger = logging.getLogger(__name__)
 
-DATABASE_URL = os.getenv("DATABASE_URL", "").replace("postgres://", "postgresql://")
 YOUTUBE_DATA_API_KEY = os.getenv("YOUTUBE_DATA_API_KEY")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
@@ -38,7 +38,8 @@ _SPORT_KEY_MAP = {
 
 
 def _get_conn():
-    return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
+    """Pooled connection for a ``with`` block: commits on success, returns to the pool."""
+    return db.connection(cursor_factory=psycopg2.extras.RealDictCursor)
 
 
 # ---------------------------------------------------------------------------
@@ -593,3 +594,22 @@ Return ONLY valid JSON (no markdown code fences) with these exact keys:
             return [r['slug'] for r in rows], None
         except Exception as e:
             return [], str(e)
+
+    @staticmethod
+    def get_published_sitemap_entries():
+        """Return [(slug, last_modified)] for every published post (for sitemap lastmod)."""
+        try:
+            with _get_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT slug, GREATEST(updated_at, published_at) AS last_modified
+                        FROM blog_posts
+                        WHERE status = 'published'
+                        ORDER BY published_at DESC
+                        """
+                    )
+                    rows = cur.fetchall()
+            return [(r['slug'], r['last_modified']) for r in rows], None
+        except Exception as e:
+            return [], str(e)
@@ -1,12 +1,13 @@
 import os
 from typing import List, Dict, Optional, Tuple
-import psycopg2
 from psycopg2.extras import RealDictCursor
-from urllib.parse import urlparse
 from datetime import date, time, datetime
 import json
 from dotenv import load_dotenv
 
+from db import get_connection
+from .historical.base_service import BaseHistoricalService
+
 load_dotenv()
 
 class DatabaseService:
@@ -34,30 +35,20 @@ class DatabaseService:
     
     @staticmethod
     def _get_connection():
-        """Get database connection from DATABASE_URL"""
+        """Check a connection out of the shared pool (close() returns it)."""
         try:
-            database_url = os.getenv('DATABASE_URL')
-            if not database_url:
-                raise ValueError("DATABASE_URL environment variable not set")
-            
-            # Parse the DATABASE_URL
-            parsed = urlparse(database_url)
-            
-            conn = psycopg2.connect(
-                host=parsed.hostname,
-                database=parsed.path[1:],  # Remove leading slash
-                user=parsed.username,
-                password=parsed.password,
-                port=parsed.port or 5432
-            )
-            return conn
+            return get_connection()
         except Exception as e:
             print(f"Database connection error: {e}")
             return None
     
     @staticmethod
-    def get_historical_games(sport_key: str, limit: int = 50) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get historical games for a sport"""
+    def get_historical_games(
+        sport_key: str,
+        limit: int = 50,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of historical games for a sport (newest first) and the next page's cursor"""
         table_name = f"{sport_key}_games"
         
         query = f"""
@@ -78,26 +69,22 @@ class DatabaseService:
             start_time,
             total
         FROM {table_name}
-        ORDER BY game_date DESC
-        LIMIT %s
+        WHERE 1=1
         """
         
         conn = DatabaseService._get_connection()
         if not conn:
-            return None, "Database connection failed"
+            return None, None, "Database connection failed"
         
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (limit,))
-                games = cursor.fetchall()
-                
-                # Convert to list of dicts and handle datetime serialization
-                games_list = [dict(game) for game in games]
-                processed_games = DatabaseService._process_games_list(games_list)
-                return processed_games, None
+            games_list, next_cursor = BaseHistoricalService._fetch_games_page(conn, query, [], limit, after)
+
+            # Handle datetime serialization
+            processed_games = DatabaseService._process_games_list(games_list)
+            return processed_games, next_cursor, None
                 
         except Exception as e:
-            return None, f"Database query error: {str(e)}"
+            return None, None, f"Database query error: {str(e)}"
         finally:
             conn.close()
     
@@ -14,6 +14,9 @@ BREVO_LIST_ID = int(_BREVO_LIST_ID_RAW) if _BREVO_LIST_ID_RAW.isdigit() else 0
 BREVO_SENDER_EMAIL = os.getenv("BREVO_SENDER_EMAIL", "")
 BREVO_SENDER_NAME = os.getenv("BREVO_SENDER_NAME", "GetSTAM")
 
+# Brevo accepts at most 2000 recipients per messageVersions request
+BREVO_MAX_BATCH_RECIPIENTS = 2000
+
 
 def _client():
     from brevo import Brevo
@@ -107,3 +110,48 @@ class EmailService:
         except Exception as e:
             logger.error("EmailService.send_digest_to_one error: %s", e)
             return False, str(e)
+
+    @staticmethod
+    def send_digest_batch(recipients, subject, html_content):
+        """
+        Send one rendered email to many recipients in a single request, each
+        as its own message version (recipients never see each other).
+
+        recipients: list of (email, params) — params fill the {{ params.* }}
+                    placeholders in html_content for that recipient.
+        At most BREVO_MAX_BATCH_RECIPIENTS per call.
+        Returns (True, None, False) or (False, err_str, retryable). retryable
+        is True only when the failure shows Brevo did not accept the request
+        (no connection, 429, other 4xx); after a timeout or 5xx the emails may
+        already be on their way, so resending could duplicate them. The SDK's
+        own retries are turned off for the same reason.
+        """
+        try:
+            _client().transactional_emails.send_transac_email(
+                sender={"name": BREVO_SENDER_NAME, "email": BREVO_SENDER_EMAIL},
+                reply_to={"name": BREVO_SENDER_NAME, "email": BREVO_SENDER_EMAIL},
+                subject=subject,
+                html_content=html_content,
+                message_versions=[
+                    {"to": [{"email": email}], "params": params}
+                    for email, params in recipients
+                ],
+                request_options={"max_retries": 0},
+            )
+            return True, None, False
+
+        except Exception as e:
+            logger.error("EmailService.send_digest_batch error: %s", e)
+            return False, str(e), _not_accepted(e)
+
+
+def _not_accepted(error):
+    """True when a send failure proves the request was never accepted."""
+    import httpx
+    from brevo.core.api_error import ApiError
+
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    if isinstance(error, ApiError) and error.status_code is not None:
+        return 400 <= error.status_code < 500
+    return False
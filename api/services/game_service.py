@@ -2,22 +2,20 @@
 Game service for handling game-related business logic
 """
 from datetime import datetime, date
-import os
 import pytz
 from dateutil import parser
-import psycopg2
 from psycopg2.extras import RealDictCursor
-from urllib.parse import urlparse
 
-from ..external_requests.odds_api import get_odds_data
+from db import get_connection
+
+from ..external_requests.odds_api import get_odds_snapshot
 from ..utils.date_utils import (
     convert_to_eastern, 
     get_next_game_date_within_7_days, 
-    filter_games_by_date,
     format_commence_time,
     is_today
 )
-from ..utils.odds_formatter import extract_scores, process_odds_data
+from ..utils.odds_formatter import extract_scores
 
 eastern_tz = pytz.timezone('US/Eastern')
 
@@ -31,18 +29,21 @@ class GameService:
                 datetime.strptime(current_date, '%Y-%m-%d')
             )
 
-        scores, odds = get_odds_data(sport_key, selected_date_start)
-        if scores is None or odds is None:
+        snapshot = get_odds_snapshot(sport_key, selected_date_start)
+        if snapshot is None:
             return None, 'Error fetching odds data'
 
-        filtered_scores = filter_games_by_date(scores, selected_date_start)
+        if selected_date_start:
+            filtered_scores = snapshot.games_on(selected_date_start.date())
+        else:
+            filtered_scores = snapshot.scores
 
         next_game_date = None
         if selected_date_start and not filtered_scores:
-            next_game_date = get_next_game_date_within_7_days(scores, selected_date_start)
+            next_game_date = get_next_game_date_within_7_days(snapshot.scores, selected_date_start)
 
         formatted_games = [
-            GameService._format_game_data(match, odds, selected_date_start)
+            GameService._format_game_data(match, snapshot, selected_date_start)
             for match in filtered_scores
         ]
 
@@ -54,19 +55,19 @@ class GameService:
     @staticmethod
     def get_single_game(sport_key, game_id):
         """Get a single game by game_id"""
-        scores, odds = get_odds_data(sport_key, None)
-        if scores is None or odds is None:
+        snapshot = get_odds_snapshot(sport_key, None)
+        if snapshot is None:
             return None, 'Error fetching odds data'
 
-        game = next((g for g in scores if g['id'] == game_id), None)
+        game = snapshot.get(game_id)
         if not game:
             return None, 'Game not found'
 
-        formatted_game = GameService._format_game_data(game, odds)
+        formatted_game = GameService._format_game_data(game, snapshot)
         return {'game': formatted_game}, None
 
     @staticmethod
-    def _format_game_data(match, odds, selected_date_start=None):
+    def _format_game_data(match, snapshot, selected_date_start=None):
         """Format a single game's data"""
         home_team = match.get('home_team', 'N/A')
         away_team = match.get('away_team', 'N/A')
@@ -74,8 +75,8 @@ class GameService:
         # Extract scores
         home_score, away_score = extract_scores(match)
 
-        # Process odds
-        home_odds, away_odds, totals, draw_odds = process_odds_data(match, odds, home_team, away_team)
+        # Odds were extracted once when the snapshot was built
+        home_odds, away_odds, totals, draw_odds = snapshot.markets(match)
         # Format commence time
         commence_time_formatted = format_commence_time(match.get('commence_time'))
 
@@ -132,16 +133,13 @@ class GameService:
         Tries live Odds API data first, then falls back to the sport's historical DB table
         (for games that have aged out of the Odds API's lookback window).
         Returns ({"game_id":..., "source": "live"|"db", "game": {...}}, None) or (None, error)."""
-        # Live path: reuse the existing today/date games flow, filter by team names.
-        result, err = GameService.get_games_for_date(sport_key, date_str)
-        if not err and result:
-            matches = [
-                g for g in result['games']
-                if g['away']['team'] == away_odds_name and g['home']['team'] == home_odds_name
-            ]
-            matches.sort(key=lambda g: g.get('commence_time') or '')
+        # Live path: look the matchup up in the date's odds snapshot and format only that game.
+        selected_date_start = eastern_tz.localize(datetime.strptime(date_str, '%Y-%m-%d'))
+        snapshot = get_odds_snapshot(sport_key, selected_date_start)
+        if snapshot is not None:
+            matches = snapshot.find(away_odds_name, home_odds_name, selected_date_start.date())
             if len(matches) >= occurrence:
-                game = matches[occurrence - 1]
+                game = GameService._format_game_data(matches[occurrence - 1], snapshot, selected_date_start)
                 return {"game_id": game['game_id'], "source": "live", "game": game}, None
 
         # DB fallback: exact match by team names + date against the sport's historical table.
@@ -209,25 +207,17 @@ class GameService:
         if sport_key != 'baseball_mlb':
             return None, 'Not supported'
         try:
-            database_url = os.getenv('DATABASE_URL')
-            if not database_url:
-                return None, 'Database connection failed'
-            parsed = urlparse(database_url)
-            conn = psycopg2.connect(
-                host=parsed.hostname,
-                database=parsed.path[1:],
-                user=parsed.username,
-                password=parsed.password,
-                port=parsed.port or 5432
-            )
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            cur.execute(
-                "SELECT * FROM mlb_games WHERE odds_event_id = %s LIMIT 1",
-                (odds_event_id,)
-            )
-            row = cur.fetchone()
-            cur.close()
-            conn.close()
+            conn = get_connection()
+            try:
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+                cur.execute(
+                    "SELECT * FROM mlb_games WHERE odds_event_id = %s LIMIT 1",
+                    (odds_event_id,)
+                )
+                row = cur.fetchone()
+                cur.close()
+            finally:
+                conn.close()
             if not row:
                 return None, 'Game not found'
             return {
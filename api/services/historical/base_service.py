@@ -1,18 +1,83 @@
 """Base historical data service with common database functionality."""
 
+import base64
+import binascii
+import itertools
 import os
-from typing import List, Dict, Optional, Tuple
-import psycopg2
+from typing import Callable, List, Dict, Optional, Tuple
 from psycopg2.extras import RealDictCursor
-from urllib.parse import urlparse
 from datetime import date, time, datetime
 import json
 from dotenv import load_dotenv
 
+from db import get_connection
+from .streak_engine import StreakValues, current_streaks
+
 load_dotenv()
 
+_stream_ids = itertools.count(1)
+
+
+class GameStream:
+    """
+    Iterator over the rows of a server-side (named) cursor.
+
+    Rows arrive from Postgres `itersize` at a time, so memory stays flat no
+    matter how many games match. The pooled connection is returned when the
+    rows run out or `close()` is called (Werkzeug closes a streamed response's
+    iterable even when the client disconnects). The connection comes from the
+    small 'export' pool (see db.py), so slow clients can't drain the shared one.
+    """
+
+    def __init__(self, conn, cursor, transform: Callable[[Dict], Dict]):
+        self._conn = conn
+        self._cursor = cursor
+        self._transform = transform
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict:
+        if self._cursor is None:
+            raise StopIteration
+        try:
+            row = next(self._cursor)
+        except Exception:
+            # Exhausted (StopIteration) or failed: either way we're done with the connection
+            self.close()
+            raise
+        return self._transform(dict(row))
+
+    def close(self):
+        if self._cursor is None:
+            return
+        cursor, self._cursor = self._cursor, None
+        try:
+            cursor.close()
+            self._conn.rollback()
+        finally:
+            self._conn.close()
+
+
 class BaseHistoricalService:
     """Base service for handling historical sports data operations"""
+
+    # Streak engine settings for the trends services (see streak_engine.py)
+    STREAK_TYPES: Tuple[str, ...] = ('win_streak', 'loss_streak', 'over_streak', 'under_streak')
+    STREAK_BREAK_ON_MISSING: Tuple[str, ...] = ()
+    STREAK_SORT_BY_DATE = True
+    STREAK_DESCRIPTIONS = {
+        'win_streak':      'Won {n} straight games',
+        'loss_streak':     'Lost {n} straight games',
+        'draw_streak':     'Drew {n} straight games',
+        'cover_streak':    'Covered {n} straight spreads',
+        'no_cover_streak': 'Failed to cover {n} straight spreads',
+        'over_streak':     'Total went OVER {n} straight games',
+        'under_streak':    'Total went UNDER {n} straight games',
+    }
+
+    # Rows fetched per round trip by the server-side cursor behind _stream_games
+    STREAM_BATCH_SIZE = int(os.getenv('HISTORICAL_STREAM_BATCH_SIZE', '2000'))
     
     @staticmethod
     def _serialize_datetime_objects(obj):
@@ -56,25 +121,301 @@ class BaseHistoricalService:
             result.append(t)
         return result
 
+    @classmethod
+    def _streak_values(cls, game: Dict, team_name: str) -> StreakValues:
+        """(team_score, opponent_score, team_line, total_score, total_line) for one game."""
+        raise NotImplementedError
+
+    @classmethod
+    def _format_streak_trend(cls, streak_type: str, count: int, team_name: str) -> Dict:
+        return {
+            'type': streak_type,
+            'count': count,
+            'description': cls.STREAK_DESCRIPTIONS[streak_type].format(n=count),
+        }
+
+    @classmethod
+    def _analyze_team_trends_batch(cls, requests: List[Tuple[List[Dict], str]], min_trend_length: int) -> List[List[Dict]]:
+        """Current streak trends for many (games, team_name) lists in one vectorized pass."""
+        sequences = []
+        for games, team_name in requests:
+            if not games or len(games) < min_trend_length:
+                sequences.append([])
+                continue
+            if cls.STREAK_SORT_BY_DATE:
+                # Most recent first (stable, so same-day games keep their order)
+                games = sorted(games, key=lambda x: x['game_date'], reverse=True)
+            sequences.append([cls._streak_values(g, team_name) for g in games])
+
+        streaks = current_streaks(sequences, cls.STREAK_TYPES, cls.STREAK_BREAK_ON_MISSING)
+
+        results = []
+        for (_, team_name), sequence, counts in zip(requests, sequences, streaks):
+            results.append([
+                cls._format_streak_trend(streak_type, counts[streak_type], team_name)
+                for streak_type in cls.STREAK_TYPES
+                if sequence and counts[streak_type] >= min_trend_length
+            ])
+        return results
+
+    @classmethod
+    def _analyze_team_trends(cls, games: List[Dict], team_name: str, min_trend_length: int = 3) -> List[Dict]:
+        """Analyze current streak trends for a single team's games."""
+        return cls._analyze_team_trends_batch([(games, team_name)], min_trend_length)[0]
+
+    @classmethod
+    def _fill_slate_trends(cls, results: List[Optional[Dict]], pending: List[Tuple], min_trend_length: int) -> None:
+        """
+        Analyze every game list queued for a slate at once and write each game's
+        trends into its placeholder in `results`.
+
+        `pending` holds (result_index, game, home_team, away_team, variants) where
+        variants are the six (games, team_name) lists in this order: home team,
+        away team, H2H, home team at home, away team on the road, H2H at home.
+        """
+        requests = [variant for *_, variants in pending for variant in variants]
+        trend_lists = cls._analyze_team_trends_batch(requests, min_trend_length)
+
+        for n, (index, game, home_team, away_team, _) in enumerate(pending):
+            (home_team_trends, away_team_trends, h2h_trends,
+             home_team_home_trends, away_team_away_trends, home_at_home_trends) = trend_lists[n * 6:(n + 1) * 6]
+            head_to_head_trends = cls._apply_h2h_context(h2h_trends, home_team, away_team)
+            home_at_home_h2h_trends = cls._apply_h2h_context(home_at_home_trends, home_team, away_team, at_home=True)
+
+            has_trends = (len(home_team_trends) > 0 or len(away_team_trends) > 0 or
+                          len(head_to_head_trends) > 0 or len(home_team_home_trends) > 0 or
+                          len(away_team_away_trends) > 0 or len(home_at_home_h2h_trends) > 0)
+
+            results[index] = {
+                'game': game,
+                'homeTeamTrends': home_team_trends,
+                'awayTeamTrends': away_team_trends,
+                'headToHeadTrends': head_to_head_trends,
+                'homeTeamHomeTrends': home_team_home_trends,
+                'awayTeamAwayTrends': away_team_away_trends,
+                'homeAtHomeH2HTrends': home_at_home_h2h_trends,
+                'hasTrends': has_trends
+            }
+
+    @staticmethod
+    def _fetch_recent_team_games(
+        conn,
+        sport: str,
+        table: str,
+        columns: Optional[List[str]],
+        db_names: Dict[str, str],
+        limit: int,
+        league: Optional[str] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Each team's `limit` most recent games, plus its `limit` most recent home
+        and away games, in one query over team_game_log.
+
+        `db_names` maps each stored team name to the requested team it stands
+        for. Rows are full `table` rows (`columns`, or every column when None)
+        with a `team_side` key, newest first; a game appears once per team.
+        """
+        league_filter = " AND league = %(league)s" if league else ""
+        recent = f"""
+            SELECT game_id, side, game_date FROM team_game_log
+            WHERE sport = %(sport)s AND team_name = n.name{league_filter}{{side}}
+            ORDER BY game_date DESC, game_id DESC
+            LIMIT %(limit)s
+        """
+        selected = ', '.join(f'g.{c}' for c in columns) if columns else 'g.*'
+        query = f"""
+            SELECT n.name AS log_team_name, l.side AS team_side, {selected}
+            FROM unnest(%(names)s::text[]) AS n(name)
+            CROSS JOIN LATERAL (
+                ({recent.format(side='')})
+                UNION
+                ({recent.format(side=" AND side = 'home'")})
+                UNION
+                ({recent.format(side=" AND side = 'away'")})
+            ) l
+            JOIN {table} g ON g.game_id = l.game_id
+            ORDER BY g.game_date DESC, g.game_id DESC
+        """
+        params = {'names': list(db_names), 'sport': sport, 'limit': limit, 'league': league}
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        team_games: Dict[str, List[Dict]] = {team: [] for team in db_names.values()}
+        seen = set()
+        for row in rows:
+            game = dict(row)
+            team = db_names[game.pop('log_team_name')]
+            key = (team, game['game_id'], game['team_side'])
+            if key not in seen:
+                seen.add(key)
+                team_games[team].append(game)
+        return team_games
+
+    @staticmethod
+    def _fetch_head_to_head_games(
+        conn,
+        table: str,
+        columns: Optional[List[str]],
+        team_pairs: List[Tuple[str, str]],
+        team_id_map: Dict[str, int],
+        limit: int,
+    ) -> Dict[Tuple[str, str], List[Dict]]:
+        """
+        The `limit` most recent meetings of every (home, away) pair, at either
+        venue, in one query.
+
+        Pairs are matched on the unordered (LEAST, GREATEST) team-id pair that
+        the ix_<table>_team_pair indexes are built on. Each game carries
+        home_team_orig / away_team_orig, the requested names of its two teams.
+        Pairs missing a team id get an empty list.
+        """
+        h2h_results: Dict[Tuple[str, str], List[Dict]] = {pair: [] for pair in team_pairs}
+        pairs_by_ids: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+        for home_team, away_team in team_pairs:
+            home_id, away_id = team_id_map.get(home_team), team_id_map.get(away_team)
+            if home_id and away_id:
+                pairs_by_ids.setdefault((min(home_id, away_id), max(home_id, away_id)), []).append((home_team, away_team))
+        if not pairs_by_ids:
+            return h2h_results
+
+        selected = ', '.join(columns) if columns else '*'
+        query = f"""
+            SELECT p.lo AS pair_lo, p.hi AS pair_hi, g.*
+            FROM unnest(%(lo)s::int[], %(hi)s::int[]) AS p(lo, hi)
+            CROSS JOIN LATERAL (
+                SELECT {selected}
+                FROM {table}
+                WHERE LEAST(home_team_id, away_team_id) = p.lo
+                  AND GREATEST(home_team_id, away_team_id) = p.hi
+                ORDER BY game_date DESC
+                LIMIT %(limit)s
+            ) g
+            ORDER BY p.lo, p.hi, g.game_date DESC
+        """
+        id_pairs = list(pairs_by_ids)
+        params = {'lo': [lo for lo, _ in id_pairs], 'hi': [hi for _, hi in id_pairs], 'limit': limit}
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        reverse_team_id_map = {v: k for k, v in team_id_map.items()}
+        for row in rows:
+            game = dict(row)
+            pairs = pairs_by_ids[(game.pop('pair_lo'), game.pop('pair_hi'))]
+            game['home_team_orig'] = reverse_team_id_map.get(game['home_team_id'])
+            game['away_team_orig'] = reverse_team_id_map.get(game['away_team_id'])
+            for n, pair in enumerate(pairs):
+                h2h_results[pair].append(game if n == 0 else dict(game))
+        return h2h_results
+
+    @staticmethod
+    def encode_cursor(game_date: date, game_id: int) -> str:
+        """Opaque page token for the games after (game_date, game_id) in newest-first order."""
+        payload = json.dumps([game_date.isoformat(), game_id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token: Optional[str]) -> Optional[Tuple[date, int]]:
+        """(game_date, game_id) from a page token; None for no token. Raises ValueError if malformed."""
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            game_date, game_id = json.loads(raw)
+            if not isinstance(game_id, int) or isinstance(game_id, bool):
+                raise ValueError
+            return date.fromisoformat(game_date), game_id
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError(f"Invalid cursor: {token!r}")
+
+    @classmethod
+    def _fetch_games_page(
+        cls,
+        conn,
+        query: str,
+        params: List,
+        limit: int,
+        after: Optional[Tuple[date, int]] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One newest-first page of games by keyset on (game_date, game_id).
+
+        `query` is a SELECT (including game_date and game_id) ending in its
+        WHERE clause; the keyset condition, ORDER BY and LIMIT are appended
+        here. `after` is a decoded cursor. Every page is a seek on the
+        ix_<table>_date_id index, so deep pages cost the same as the first.
+        Returns the raw rows and the token for the next page (None on the last).
+        """
+        limit = max(limit, 1)
+        params = list(params)
+        if after:
+            query += " AND (game_date, game_id) < (%s, %s)"
+            params.extend(after)
+        query += " ORDER BY game_date DESC, game_id DESC LIMIT %s"
+        params.append(limit + 1)
+
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cls.encode_cursor(rows[-1]['game_date'], rows[-1]['game_id'])
+        return rows, next_cursor
+
+    @classmethod
+    def _stream_games(
+        cls,
+        query: str,
+        params: List,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
+        transform: Optional[Callable[[Dict], Dict]] = None,
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """
+        Stream the games of `query` newest first through a server-side cursor.
+
+        `query` has the same shape as for _fetch_games_page; `limit` may be
+        None for every matching game. Rows are serialized as they are read
+        (after `transform`, if given). The query is declared before returning,
+        so connection and SQL errors come back as the error string rather than
+        in the middle of a response.
+        """
+        params = list(params)
+        if after:
+            query += " AND (game_date, game_id) < (%s, %s)"
+            params.extend(after)
+        query += " ORDER BY game_date DESC, game_id DESC"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        conn = cls._get_connection(name='export')
+        if not conn:
+            return None, "Database connection failed"
+        try:
+            cursor = conn.cursor(f'games_stream_{next(_stream_ids)}', cursor_factory=RealDictCursor)
+            cursor.itersize = cls.STREAM_BATCH_SIZE
+            cursor.execute(query, params)
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            return None, f"Error streaming games: {str(e)}"
+
+        def serialize(game: Dict) -> Dict:
+            if transform:
+                game = transform(game)
+            return {key: cls._serialize_datetime_objects(value) for key, value in game.items()}
+
+        return GameStream(conn, cursor, serialize), None
+
     @staticmethod
-    def _get_connection():
-        """Get database connection from DATABASE_URL"""
+    def _get_connection(name: str = 'default'):
+        """Check a connection out of the `name` pool (close() returns it)."""
         try:
-            database_url = os.getenv('DATABASE_URL')
-            if not database_url:
-                raise ValueError("DATABASE_URL environment variable not set")
-            
-            # Parse the DATABASE_URL
-            parsed = urlparse(database_url)
-            
-            conn = psycopg2.connect(
-                host=parsed.hostname,
-                database=parsed.path[1:],  # Remove leading slash
-                user=parsed.username,
-                password=parsed.password,
-                port=parsed.port or 5432
-            )
-            return conn
+            return get_connection(name=name)
         except Exception as e:
             print(f"Database connection error: {e}")
             return None
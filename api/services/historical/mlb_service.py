@@ -4,93 +4,114 @@ from typing import List, Dict, Optional, Tuple
 import json
 from datetime import datetime, date, time
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 class MLBService(BaseHistoricalService):
     """Service for handling MLB historical data operations"""
     
+    @staticmethod
+    def _parse_inning_runs(game_dict: Dict) -> Dict:
+        """Decode the stored inning-by-inning JSON in place (empty list if unreadable)."""
+        # Parse home_inning_runs JSON if present
+        if game_dict.get('home_inning_runs'):
+            try:
+                game_dict['home_inning_runs'] = json.loads(game_dict['home_inning_runs'])
+            except (json.JSONDecodeError, TypeError):
+                game_dict['home_inning_runs'] = []
+
+        # Parse away_inning_runs JSON if present
+        if game_dict.get('away_inning_runs'):
+            try:
+                game_dict['away_inning_runs'] = json.loads(game_dict['away_inning_runs'])
+            except (json.JSONDecodeError, TypeError):
+                game_dict['away_inning_runs'] = []
+        return game_dict
+
+    @staticmethod
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        playoffs: Optional[bool] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over mlb_games shared by get_games and stream_games."""
+        query = """
+            SELECT 
+                game_id, game_date, away_team_name, home_team_name, away_runs, home_runs,
+                home_line, away_line, home_inning_runs, away_inning_runs,
+                home_starting_pitcher, away_starting_pitcher, playoffs,
+                start_time, total, created_date, modified_date
+            FROM mlb_games
+            WHERE 1=1
+        """
+        
+        params = []
+        
+        # Add filters
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        
+        if team:
+            query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
+            params.extend([f"%{team}%", f"%{team}%"])
+        
+        if playoffs is not None:
+            query += " AND playoffs = %s"
+            params.append(playoffs)
+        return query, params
+
     @staticmethod
     def get_games(
         limit: int = 50,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         team: Optional[str] = None,
-        playoffs: Optional[bool] = None
-    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get MLB historical games from database."""
+        playoffs: Optional[bool] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of MLB historical games (newest first) and the next page's cursor."""
         try:
             conn = MLBService._get_connection()
             if not conn:
-                return None, "Database connection failed"
+                return None, None, "Database connection failed"
             
             # Build the query
-            query = """
-                SELECT 
-                    game_id, game_date, away_team_name, home_team_name, away_runs, home_runs,
-                    home_line, away_line, home_inning_runs, away_inning_runs,
-                    home_starting_pitcher, away_starting_pitcher, playoffs,
-                    start_time, total, created_date, modified_date
-                FROM mlb_games
-                WHERE 1=1
-            """
-            
-            params = []
-            
-            # Add filters
-            if start_date:
-                query += " AND game_date >= %s"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND game_date <= %s"
-                params.append(end_date)
-            
-            if team:
-                query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
-                params.extend([f"%{team}%", f"%{team}%"])
-            
-            if playoffs is not None:
-                query += " AND playoffs = %s"
-                params.append(playoffs)
-            
-            # Add ordering and limit
-            query += " ORDER BY game_date DESC LIMIT %s"
-            params.append(limit)
+            query, params = MLBService._games_query(start_date, end_date, team, playoffs)
             
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                games = cursor.fetchall()
-                
-                # Convert to list of dicts and handle JSON parsing
-                games_list = []
-                for game in games:
-                    game_dict = dict(game)
-                    
-                    # Parse home_inning_runs JSON if present
-                    if game_dict.get('home_inning_runs'):
-                        try:
-                            game_dict['home_inning_runs'] = json.loads(game_dict['home_inning_runs'])
-                        except (json.JSONDecodeError, TypeError):
-                            game_dict['home_inning_runs'] = []
-                    
-                    # Parse away_inning_runs JSON if present
-                    if game_dict.get('away_inning_runs'):
-                        try:
-                            game_dict['away_inning_runs'] = json.loads(game_dict['away_inning_runs'])
-                        except (json.JSONDecodeError, TypeError):
-                            game_dict['away_inning_runs'] = []
-                    
-                    games_list.append(game_dict)
-                
-                processed_games = MLBService._process_games_list(games_list)
-                return processed_games, None
+            # Ordering, limit and the page cursor
+            games_list, next_cursor = MLBService._fetch_games_page(conn, query, params, limit, after)
+
+            # Handle JSON parsing
+            for game_dict in games_list:
+                MLBService._parse_inning_runs(game_dict)
+
+            processed_games = MLBService._process_games_list(games_list)
+            return processed_games, next_cursor, None
                 
         except Exception as e:
-            return None, f"Error fetching MLB games: {str(e)}"
+            return None, None, f"Error fetching MLB games: {str(e)}"
         finally:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        playoffs: Optional[bool] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream MLB historical games (newest first) through a server-side cursor, for exports."""
+        query, params = MLBService._games_query(start_date, end_date, team, playoffs)
+        return MLBService._stream_games(query, params, limit, after, transform=MLBService._parse_inning_runs)
+
     @staticmethod
     def get_game_by_id(game_id: str) -> Tuple[Optional[Dict], Optional[str]]:
         """Get a specific MLB game by ID."""
@@ -7,6 +7,7 @@ import concurrent.futures
 import time
 
 from .base_service import BaseHistoricalService
+from .streak_engine import StreakValues
 from .mlb_service import MLBService
 
 
@@ -39,13 +40,14 @@ class MLBTrendsService(BaseHistoricalService):
             print(f"Found {len(all_teams)} unique teams: {list(all_teams)}")
             
             # Step 2: Batch fetch all team games data in one or two queries
-            all_team_games = cls._batch_fetch_all_team_games(all_teams, limit * 4)  # Get more data for home/away splits
+            all_team_games = cls._batch_fetch_all_team_games(all_teams, limit)
 
             # Step 3: Batch fetch head-to-head data for all team pairs
             all_h2h_games = cls._batch_fetch_all_head_to_head_games(team_pairs, limit * 2)
             
             # Step 4: Analyze trends for each game using the cached data
             results = []
+            pending = []
             for game in games:
                 home_team = game.get('home', {}).get('team') or game.get('home_team_name')
                 away_team = game.get('away', {}).get('team') or game.get('away_team_name')
@@ -82,31 +84,19 @@ class MLBTrendsService(BaseHistoricalService):
                         home_at_home_h2h.append(g_copy)
                 home_at_home_h2h = home_at_home_h2h[:limit]
 
-                # Analyze trends using the filtered data
-                home_team_trends = cls._analyze_team_trends(home_team_games, home_team, min_trend_length)
-                away_team_trends = cls._analyze_team_trends(away_team_games, away_team, min_trend_length)
-                head_to_head_trends = cls._apply_h2h_context(
-                    cls._analyze_team_trends(h2h_games, home_team, min_trend_length), home_team, away_team)
-                home_team_home_trends = cls._analyze_team_trends(home_team_home_games, home_team, min_trend_length)
-                away_team_away_trends = cls._analyze_team_trends(away_team_away_games, away_team, min_trend_length)
-                home_at_home_h2h_trends = cls._apply_h2h_context(
-                    cls._analyze_team_trends(home_at_home_h2h, home_team, min_trend_length), home_team, away_team, at_home=True)
+                # Queue this game's six variants; the whole slate is analyzed in one pass below
+                results.append(None)
+                pending.append((len(results) - 1, game, home_team, away_team, [
+                    (home_team_games, home_team),
+                    (away_team_games, away_team),
+                    (h2h_games, home_team),
+                    (home_team_home_games, home_team),
+                    (away_team_away_games, away_team),
+                    (home_at_home_h2h, home_team),
+                ]))
 
-                has_trends = (len(home_team_trends) > 0 or len(away_team_trends) > 0 or
-                              len(head_to_head_trends) > 0 or len(home_team_home_trends) > 0 or
-                              len(away_team_away_trends) > 0 or len(home_at_home_h2h_trends) > 0)
+            cls._fill_slate_trends(results, pending, min_trend_length)
 
-                results.append({
-                    'game': game,
-                    'homeTeamTrends': home_team_trends,
-                    'awayTeamTrends': away_team_trends,
-                    'headToHeadTrends': head_to_head_trends,
-                    'homeTeamHomeTrends': home_team_home_trends,
-                    'awayTeamAwayTrends': away_team_away_trends,
-                    'homeAtHomeH2HTrends': home_at_home_h2h_trends,
-                    'hasTrends': has_trends
-                })
-            
             end_time = time.time()
             print(f"MLB trends analysis completed in {end_time - start_time:.2f} seconds")
             
@@ -118,67 +108,25 @@ class MLBTrendsService(BaseHistoricalService):
     
     @classmethod
     def _batch_fetch_all_team_games(cls, teams: Set[str], limit: int) -> Dict[str, List[Dict]]:
-        """Batch fetch games for all teams in one database query."""
+        """Batch fetch each team's most recent games (overall, home and away) in one query."""
+        conn = None
         try:
             import sys
             sys.path.append('/Users/stephaniegillen/Projects/get-stam-api')
             from shared_utils import convert_team_name
             
-            # Convert all team names to database format
-            db_team_names = [convert_team_name(team) for team in teams]
-            
             conn = MLBService._get_connection()
             if not conn:
                 return {}
             
-            # Single query to get all games for all teams
-            placeholders = ','.join(['%s'] * len(db_team_names))
-            query = f"""
-                SELECT 
-                    game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
-                    home_runs, away_runs, total_runs, home_line, away_line,
-                    home_money_line, away_money_line, start_time, total
-                FROM mlb_games
-                WHERE home_team_name IN ({placeholders}) OR away_team_name IN ({placeholders})
-                ORDER BY game_date DESC
-            """
-            
-            # Double the parameters for both home and away team checks
-            params = db_team_names + db_team_names
-            
-            from psycopg2.extras import RealDictCursor
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                all_games = cursor.fetchall()
-            
-            # Group games by team
-            team_games = {team: [] for team in teams}
-            original_to_db_name = {convert_team_name(team): team for team in teams}
-            
-            for game in all_games:
-                game_dict = dict(game)
-                
-                # Check if home team is in our list
-                if game_dict['home_team_name'] in original_to_db_name:
-                    original_home = original_to_db_name[game_dict['home_team_name']]
-                    game_with_side = dict(game_dict)
-                    game_with_side['team_side'] = 'home'
-                    team_games[original_home].append(game_with_side)
-                
-                # Check if away team is in our list  
-                if game_dict['away_team_name'] in original_to_db_name:
-                    original_away = original_to_db_name[game_dict['away_team_name']]
-                    game_with_side = dict(game_dict)
-                    game_with_side['team_side'] = 'away'
-                    team_games[original_away].append(game_with_side)
-            
-            # Sort each team's games by date (most recent first) and apply limit
-            for team in team_games:
-                team_games[team] = sorted(
-                    team_games[team], 
-                    key=lambda x: x['game_date'], 
-                    reverse=True
-                )[:limit]
+            team_games = cls._fetch_recent_team_games(
+                conn, 'mlb', 'mlb_games',
+                ['game_id', 'game_date', 'home_team_name', 'home_team_id', 'away_team_name', 'away_team_id',
+                 'home_runs', 'away_runs', 'total_runs', 'home_line', 'away_line',
+                 'home_money_line', 'away_money_line', 'start_time', 'total'],
+                {convert_team_name(team): team for team in teams},
+                limit,
+            )
             
             print(f"Batch fetched games for {len(team_games)} teams")
             return team_games
@@ -192,80 +140,39 @@ class MLBTrendsService(BaseHistoricalService):
     
     @classmethod
     def _batch_fetch_all_head_to_head_games(cls, team_pairs: List[Tuple[str, str]], limit: int) -> Dict[Tuple[str, str], List[Dict]]:
-        """Batch fetch head-to-head games for all team pairs in one query."""
+        """Batch fetch the most recent head-to-head games for all team pairs in one query."""
+        conn = None
         try:
             # Get team ID mapping for all teams involved
             all_teams_in_pairs = set()
             for home, away in team_pairs:
                 all_teams_in_pairs.add(home)
                 all_teams_in_pairs.add(away)
-            
+
             team_id_map = cls._get_team_id_mapping(all_teams_in_pairs)
-            
+
             conn = MLBService._get_connection()
             if not conn:
                 return {}
-            
-            # Build a single query for all head-to-head pairs
-            h2h_conditions = []
-            params = []
-            
-            valid_pairs = []
-            for home_team, away_team in team_pairs:
-                home_team_id = team_id_map.get(home_team)
-                away_team_id = team_id_map.get(away_team)
-                
-                if home_team_id and away_team_id:
-                    h2h_conditions.append("(home_team_id = %s AND away_team_id = %s) OR (home_team_id = %s AND away_team_id = %s)")
-                    params.extend([home_team_id, away_team_id, away_team_id, home_team_id])
-                    valid_pairs.append((home_team, away_team))
-            
-            h2h_results = {pair: [] for pair in team_pairs}  # Initialize all pairs
-            
-            if h2h_conditions:
-                query = f"""
-                    SELECT 
-                        game_id, game_date, home_team_name, away_team_name, home_runs, away_runs,
-                        total_runs, home_line, away_line, home_money_line, away_money_line,
-                        start_time, total, home_team_id, away_team_id
-                    FROM mlb_games
-                    WHERE ({' OR '.join(h2h_conditions)})
-                    ORDER BY game_date DESC
-                """
-                
-                from psycopg2.extras import RealDictCursor
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute(query, params)
-                    all_h2h_games = cursor.fetchall()
-                
-                # Group games by team pairs
-                reverse_team_id_map = {v: k for k, v in team_id_map.items()}
-                
-                for game in all_h2h_games:
-                    game_dict = dict(game)
-                    home_team_orig = reverse_team_id_map.get(game_dict['home_team_id'])
-                    away_team_orig = reverse_team_id_map.get(game_dict['away_team_id'])
-                    game_dict['home_team_orig'] = home_team_orig
-                    game_dict['away_team_orig'] = away_team_orig
 
-                    # Find which pair this game belongs to
-                    for home, away in valid_pairs:
-                        if ((home_team_orig == home and away_team_orig == away) or
-                            (home_team_orig == away and away_team_orig == home)):
-                            if len(h2h_results[(home, away)]) < limit:
-                                h2h_results[(home, away)].append(game_dict)
-                            break
-            
+            h2h_results = cls._fetch_head_to_head_games(
+                conn, 'mlb_games',
+                ['game_id', 'game_date', 'home_team_name', 'away_team_name', 'home_runs', 'away_runs',
+                 'total_runs', 'home_line', 'away_line', 'home_money_line', 'away_money_line',
+                 'start_time', 'total', 'home_team_id', 'away_team_id'],
+                team_pairs, team_id_map, limit,
+            )
+
             print(f"Batch fetched head-to-head games for {len(team_pairs)} team pairs in single query")
             return h2h_results
-            
+
         except Exception as e:
             print(f"Error batch fetching head-to-head games: {e}")
             return {}
         finally:
             if conn:
                 conn.close()
-    
+
     @classmethod
     def _get_team_id_mapping(cls, teams: Set[str]) -> Dict[str, int]:
         """Get team ID mapping for all teams in one query."""
@@ -315,102 +222,12 @@ class MLBTrendsService(BaseHistoricalService):
         return games[:limit]
     
     @classmethod
-    def _analyze_team_trends(cls, games: List[Dict], team_name: str, min_trend_length: int = 3) -> List[Dict]:
-        """Analyze trends for a team from their historical games."""
-        if not games or len(games) < min_trend_length:
-            return []
-        
-        trends = []
-        
-        # Sort games by date (most recent first) 
-        sorted_games = sorted(games, key=lambda x: x['game_date'], reverse=True)
-        
-        # Calculate streaks from most recent game backwards
-        def calculate_current_streak(results: List[bool]) -> int:
-            streak = 0
-            for result in results:
-                if result:
-                    streak += 1
-                else:
-                    break
-            return streak
-        
-        # Collect all results (most recent first)
-        win_results = []
-        loss_results = []
-        cover_results = []
-        no_cover_results = []
-        over_results = []
-        under_results = []
-        
-        for game in sorted_games:
-            team_data = cls._get_team_data_from_game(game, team_name)
-            
-            # Win/Loss analysis
-            if team_data['team_runs'] is not None and team_data['opponent_runs'] is not None:
-                if team_data['team_runs'] > team_data['opponent_runs']:
-                    win_results.append(True)
-                    loss_results.append(False)
-                elif team_data['team_runs'] < team_data['opponent_runs']:
-                    win_results.append(False)
-                    loss_results.append(True)
-                else:
-                    # Tie breaks both streaks (rare in MLB)
-                    win_results.append(False)
-                    loss_results.append(False)
-
-            # Total analysis - MLB uses runs
-            actual_total = (game.get('home_runs') or 0) + (game.get('away_runs') or 0)
-            total_line = game.get('total') or game.get('total_runs')
-            
-            if actual_total is not None and total_line is not None:
-                if actual_total > total_line:
-                    over_results.append(True)
-                    under_results.append(False)
-                elif actual_total < total_line:
-                    over_results.append(False)
-                    under_results.append(True)
-                else:
-                    # Push breaks both streaks
-                    over_results.append(False)
-                    under_results.append(False)
-        
-        # Calculate current streaks
-        current_win_streak = calculate_current_streak(win_results)
-        current_loss_streak = calculate_current_streak(loss_results)
-        current_over_streak = calculate_current_streak(over_results)
-        current_under_streak = calculate_current_streak(under_results)
-        
-        # Add trends that meet minimum length
-        if current_win_streak >= min_trend_length:
-            trends.append({
-                'type': 'win_streak',
-                'count': current_win_streak,
-                'description': f'Won {current_win_streak} straight games'
-            })
-        
-        if current_loss_streak >= min_trend_length:
-            trends.append({
-                'type': 'loss_streak',
-                'count': current_loss_streak,
-                'description': f'Lost {current_loss_streak} straight games'
-            })
-        
-        if current_over_streak >= min_trend_length:
-            trends.append({
-                'type': 'over_streak',
-                'count': current_over_streak,
-                'description': f'Total went OVER {current_over_streak} straight games'
-            })
-        
-        if current_under_streak >= min_trend_length:
-            trends.append({
-                'type': 'under_streak',
-                'count': current_under_streak,
-                'description': f'Total went UNDER {current_under_streak} straight games'
-            })
-        
-        return trends
+    def _streak_values(cls, game: Dict, team_name: str) -> StreakValues:
+        """Team runs vs opponent and the game total (MLB trends have no spread streaks)."""
+        team_data = cls._get_team_data_from_game(game, team_name)
+        actual_total = (game.get('home_runs') or 0) + (game.get('away_runs') or 0)
+        total_line = game.get('total') or game.get('total_runs')
+        return team_data['team_runs'], team_data['opponent_runs'], None, actual_total, total_line
     
     @classmethod
     def _get_team_data_from_game(cls, game: Dict, team_name: str) -> Dict:
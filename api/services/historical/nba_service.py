@@ -1,62 +1,77 @@
 """NBA Historical Data Service."""
 
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime
+from datetime import datetime, date
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 
 class NBAService(BaseHistoricalService):
     """Service for handling NBA historical data operations"""
     
+    @staticmethod
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over nba_games_1 shared by get_games and stream_games."""
+        query = """
+            SELECT 
+                game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
+                home_points, away_points, total_points, total, start_time, home_line, away_line,
+                home_money_line, away_money_line
+            FROM nba_games_1
+            WHERE 1=1
+        """
+        params = []
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        if team:
+            query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
+            params.extend([f"%{team}%", f"%{team}%"])
+        return query, params
+
     @staticmethod
     def get_games(
         limit: int = 50,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        team: Optional[str] = None
-    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get NBA historical games from database."""
+        team: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of NBA historical games (newest first) and the next page's cursor."""
         try:
             conn = NBAService._get_connection()
             if not conn:
-                return None, "Database connection failed"
+                return None, None, "Database connection failed"
             
-            query = """
-                SELECT 
-                    game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
-                    home_points, away_points, total_points, total, start_time, home_line, away_line,
-                    home_money_line, away_money_line
-                FROM nba_games_1
-                WHERE 1=1
-            """
-            params = []
-            if start_date:
-                query += " AND game_date >= %s"
-                params.append(start_date)
-            if end_date:
-                query += " AND game_date <= %s"
-                params.append(end_date)
-            if team:
-                query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
-                params.extend([f"%{team}%", f"%{team}%"])
+            query, params = NBAService._games_query(start_date, end_date, team)
 
-            query += " ORDER BY game_date DESC LIMIT %s"
-            params.append(limit)
-
-            from psycopg2.extras import RealDictCursor
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                games = cursor.fetchall()
-                games_list = [dict(game) for game in games]
-                processed_games = NBAService._process_games_list(games_list)
-                return processed_games, None
+            games_list, next_cursor = NBAService._fetch_games_page(conn, query, params, limit, after)
+            return NBAService._process_games_list(games_list), next_cursor, None
         except Exception as e:
-            return None, f"Error fetching NBA games: {str(e)}"
+            return None, None, f"Error fetching NBA games: {str(e)}"
         finally:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream NBA historical games (newest first) through a server-side cursor, for exports."""
+        query, params = NBAService._games_query(start_date, end_date, team)
+        return NBAService._stream_games(query, params, limit, after)
+
     @staticmethod
     def get_games_by_matchup(home_team_name: str, away_team_name: str, game_date: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
         """Exact match on home+away+date, ordered by start_time (supports doubleheaders)."""
@@ -1,54 +1,68 @@
 """NCAAF Historical Data Service."""
 
 from typing import List, Dict, Optional, Tuple
+from datetime import date
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 class NCAAFService(BaseHistoricalService):
     """Service for handling NCAAF historical data operations"""
     
     @staticmethod
-    def get_games(limit: int = 50, start_date: str = None, end_date: str = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get NCAAF historical games from database, optionally filtered by date."""
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over ncaaf_games shared by get_games and stream_games."""
+        query = """
+            SELECT 
+                game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
+                home_points, away_points, total_points, home_line, away_line,
+                home_money_line, away_money_line, start_time, total
+            FROM ncaaf_games
+            WHERE 1=1
+        """
+        params = []
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        return query, params
+
+    @staticmethod
+    def get_games(limit: int = 50, start_date: str = None, end_date: str = None,
+                  after: Optional[Tuple[date, int]] = None) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of NCAAF historical games (newest first), optionally filtered by date, and the next page's cursor."""
         try:
             conn = NCAAFService._get_connection()
             if not conn:
-                return None, "Database connection failed"
+                return None, None, "Database connection failed"
 
-            query = """
-                SELECT 
-                    game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
-                    home_points, away_points, total_points, home_line, away_line,
-                    home_money_line, away_money_line, start_time, total
-                FROM ncaaf_games
-            """
-            params = []
-            where_clauses = []
-            if start_date:
-                where_clauses.append("game_date >= %s")
-                params.append(start_date)
-            if end_date:
-                where_clauses.append("game_date <= %s")
-                params.append(end_date)
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
-            query += " ORDER BY game_date DESC LIMIT %s"
-            params.append(limit)
+            query, params = NCAAFService._games_query(start_date, end_date)
 
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, tuple(params))
-                games = cursor.fetchall()
-
-                games_list = [dict(game) for game in games]
-                processed_games = NCAAFService._process_games_list(games_list)
-                return processed_games, None
+            games_list, next_cursor = NCAAFService._fetch_games_page(conn, query, params, limit, after)
+            processed_games = NCAAFService._process_games_list(games_list)
+            return processed_games, next_cursor, None
 
         except Exception as e:
-            return None, f"Error fetching NCAAF games: {str(e)}"
+            return None, None, f"Error fetching NCAAF games: {str(e)}"
         finally:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream NCAAF historical games (newest first) through a server-side cursor, for exports."""
+        query, params = NCAAFService._games_query(start_date, end_date)
+        return NCAAFService._stream_games(query, params, limit, after)
+
     @staticmethod
     def get_games_by_matchup(home_team_name: str, away_team_name: str, game_date: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
         """Exact match on home+away+date, ordered by start_time (supports same-day rematches)."""
@@ -3,73 +3,91 @@
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, date, time
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 class NFLService(BaseHistoricalService):
     """Service for handling NFL historical data operations"""
     
+    @staticmethod
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        playoffs: Optional[bool] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over nfl_games shared by get_games and stream_games."""
+        query = """
+            SELECT 
+                game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
+                home_points, away_points, total_points, home_line, away_line,
+                home_money_line, away_money_line, start_time, total
+            FROM nfl_games
+            WHERE 1=1
+        """
+        
+        params = []
+        
+        # Add filters
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        
+        if team:
+            query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
+            params.extend([f"%{team}%", f"%{team}%"])
+        
+        if playoffs is not None:
+            # NFL might have a playoffs column or we can infer from date/season
+            # For now, let's skip this filter if the column doesn't exist
+            pass
+        return query, params
+
     @staticmethod
     def get_games(
         limit: int = 50,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         team: Optional[str] = None,
-        playoffs: Optional[bool] = None
-    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get NFL historical games from database."""
+        playoffs: Optional[bool] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of NFL historical games (newest first) and the next page's cursor."""
         try:
             conn = NFLService._get_connection()
             if not conn:
-                return None, "Database connection failed"
+                return None, None, "Database connection failed"
             
             # Build the query
-            query = """
-                SELECT 
-                    game_id, game_date, home_team_name, home_team_id, away_team_name, away_team_id,
-                    home_points, away_points, total_points, home_line, away_line,
-                    home_money_line, away_money_line, start_time, total
-                FROM nfl_games
-                WHERE 1=1
-            """
+            query, params = NFLService._games_query(start_date, end_date, team, playoffs)
             
-            params = []
-            
-            # Add filters
-            if start_date:
-                query += " AND game_date >= %s"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND game_date <= %s"
-                params.append(end_date)
-            
-            if team:
-                query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
-                params.extend([f"%{team}%", f"%{team}%"])
-            
-            if playoffs is not None:
-                # NFL might have a playoffs column or we can infer from date/season
-                # For now, let's skip this filter if the column doesn't exist
-                pass
-            
-            # Add ordering and limit
-            query += " ORDER BY game_date DESC LIMIT %s"
-            params.append(limit)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                games = cursor.fetchall()
-                
-                games_list = [dict(game) for game in games]
-                processed_games = NFLService._process_games_list(games_list)
-                return processed_games, None
+            # Ordering, limit and the page cursor
+            games_list, next_cursor = NFLService._fetch_games_page(conn, query, params, limit, after)
+            processed_games = NFLService._process_games_list(games_list)
+            return processed_games, next_cursor, None
                 
         except Exception as e:
-            return None, f"Error fetching NFL games: {str(e)}"
+            return None, None, f"Error fetching NFL games: {str(e)}"
         finally:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        playoffs: Optional[bool] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream NFL historical games (newest first) through a server-side cursor, for exports."""
+        query, params = NFLService._games_query(start_date, end_date, team, playoffs)
+        return NFLService._stream_games(query, params, limit, after)
+
     @staticmethod
     def get_team_games_by_id(team_id: int, limit: int = 10, venue: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
         """Get historical games for a specific NFL team by ID."""
@@ -8,12 +8,15 @@ import time
 import threading
 
 from .base_service import BaseHistoricalService
+from .streak_engine import StreakValues
 from .nfl_service import NFLService
 
 
 class NFLTrendsService(BaseHistoricalService):
     """Service for analyzing NFL game trends from historical data using batched queries."""
     
+    STREAK_TYPES = ('win_streak', 'loss_streak', 'cover_streak', 'no_cover_streak', 'over_streak', 'under_streak')
+    
     @classmethod
     def analyze_multiple_games_trends(cls, games: List[Dict[str, Any]], limit: int = 5, min_trend_length: int = 3) -> Tuple[Optional[List[Dict]], Optional[str]]:
         """Analyze trends for multiple NFL games using batched database queries."""
@@ -47,6 +50,7 @@ class NFLTrendsService(BaseHistoricalService):
             
             # Step 4: Analyze trends for each game using the cached data
             results = []
+            pending = []
             for game in games:
                 home_team = game.get('home', {}).get('team') or game.get('home_team_name')
                 away_team = game.get('away', {}).get('team') or game.get('away_team_name')
@@ -83,31 +87,19 @@ class NFLTrendsService(BaseHistoricalService):
                         home_at_home_h2h.append(g_copy)
                 home_at_home_h2h = home_at_home_h2h[:limit]
 
-                # Analyze trends using the filtered data
-                home_team_trends = cls._analyze_team_trends(home_team_games, home_team, min_trend_length)
-                away_team_trends = cls._analyze_team_trends(away_team_games, away_team, min_trend_length)
-                head_to_head_trends = cls._apply_h2h_context(
-                    cls._analyze_team_trends(h2h_games, home_team, min_trend_length), home_team, away_team)
-                home_team_home_trends = cls._analyze_team_trends(home_team_home_games, home_team, min_trend_length)
-                away_team_away_trends = cls._analyze_team_trends(away_team_away_games, away_team, min_trend_length)
-                home_at_home_h2h_trends = cls._apply_h2h_context(
-                    cls._analyze_team_trends(home_at_home_h2h, home_team, min_trend_length), home_team, away_team, at_home=True)
+                # Queue this game's six variants; the whole slate is analyzed in one pass below
+                results.append(None)
+                pending.append((len(results) - 1, game, home_team, away_team, [
+                    (home_team_games, home_team),
+                    (away_team_games, away_team),
+                    (h2h_games, home_team),
+                    (home_team_home_games, home_team),
+                    (away_team_away_games, away_team),
+                    (home_at_home_h2h, home_team),
+                ]))
 
-                has_trends = (len(home_team_trends) > 0 or len(away_team_trends) > 0 or
-                              len(head_to_head_trends) > 0 or len(home_team_home_trends) > 0 or
-                              len(away_team_away_trends) > 0 or len(home_at_home_h2h_trends) > 0)
+            cls._fill_slate_trends(results, pending, min_trend_length)
 
-                results.append({
-                    'game': game,
-                    'homeTeamTrends': home_team_trends,
-                    'awayTeamTrends': away_team_trends,
-                    'headToHeadTrends': head_to_head_trends,
-                    'homeTeamHomeTrends': home_team_home_trends,
-                    'awayTeamAwayTrends': away_team_away_trends,
-                    'homeAtHomeH2HTrends': home_at_home_h2h_trends,
-                    'hasTrends': has_trends
-                })
-            
             end_time = time.time()
             print(f"NFL trends analysis completed in {end_time - start_time:.2f} seconds")
             
@@ -193,80 +185,39 @@ class NFLTrendsService(BaseHistoricalService):
     
     @classmethod
     def _batch_fetch_all_head_to_head_games(cls, team_pairs: List[Tuple[str, str]], limit: int) -> Dict[Tuple[str, str], List[Dict]]:
-        """Batch fetch head-to-head games for all team pairs in one query."""
+        """Batch fetch the most recent head-to-head games for all team pairs in one query."""
+        conn = None
         try:
             # Get team ID mapping for all teams involved
             all_teams_in_pairs = set()
             for home, away in team_pairs:
                 all_teams_in_pairs.add(home)
                 all_teams_in_pairs.add(away)
-            
+
             team_id_map = cls._get_team_id_mapping(all_teams_in_pairs)
-            
+
             conn = NFLService._get_connection()
             if not conn:
                 return {}
-            
-            # Build a single query for all head-to-head pairs
-            h2h_conditions = []
-            params = []
-            
-            valid_pairs = []
-            for home_team, away_team in team_pairs:
-                home_team_id = team_id_map.get(home_team)
-                away_team_id = team_id_map.get(away_team)
-                
-                if home_team_id and away_team_id:
-                    h2h_conditions.append("(home_team_id = %s AND away_team_id = %s) OR (home_team_id = %s AND away_team_id = %s)")
-                    params.extend([home_team_id, away_team_id, away_team_id, home_team_id])
-                    valid_pairs.append((home_team, away_team))
-            
-            h2h_results = {pair: [] for pair in team_pairs}  # Initialize all pairs
-            
-            if h2h_conditions:
-                query = f"""
-                    SELECT 
-                        game_id, game_date, home_team_name, away_team_name, home_points, away_points,
-                        total_points, home_line, away_line, home_money_line, away_money_line,
-                        start_time, total, home_team_id, away_team_id
-                    FROM nfl_games
-                    WHERE ({' OR '.join(h2h_conditions)})
-                    ORDER BY game_date DESC
-                """
-                
-                from psycopg2.extras import RealDictCursor
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute(query, params)
-                    all_h2h_games = cursor.fetchall()
-                
-                # Group games by team pairs
-                reverse_team_id_map = {v: k for k, v in team_id_map.items()}
-                
-                for game in all_h2h_games:
-                    game_dict = dict(game)
-                    home_team_orig = reverse_team_id_map.get(game_dict['home_team_id'])
-                    away_team_orig = reverse_team_id_map.get(game_dict['away_team_id'])
-                    game_dict['home_team_orig'] = home_team_orig
-                    game_dict['away_team_orig'] = away_team_orig
 
-                    # Find which pair this game belongs to
-                    for home, away in valid_pairs:
-                        if ((home_team_orig == home and away_team_orig == away) or
-                            (home_team_orig == away and away_team_orig == home)):
-                            if len(h2h_results[(home, away)]) < limit:
-                                h2h_results[(home, away)].append(game_dict)
-                            break
-            
+            h2h_results = cls._fetch_head_to_head_games(
+                conn, 'nfl_games',
+                ['game_id', 'game_date', 'home_team_name', 'away_team_name', 'home_points', 'away_points',
+                 'total_points', 'home_line', 'away_line', 'home_money_line', 'away_money_line',
+                 'start_time', 'total', 'home_team_id', 'away_team_id'],
+                team_pairs, team_id_map, limit,
+            )
+
             print(f"Batch fetched head-to-head games for {len(team_pairs)} team pairs in single query")
             return h2h_results
-            
+
         except Exception as e:
             print(f"Error batch fetching head-to-head games: {e}")
             return {}
         finally:
             if conn:
                 conn.close()
-    
+
     @classmethod
     def _get_team_id_mapping(cls, teams: Set[str]) -> Dict[str, int]:
         """Get team ID mapping for all teams in one query."""
@@ -315,135 +266,12 @@ class NFLTrendsService(BaseHistoricalService):
         # Games are already filtered and sorted when batched, just apply limit
         return games[:limit]
     @classmethod
-    def _analyze_team_trends(cls, games: List[Dict], team_name: str, min_trend_length: int = 3) -> List[Dict]:
-        """Analyze trends for a team from their historical games."""
-        if not games or len(games) < min_trend_length:
-            return []
-        
-        trends = []
-        
-        # Sort games by date (most recent first) 
-        sorted_games = sorted(games, key=lambda x: x['game_date'], reverse=True)
-        
-        # Calculate streaks from most recent game backwards
-        def calculate_current_streak(results: List[bool]) -> int:
-            streak = 0
-            for result in results:
-                if result:
-                    streak += 1
-                else:
-                    break
-            return streak
-        
-        # Collect all results (most recent first)
-        win_results = []
-        loss_results = []
-        cover_results = []
-        no_cover_results = []
-        over_results = []
-        under_results = []
-        
-        for game in sorted_games:
-            team_data = cls._get_team_data_from_game(game, team_name)
-            
-            # Win/Loss analysis
-            if team_data['team_points'] is not None and team_data['opponent_points'] is not None:
-                if team_data['team_points'] > team_data['opponent_points']:
-                    win_results.append(True)
-                    loss_results.append(False)
-                elif team_data['team_points'] < team_data['opponent_points']:
-                    win_results.append(False)
-                    loss_results.append(True)
-                else:
-                    # Tie breaks both streaks
-                    win_results.append(False)
-                    loss_results.append(False)
-            
-            # Spread analysis
-            if (team_data['team_line'] is not None and 
-                team_data['team_points'] is not None and 
-                team_data['opponent_points'] is not None):
-                
-                line_result = (team_data['team_points'] + team_data['team_line']) > team_data['opponent_points']
-                if line_result:
-                    cover_results.append(True)
-                    no_cover_results.append(False)
-                elif (team_data['team_points'] + team_data['team_line']) < team_data['opponent_points']:
-                    cover_results.append(False)
-                    no_cover_results.append(True)
-                else:
-                    # Push breaks both streaks
-                    cover_results.append(False)
-                    no_cover_results.append(False)
-            
-            # Total analysis
-            actual_total = (game.get('home_points') or 0) + (game.get('away_points') or 0)
-            total_line = game.get('total') or game.get('total_points')
-            
-            if actual_total is not None and total_line is not None:
-                if actual_total > total_line:
-                    over_results.append(True)
-                    under_results.append(False)
-                elif actual_total < total_line:
-                    over_results.append(False)
-                    under_results.append(True)
-                else:
-                    # Push breaks both streaks
-                    over_results.append(False)
-                    under_results.append(False)
-        
-        # Calculate current streaks
-        current_win_streak = calculate_current_streak(win_results)
-        current_loss_streak = calculate_current_streak(loss_results)
-        current_cover_streak = calculate_current_streak(cover_results)
-        current_no_cover_streak = calculate_current_streak(no_cover_results)
-        current_over_streak = calculate_current_streak(over_results)
-        current_under_streak = calculate_current_streak(under_results)
-        
-        # Add trends that meet minimum length
-        if current_win_streak >= min_trend_length:
-            trends.append({
-                'type': 'win_streak',
-                'count': current_win_streak,
-                'description': f'Won {current_win_streak} straight games'
-            })
-        
-        if current_loss_streak >= min_trend_length:
-            trends.append({
-                'type': 'loss_streak',
-                'count': current_loss_streak,
-                'description': f'Lost {current_loss_streak} straight games'
-            })
-        
-        if current_cover_streak >= min_trend_length:
-            trends.append({
-                'type': 'cover_streak',
-                'count': current_cover_streak,
-                'description': f'Covered {current_cover_streak} straight spreads'
-            })
-        
-        if current_no_cover_streak >= min_trend_length:
-            trends.append({
-                'type': 'no_cover_streak',
-                'count': current_no_cover_streak,
-                'description': f'Failed to cover {current_no_cover_streak} straight spreads'
-            })
-        
-        if current_over_streak >= min_trend_length:
-            trends.append({
-                'type': 'over_streak',
-                'count': current_over_streak,
-                'description': f'Total went OVER {current_over_streak} straight games'
-            })
-        
-        if current_under_streak >= min_trend_length:
-            trends.append({
-                'type': 'under_streak',
-                'count': current_under_streak,
-                'description': f'Total went UNDER {current_under_streak} straight games'
-            })
-        
-        return trends
+    def _streak_values(cls, game: Dict, team_name: str) -> StreakValues:
+        """Team points, spread line and game total for one game."""
+        team_data = cls._get_team_data_from_game(game, team_name)
+        actual_total = (game.get('home_points') or 0) + (game.get('away_points') or 0)
+        total_line = game.get('total') or game.get('total_points')
+        return team_data['team_points'], team_data['opponent_points'], team_data['team_line'], actual_total, total_line
     
     @classmethod
     def _get_team_data_from_game(cls, game: Dict, team_name: str) -> Dict:
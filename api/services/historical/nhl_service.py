@@ -4,7 +4,7 @@
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, date, time
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 class NHLService(BaseHistoricalService):
 
@@ -38,50 +38,74 @@ class NHLService(BaseHistoricalService):
         return games, None
     """Service for handling NHL historical data operations"""
 
+    @staticmethod
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        playoffs: Optional[bool] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over nhl_games shared by get_games and stream_games."""
+        query = """
+            SELECT * FROM nhl_games WHERE 1=1
+        """
+        params = []
+
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        if team:
+            query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
+            params.extend([f"%{team}%", f"%{team}%"])
+        if playoffs is not None:
+            query += " AND playoffs = %s"
+            params.append(playoffs)
+        return query, params
+
     @staticmethod
     def get_games(
         limit: int = 50,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         team: Optional[str] = None,
-        playoffs: Optional[bool] = None
-    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get NHL historical games from database, always returning game_date as YYYY-MM-DD."""
+        playoffs: Optional[bool] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of NHL historical games (newest first) and the next page's cursor, always returning game_date as YYYY-MM-DD."""
         try:
             conn = NHLService._get_connection()
             if not conn:
-                return None, "Database connection failed"
-
-            query = """
-                SELECT * FROM nhl_games WHERE 1=1
-            """
-            params = []
+                return None, None, "Database connection failed"
 
-            if start_date:
-                query += " AND game_date >= %s"
-                params.append(start_date)
-            if end_date:
-                query += " AND game_date <= %s"
-                params.append(end_date)
-            if team:
-                query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
-                params.extend([f"%{team}%", f"%{team}%"])
-            if playoffs is not None:
-                query += " AND playoffs = %s"
-                params.append(playoffs)
-            query += " ORDER BY game_date DESC LIMIT %s"
-            params.append(limit)
+            query, params = NHLService._games_query(start_date, end_date, team, playoffs)
 
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                games = cursor.fetchall()
+            games, next_cursor = NHLService._fetch_games_page(conn, query, params, limit, after)
             # Ensure game_date is always a string (should be YYYY-MM-DD from DB)
             for g in games:
                 if 'game_date' in g and g['game_date']:
                     g['game_date'] = str(g['game_date'])
-            return games, None
+            return games, next_cursor, None
         except Exception as e:
-            return None, str(e)
+            return None, None, str(e)
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        playoffs: Optional[bool] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream NHL historical games (newest first) through a server-side cursor, for exports."""
+        query, params = NHLService._games_query(start_date, end_date, team, playoffs)
+        return NHLService._stream_games(query, params, limit, after)
 
     @staticmethod
     def get_games_by_matchup(home_team_name: str, away_team_name: str, game_date: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
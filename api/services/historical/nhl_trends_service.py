@@ -8,111 +8,92 @@ import concurrent.futures
 import time
 
 from .base_service import BaseHistoricalService
+from .streak_engine import StreakValues
 from .nhl_service import NHLService
 
 class NHLTrendsService(BaseHistoricalService):
     @classmethod
     def _batch_fetch_all_team_games(cls, teams: Set[str], limit: int) -> Dict[str, List[Dict]]:
-        """Batch fetch games for all teams in one database query, using convert_team_name for lookups."""
+        """Batch fetch each team's most recent games (overall, home and away) in one query, using convert_team_name for lookups."""
+        conn = None
         try:
             import sys
             sys.path.append('/Users/stephaniegillen/Projects/get-stam-api')
             from shared_utils import convert_team_name
             from .nhl_service import NHLService
-            # Convert all team names to DB format
-            db_team_names = [convert_team_name(team) for team in teams]
             conn = NHLService._get_connection()
             if not conn:
                 return {}
-            placeholders = ','.join(['%s'] * len(db_team_names))
-            query = f"""
-                SELECT * FROM nhl_games
-                WHERE home_team_name IN ({placeholders}) OR away_team_name IN ({placeholders})
-                ORDER BY game_date DESC
-            """
-            params = db_team_names + db_team_names
-            from psycopg2.extras import RealDictCursor
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                all_games = cursor.fetchall()
             # Map DB names back to original names
-            team_games = {team: [] for team in teams}
-            original_to_db_name = {convert_team_name(team): team for team in teams}
-            for game in all_games:
-                # Check if home team is in our list
-                if game['home_team_name'] in original_to_db_name:
-                    original_home = original_to_db_name[game['home_team_name']]
-                    game_with_side = dict(game)
-                    game_with_side['team_side'] = 'home'
-                    team_games[original_home].append(game_with_side)
-                # Check if away team is in our list
-                if game['away_team_name'] in original_to_db_name:
-                    original_away = original_to_db_name[game['away_team_name']]
-                    game_with_side = dict(game)
-                    game_with_side['team_side'] = 'away'
-                    team_games[original_away].append(game_with_side)
-            for team in team_games:
-                team_games[team] = sorted(team_games[team], key=lambda x: x['game_date'], reverse=True)[:limit]
-            return team_games
+            return cls._fetch_recent_team_games(
+                conn, 'nhl', 'nhl_games', None,
+                {convert_team_name(team): team for team in teams},
+                limit,
+            )
         except Exception as e:
             print(f"Error batch fetching team games: {e}")
             return {}
         finally:
-            if 'conn' in locals() and conn:
+            if conn:
                 conn.close()
 
     @classmethod
     def _batch_fetch_all_head_to_head_games(cls, team_pairs: List[Tuple[str, str]], limit: int) -> Dict[Tuple[str, str], List[Dict]]:
-        """Batch fetch head-to-head games for all team pairs in one query, using convert_team_name for lookups."""
+        """Batch fetch the most recent head-to-head games for all team pairs in one query."""
+        conn = None
         try:
-            import sys
-            sys.path.append('/Users/stephaniegillen/Projects/get-stam-api')
-            from shared_utils import convert_team_name
-            from .nhl_service import NHLService
-            # Convert all team names to DB format
-            db_team_pairs = [(convert_team_name(home), convert_team_name(away)) for home, away in team_pairs]
+            # Get team ID mapping for all teams involved
             all_teams_in_pairs = set()
             for home, away in team_pairs:
                 all_teams_in_pairs.add(home)
                 all_teams_in_pairs.add(away)
+
+            team_id_map = cls._get_team_id_mapping(all_teams_in_pairs)
+
             conn = NHLService._get_connection()
             if not conn:
                 return {}
-            h2h_results = {pair: [] for pair in team_pairs}
-            h2h_conditions = []
-            params = []
-            for (home_team, away_team), (orig_home, orig_away) in zip(db_team_pairs, team_pairs):
-                h2h_conditions.append("(home_team_name = %s AND away_team_name = %s) OR (home_team_name = %s AND away_team_name = %s)")
-                params.extend([home_team, away_team, away_team, home_team])
-            if h2h_conditions:
-                query = f"""
-                    SELECT * FROM nhl_games
-                    WHERE {' OR '.join(h2h_conditions)}
-                    ORDER BY game_date DESC
-                """
-                from psycopg2.extras import RealDictCursor
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute(query, params)
-                    all_h2h_games = cursor.fetchall()
-                # Map DB names back to original names
-                db_to_original = {convert_team_name(team): team for team in all_teams_in_pairs}
-                for game in all_h2h_games:
-                    game_dict = dict(game)
-                    home_team_orig = db_to_original.get(game['home_team_name'], game['home_team_name'])
-                    away_team_orig = db_to_original.get(game['away_team_name'], game['away_team_name'])
-                    game_dict['home_team_orig'] = home_team_orig
-                    game_dict['away_team_orig'] = away_team_orig
-                    for orig_pair in team_pairs:
-                        if ((home_team_orig, away_team_orig) == orig_pair or
-                            (home_team_orig, away_team_orig) == (orig_pair[1], orig_pair[0])):
-                            if len(h2h_results[orig_pair]) < limit:
-                                h2h_results[orig_pair].append(game_dict)
+
+            h2h_results = cls._fetch_head_to_head_games(
+                conn, 'nhl_games',
+                None,
+                team_pairs, team_id_map, limit,
+            )
+
+            print(f"Batch fetched head-to-head games for {len(team_pairs)} team pairs in single query")
             return h2h_results
+
         except Exception as e:
             print(f"Error batch fetching head-to-head games: {e}")
             return {}
         finally:
-            if 'conn' in locals() and conn:
+            if conn:
+                conn.close()
+
+    @classmethod
+    def _get_team_id_mapping(cls, teams: Set[str]) -> Dict[str, int]:
+        """Get team ID mapping for all teams in one query, using convert_team_name for lookups."""
+        conn = None
+        try:
+            import sys
+            sys.path.append('/Users/stephaniegillen/Projects/get-stam-api')
+            from shared_utils import convert_team_name
+            db_to_original = {convert_team_name(team): team for team in teams}
+            conn = NHLService._get_connection()
+            if not conn:
+                return {}
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT team_name, team_id FROM teams WHERE team_name = ANY(%s) AND sport = 'NHL'",
+                    (list(db_to_original),),
+                )
+                results = cursor.fetchall()
+            return {db_to_original[db_name]: team_id for db_name, team_id in results}
+        except Exception as e:
+            print(f"Error getting team ID mapping: {e}")
+            return {}
+        finally:
+            if conn:
                 conn.close()
 
     @classmethod
@@ -120,61 +101,13 @@ class NHLTrendsService(BaseHistoricalService):
         return games[:limit]
 
     @classmethod
-    def _analyze_team_trends(cls, games: List[Dict], team_name: str, min_trend_length: int = 3) -> List[Dict]:
-        if not games or len(games) < min_trend_length:
-            return []
-        trends = []
-        sorted_games = sorted(games, key=lambda x: x['game_date'], reverse=True)
-        def calculate_current_streak(results: List[bool]) -> int:
-            streak = 0
-            for result in results:
-                if result:
-                    streak += 1
-                else:
-                    break
-            return streak
-        win_results = []
-        loss_results = []
-        over_results = []
-        under_results = []
-        for game in sorted_games:
-            team_data = cls._get_team_data_from_game(game, team_name)
-            if team_data['team_goals'] is not None and team_data['opponent_goals'] is not None:
-                if team_data['team_goals'] > team_data['opponent_goals']:
-                    win_results.append(True)
-                    loss_results.append(False)
-                elif team_data['team_goals'] < team_data['opponent_goals']:
-                    win_results.append(False)
-                    loss_results.append(True)
-                else:
-                    win_results.append(False)
-                    loss_results.append(False)
-            actual_total = (game.get('home_goals') or 0) + (game.get('away_goals') or 0)
-            total_line = game.get('total')
-            if actual_total is not None and total_line is not None:
-                if actual_total > total_line:
-                    over_results.append(True)
-                    under_results.append(False)
-                elif actual_total < total_line:
-                    over_results.append(False)
-                    under_results.append(True)
-                else:
-                    over_results.append(False)
-                    under_results.append(False)
-        current_win_streak = calculate_current_streak(win_results)
-        current_loss_streak = calculate_current_streak(loss_results)
-        current_over_streak = calculate_current_streak(over_results)
-        current_under_streak = calculate_current_streak(under_results)
-        if current_win_streak >= min_trend_length:
-            trends.append({'type': 'win_streak','count': current_win_streak,'description': f'Won {current_win_streak} straight games'})
-        if current_loss_streak >= min_trend_length:
-            trends.append({'type': 'loss_streak','count': current_loss_streak,'description': f'Lost {current_loss_streak} straight games'})
-        if current_over_streak >= min_trend_length:
-            trends.append({'type': 'over_streak','count': current_over_streak,'description': f'Total went OVER {current_over_streak} straight games'})
-        if current_under_streak >= min_trend_length:
-            trends.append({'type': 'under_streak','count': current_under_streak,'description': f'Total went UNDER {current_under_streak} straight games'})
-        return trends
-
+    def _streak_values(cls, game: Dict, team_name: str) -> StreakValues:
+        """Team goals vs opponent and the game total (NHL trends have no spread streaks)."""
+        team_data = cls._get_team_data_from_game(game, team_name)
+        actual_total = (game.get('home_goals') or 0) + (game.get('away_goals') or 0)
+        total_line = game.get('total')
+        return team_data['team_goals'], team_data['opponent_goals'], None, actual_total, total_line
+    
     @classmethod
     def _get_team_data_from_game(cls, game: Dict, team_name: str) -> Dict:
         import sys
@@ -216,9 +149,10 @@ class NHLTrendsService(BaseHistoricalService):
             if not all_teams:
                 return [], "No valid teams found in games"
             print(f"Found {len(all_teams)} unique teams: {list(all_teams)}")
-            all_team_games = cls._batch_fetch_all_team_games(all_teams, limit * 4)
+            all_team_games = cls._batch_fetch_all_team_games(all_teams, limit)
             all_h2h_games = cls._batch_fetch_all_head_to_head_games(team_pairs, limit * 2)
             results = []
+            pending = []
             for game in games:
                 home_team = game.get('home', {}).get('team') or game.get('home_team_name')
                 away_team = game.get('away', {}).get('team') or game.get('away_team_name')
@@ -254,28 +188,19 @@ class NHLTrendsService(BaseHistoricalService):
                         home_at_home_h2h.append(g_copy)
                 home_at_home_h2h = home_at_home_h2h[:limit]
 
-                home_team_trends = cls._analyze_team_trends(home_team_games, home_team, min_trend_length)
-                away_team_trends = cls._analyze_team_trends(away_team_games, away_team, min_trend_length)
-                head_to_head_trends = cls._apply_h2h_context(
-                    cls._analyze_team_trends(h2h_games, home_team, min_trend_length), home_team, away_team)
-                home_team_home_trends = cls._analyze_team_trends(home_team_home_games, home_team, min_trend_length)
-                away_team_away_trends = cls._analyze_team_trends(away_team_away_games, away_team, min_trend_length)
-                home_at_home_h2h_trends = cls._apply_h2h_context(
-                    cls._analyze_team_trends(home_at_home_h2h, home_team, min_trend_length), home_team, away_team, at_home=True)
+                # Queue this game's six variants; the whole slate is analyzed in one pass below
+                results.append(None)
+                pending.append((len(results) - 1, game, home_team, away_team, [
+                    (home_team_games, home_team),
+                    (away_team_games, away_team),
+                    (h2h_games, home_team),
+                    (home_team_home_games, home_team),
+                    (away_team_away_games, away_team),
+                    (home_at_home_h2h, home_team),
+                ]))
+
+            cls._fill_slate_trends(results, pending, min_trend_length)
 
-                has_trends = (len(home_team_trends) > 0 or len(away_team_trends) > 0 or
-                              len(head_to_head_trends) > 0 or len(home_team_home_trends) > 0 or
-                              len(away_team_away_trends) > 0 or len(home_at_home_h2h_trends) > 0)
-                results.append({
-                    'game': game,
-                    'homeTeamTrends': home_team_trends,
-                    'awayTeamTrends': away_team_trends,
-                    'headToHeadTrends': head_to_head_trends,
-                    'homeTeamHomeTrends': home_team_home_trends,
-                    'awayTeamAwayTrends': away_team_away_trends,
-                    'homeAtHomeH2HTrends': home_at_home_h2h_trends,
-                    'hasTrends': has_trends
-                })
             end_time = time.time()
             print(f"NHL trends analysis completed in {end_time - start_time:.2f} seconds")
             return results, None
@@ -1,78 +1,97 @@
 """Soccer Historical Data Service."""
 
 from typing import List, Dict, Optional, Tuple
+from datetime import date
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 class SoccerService(BaseHistoricalService):
     """Service for handling Soccer historical data operations"""
     
+    @staticmethod
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        league: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over soccer_games shared by get_games and stream_games."""
+        query = """
+            SELECT 
+                game_id, odds_id, league, game_date, home_team_id, away_team_id,
+                home_team_name, away_team_name, home_goals, away_goals, total_goals,
+                home_money_line, draw_money_line, away_money_line,
+                home_spread, away_spread, total_over_point, total_over_price,
+                total_under_point, total_under_price,
+                home_first_half_goals, away_first_half_goals,
+                home_second_half_goals, away_second_half_goals,
+                home_overtime, away_overtime, start_time,
+                created_date, modified_date
+            FROM soccer_games
+            WHERE 1=1
+        """
+        
+        params = []
+        
+        # Add filters
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        
+        if team:
+            query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
+            params.extend([f"%{team}%", f"%{team}%"])
+        
+        if league:
+            query += " AND league ILIKE %s"
+            params.append(f"%{league}%")
+        return query, params
+
     @staticmethod
     def get_games(
         limit: int = 50,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         team: Optional[str] = None,
-        league: Optional[str] = None
-    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get soccer historical games from database."""
+        league: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of soccer historical games (newest first) and the next page's cursor."""
         try:
             conn = SoccerService._get_connection()
             if not conn:
-                return None, "Database connection failed"
-            
-            query = """
-                SELECT 
-                    game_id, odds_id, league, game_date, home_team_id, away_team_id,
-                    home_team_name, away_team_name, home_goals, away_goals, total_goals,
-                    home_money_line, draw_money_line, away_money_line,
-                    home_spread, away_spread, total_over_point, total_over_price,
-                    total_under_point, total_under_price,
-                    home_first_half_goals, away_first_half_goals,
-                    home_second_half_goals, away_second_half_goals,
-                    home_overtime, away_overtime, start_time,
-                    created_date, modified_date
-                FROM soccer_games
-                WHERE 1=1
-            """
-            
-            params = []
-            
-            # Add filters
-            if start_date:
-                query += " AND game_date >= %s"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND game_date <= %s"
-                params.append(end_date)
+                return None, None, "Database connection failed"
             
-            if team:
-                query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
-                params.extend([f"%{team}%", f"%{team}%"])
-            
-            if league:
-                query += " AND league ILIKE %s"
-                params.append(f"%{league}%")
-            
-            # Order by date (most recent first) and limit
-            query += " ORDER BY game_date DESC, start_time DESC LIMIT %s"
-            params.append(limit)
+            query, params = SoccerService._games_query(start_date, end_date, team, league)
             
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                games = cursor.fetchall()
-                
-                games_list = [dict(game) for game in games]
-                processed_games = SoccerService._process_games_list(games_list)
-                return processed_games, None
+            # Most recent first, one page at a time
+            games_list, next_cursor = SoccerService._fetch_games_page(conn, query, params, limit, after)
+            processed_games = SoccerService._process_games_list(games_list)
+            return processed_games, next_cursor, None
                 
         except Exception as e:
-            return None, f"Error fetching soccer games: {str(e)}"
+            return None, None, f"Error fetching soccer games: {str(e)}"
         finally:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        league: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream soccer historical games (newest first) through a server-side cursor, for exports."""
+        query, params = SoccerService._games_query(start_date, end_date, team, league)
+        return SoccerService._stream_games(query, params, limit, after)
+
     @staticmethod
     def get_game_by_id(game_id: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Get a specific soccer game by ID."""
@@ -0,0 +1,110 @@
+"""Vectorized current-streak engine shared by the *_trends_service modules.
+
+Each trends service turns the games behind one trend variant (a team's last N,
+its home/away split, an H2H list, ...) into a sequence of per-game value rows,
+most recent game first:
+
+    (team_score, opponent_score, team_line, total_score, total_line)
+
+with None for anything unknown. ``current_streaks`` packs every sequence of a
+slate into one padded (sequences x games x values) array and computes the
+current length of every streak type for all of them in a single NumPy pass.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+StreakValues = Tuple[Optional[float], Optional[float], Optional[float], Optional[float], Optional[float]]
+
+STREAK_TYPES = (
+    'win_streak', 'loss_streak', 'draw_streak',
+    'cover_streak', 'no_cover_streak',
+    'over_streak', 'under_streak',
+)
+
+# Per-game outcome states
+HIT = 1     # game extends the streak
+MISS = 0    # game ends the streak
+SKIP = -1   # game lacks the data for this streak type and is ignored
+
+_TEAM, _OPP, _LINE, _TOTAL, _TOTAL_LINE = range(5)
+
+
+def _pack(sequences: Sequence[Sequence[StreakValues]], lengths: np.ndarray) -> np.ndarray:
+    """Scatter every value row into a (sequences, max_games, 5) float array; None and padding become NaN."""
+    packed = np.full((len(sequences), int(lengths.max(initial=0)), 5), np.nan)
+    rows = [row for seq in sequences for row in seq]
+    if rows:
+        seq_idx = np.repeat(np.arange(len(sequences)), lengths)
+        game_idx = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        packed[seq_idx, game_idx] = np.array(rows, dtype=float)
+    return packed
+
+
+def _outcome_states(packed: np.ndarray, streak_types: Sequence[str], break_on_missing: Iterable[str]) -> np.ndarray:
+    """(types, sequences, games) array of HIT / MISS / SKIP."""
+    team, opp, line = packed[..., _TEAM], packed[..., _OPP], packed[..., _LINE]
+    total, total_line = packed[..., _TOTAL], packed[..., _TOTAL_LINE]
+
+    scored = ~np.isnan(team) & ~np.isnan(opp)
+    margin = team + line - opp
+    lined = scored & ~np.isnan(line)
+    totaled = ~np.isnan(total) & ~np.isnan(total_line)
+
+    outcomes = {
+        'win_streak':      (scored, team > opp),
+        'loss_streak':     (scored, team < opp),
+        'draw_streak':     (scored, team == opp),
+        'cover_streak':    (lined, margin > 0),
+        'no_cover_streak': (lined, margin < 0),
+        'over_streak':     (totaled, total > total_line),
+        'under_streak':    (totaled, total < total_line),
+    }
+
+    breakers = set(break_on_missing)
+
+    states = np.empty((len(streak_types),) + packed.shape[:2], dtype=np.int8)
+    for k, streak_type in enumerate(streak_types):
+        valid, hit = outcomes[streak_type]
+        missing = MISS if streak_type in breakers else SKIP
+        states[k] = np.where(valid, np.where(hit, HIT, MISS), missing)
+    return states
+
+
+def current_streaks(
+    sequences: Sequence[Sequence[StreakValues]],
+    streak_types: Sequence[str] = STREAK_TYPES,
+    break_on_missing: Iterable[str] = (),
+) -> List[Dict[str, int]]:
+    """
+    Current streak length of each type for every sequence.
+
+    A streak counts HIT games from the most recent backwards until the first
+    MISS. Games missing the data a type needs are skipped, unless the type is
+    listed in ``break_on_missing`` (then they end the streak, as soccer's
+    win/loss/draw and over/under streaks do).
+    """
+    if not sequences:
+        return []
+
+    lengths = np.array([len(seq) for seq in sequences])
+    packed = _pack(sequences, lengths)
+    n_games = packed.shape[1]
+    if n_games == 0:
+        return [{t: 0 for t in streak_types} for _ in sequences]
+
+    states = _outcome_states(packed, streak_types, break_on_missing)
+    # Padding past the end of a shorter sequence never ends a streak
+    padding = np.arange(n_games)[None, :] >= lengths[:, None]
+    states[:, padding] = SKIP
+
+    miss = states == MISS
+    first_miss = np.where(miss.any(axis=2), miss.argmax(axis=2), n_games)
+    before_miss = np.arange(n_games)[None, None, :] < first_miss[..., None]
+    counts = ((states == HIT) & before_miss).sum(axis=2)
+
+    return [
+        {t: int(counts[k, i]) for k, t in enumerate(streak_types)}
+        for i in range(len(sequences))
+    ]
@@ -6,14 +6,16 @@ E.g. "Total went OVER 6 straight at home vs Mariners — OVER in 3 of 4 similar
 """
 
 import os
+import threading
+import time
+from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
-from urllib.parse import urlparse
 
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from db import get_connection
+
 load_dotenv()
 
 SPORT_CONFIG: Dict[str, Dict[str, str]] = {
@@ -22,8 +24,17 @@ SPORT_CONFIG: Dict[str, Dict[str, str]] = {
     'nba': {'table': 'nba_games_1', 'home_score': 'home_points', 'away_score': 'away_points', 'total_col': 'total', 'time_col': 'start_time'},
 }
 
-# Module-level cache: sport → loaded context dict
+TREND_TYPES = ('over_streak', 'under_streak', 'win_streak', 'loss_streak')
+
+# Seconds before a cached context is refreshed with newly completed games (0 disables)
+CONTEXT_REFRESH_SECONDS = int(os.getenv('TREND_CONTEXT_REFRESH_SECONDS', '900'))
+# Trailing days re-scanned on every refresh, for scores filled in on rows that already existed
+REFRESH_WINDOW_DAYS = 7
+
+# Module-level cache: sport → loaded context dict (replaced wholesale on refresh, never mutated)
 _context_cache: Dict[str, Dict] = {}
+_load_locks: Dict[str, threading.Lock] = {sport: threading.Lock() for sport in SPORT_CONFIG}
+_refresh_flags: Dict[str, threading.Lock] = {sport: threading.Lock() for sport in SPORT_CONFIG}
 
 
 # ---------------------------------------------------------------------------
@@ -31,17 +42,7 @@ _context_cache: Dict[str, Dict] = {}
 # ---------------------------------------------------------------------------
 
 def _get_connection():
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        raise ValueError("DATABASE_URL not set")
-    parsed = urlparse(database_url)
-    return psycopg2.connect(
-        host=parsed.hostname,
-        database=parsed.path[1:],
-        user=parsed.username,
-        password=parsed.password,
-        port=parsed.port or 5432,
-    )
+    return get_connection()
 
 
 # ---------------------------------------------------------------------------
@@ -124,220 +125,399 @@ def _max_streak(results: List[bool]) -> int:
 # Loader — fetches and caches raw game sequences + max-streak stats
 # ---------------------------------------------------------------------------
 
-def _load_sport_context(sport: str) -> Optional[Dict]:
+def _fetch_completed_rows(
+    sport: str,
+    since_id: Optional[int] = None,
+    window_start: Optional[date] = None,
+) -> Optional[List[Dict]]:
     """
-    Returns:
-    {
-        'home_h2h_games': { (home_team, away_team): [game dicts sorted by date] },
-        'gen_h2h_games':  { (team_a, team_b):       [game dicts sorted by date] },   # a < b
-        'home_h2h_max':   { (home_team, away_team): { trend_type: max_streak, ... } },
-        'gen_h2h_max':    { (team_a, team_b):       { trend_type: max_streak, ... } },
-    }
+    Completed games for a sport in chronological order. With `since_id` only
+    rows inserted after it (game_id > since_id, whatever their date) or dated
+    on/after `window_start` are returned.
     """
-    if sport in _context_cache:
-        return _context_cache[sport]
-
     cfg = SPORT_CONFIG.get(sport)
     if not cfg:
         return None
 
+    where = f"{cfg['home_score']} IS NOT NULL AND {cfg['away_score']} IS NOT NULL"
+    params: Tuple = ()
+    if since_id is not None:
+        where += " AND (game_id > %s OR game_date >= %s)"
+        params = (since_id, window_start or date.today())
+
     conn = None
     try:
         conn = _get_connection()
         query = f"""
-            SELECT game_date, home_team_name, away_team_name,
+            SELECT game_id, game_date, home_team_name, away_team_name,
                    {cfg['home_score']} AS hs,
                    {cfg['away_score']} AS aw,
                    {cfg['total_col']}  AS tl,
                    home_money_line    AS hml,
                    away_money_line    AS aml
             FROM {cfg['table']}
-            WHERE {cfg['home_score']} IS NOT NULL AND {cfg['away_score']} IS NOT NULL
+            WHERE {where}
             ORDER BY game_date ASC{', ' + cfg['time_col'] + ' ASC NULLS LAST' if cfg.get('time_col') else ''}, game_id ASC
         """
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query)
-            rows = [dict(r) for r in cur.fetchall()]
-
-        print(f"[context] Loaded {len(rows)} completed {sport.upper()} games")
-
-        home_h2h_games: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
-        gen_h2h_games: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
-        team_games: Dict[str, List[Dict]] = defaultdict(list)
-
-        for row in rows:
-            ht, at = row['home_team_name'], row['away_team_name']
-            g = {'hs': row['hs'], 'aw': row['aw'], 'tl': row['tl'], 'game_date': row['game_date'],
-                 'hml': row['hml'], 'aml': row['aml']}
-            home_h2h_games[(ht, at)].append(g)
-            gen_h2h_games[(min(ht, at), max(ht, at))].append(g)
-            # Team-perspective: each team's own score first, their own ML as hml
-            team_games[ht].append({
-                'hs': row['hs'], 'aw': row['aw'], 'tl': row['tl'],
-                'game_date': row['game_date'], 'hml': row['hml'],
-            })
-            team_games[at].append({
-                'hs': row['aw'], 'aw': row['hs'], 'tl': row['tl'],
-                'game_date': row['game_date'], 'hml': row['aml'],
-            })
-
-        TREND_TYPES = ('over_streak', 'under_streak', 'win_streak', 'loss_streak')
-
-        # Max streaks for home H2H (home team perspective)
-        home_h2h_max = {}
-        for pair, games in home_h2h_games.items():
-            home_h2h_max[pair] = {tt: _max_streak(_game_results(games, tt)) for tt in TREND_TYPES}
-            home_h2h_max[pair]['num_games'] = len(games)
-
-        # Max streaks for gen H2H (over/under symmetric; win/loss takes max across both perspectives)
-        gen_h2h_max = {}
-        for pair, games in gen_h2h_games.items():
-            a_results = {tt: _game_results(games, tt) for tt in TREND_TYPES}
-            # For win/loss, also compute from "away" perspective (flip hs/aw)
-            flipped = [{'hs': g['aw'], 'aw': g['hs'], 'tl': g['tl'], 'game_date': g['game_date']} for g in games]
-            b_win  = _max_streak(_game_results(flipped, 'win_streak'))
-            b_loss = _max_streak(_game_results(flipped, 'loss_streak'))
-            gen_h2h_max[pair] = {
-                'over_streak':  _max_streak(a_results['over_streak']),
-                'under_streak': _max_streak(a_results['under_streak']),
-                'win_streak':   max(_max_streak(a_results['win_streak']), b_win),
-                'loss_streak':  max(_max_streak(a_results['loss_streak']), b_loss),
-                'num_games':    len(games),
-            }
-
-        context = {
-            'home_h2h_games': dict(home_h2h_games),
-            'gen_h2h_games':  dict(gen_h2h_games),
-            'home_h2h_max':   home_h2h_max,
-            'gen_h2h_max':    gen_h2h_max,
-            'team_games':     dict(team_games),
-        }
-        _context_cache[sport] = context
+            cur.execute(query, params)
+            return [dict(r) for r in cur.fetchall()]
+    finally:
+        if conn:
+            conn.close()
+
+
+def _max_game_id(rows: List[Dict], current: Optional[int] = None) -> Optional[int]:
+    """Largest game_id seen, starting from `current`. game_id is a serial, so this marks insert order."""
+    mark = current
+    for row in rows:
+        if mark is None or row['game_id'] > mark:
+            mark = row['game_id']
+    return mark
+
+
+def _index_rows(
+    rows: List[Dict],
+    home_h2h_games: Dict[Tuple[str, str], List[Dict]],
+    gen_h2h_games: Dict[Tuple[str, str], List[Dict]],
+    team_games: Dict[str, List[Dict]],
+) -> Dict[str, set]:
+    """
+    Append rows to the per-pair / per-team sequences. A key's list is copied
+    before its first append, so sequences shared with an older context version
+    are never mutated. Returns the touched keys per mode.
+    """
+    touched: Dict[str, set] = {'home_h2h': set(), 'gen_h2h': set(), 'team': set()}
+
+    def _append(groups: Dict, mode: str, key, game: Dict) -> None:
+        if key not in touched[mode]:
+            groups[key] = list(groups.get(key, ()))
+            touched[mode].add(key)
+        groups[key].append(game)
+
+    for row in rows:
+        ht, at = row['home_team_name'], row['away_team_name']
+        g = {'hs': row['hs'], 'aw': row['aw'], 'tl': row['tl'], 'game_date': row['game_date'],
+             'hml': row['hml'], 'aml': row['aml']}
+        _append(home_h2h_games, 'home_h2h', (ht, at), g)
+        _append(gen_h2h_games, 'gen_h2h', (min(ht, at), max(ht, at)), g)
+        # Team-perspective: each team's own score first, their own ML as hml
+        _append(team_games, 'team', ht, {
+            'hs': row['hs'], 'aw': row['aw'], 'tl': row['tl'],
+            'game_date': row['game_date'], 'hml': row['hml'],
+        })
+        _append(team_games, 'team', at, {
+            'hs': row['aw'], 'aw': row['hs'], 'tl': row['tl'],
+            'game_date': row['game_date'], 'hml': row['aml'],
+        })
+    return touched
+
+
+def _home_h2h_max(games: List[Dict]) -> Dict[str, int]:
+    """Max streaks for one home H2H pair (home team perspective)."""
+    out = {tt: _max_streak(_game_results(games, tt)) for tt in TREND_TYPES}
+    out['num_games'] = len(games)
+    return out
+
+
+def _gen_h2h_max(games: List[Dict]) -> Dict[str, int]:
+    """Max streaks for one gen H2H pair (over/under symmetric; win/loss takes max across both perspectives)."""
+    a_results = {tt: _game_results(games, tt) for tt in TREND_TYPES}
+    # For win/loss, also compute from "away" perspective (flip hs/aw)
+    flipped = _flip_games(games)
+    b_win  = _max_streak(_game_results(flipped, 'win_streak'))
+    b_loss = _max_streak(_game_results(flipped, 'loss_streak'))
+    return {
+        'over_streak':  _max_streak(a_results['over_streak']),
+        'under_streak': _max_streak(a_results['under_streak']),
+        'win_streak':   max(_max_streak(a_results['win_streak']), b_win),
+        'loss_streak':  max(_max_streak(a_results['loss_streak']), b_loss),
+        'num_games':    len(games),
+    }
+
+
+def _build_context(rows: List[Dict]) -> Dict:
+    home_h2h_games: Dict[Tuple[str, str], List[Dict]] = {}
+    gen_h2h_games: Dict[Tuple[str, str], List[Dict]] = {}
+    team_games: Dict[str, List[Dict]] = {}
+    _index_rows(rows, home_h2h_games, gen_h2h_games, team_games)
+
+    context = {
+        'home_h2h_games': home_h2h_games,
+        'gen_h2h_games':  gen_h2h_games,
+        'home_h2h_max':   {pair: _home_h2h_max(games) for pair, games in home_h2h_games.items()},
+        'gen_h2h_max':    {pair: _gen_h2h_max(games) for pair, games in gen_h2h_games.items()},
+        'team_games':     team_games,
+        'version':        1,
+        'max_game_id':    _max_game_id(rows),
+        'game_ids':       frozenset(row['game_id'] for row in rows),
+        'loaded_at':      time.monotonic(),
+    }
+    context['continuation_cube'] = _build_continuation_cube(context)
+    return context
+
+
+def _apply_new_rows(ctx: Dict, rows: List[Dict]) -> Dict:
+    """
+    Return the next context version with `rows` folded in. Only the pairs and
+    teams the rows touch are rebuilt; everything else is shared with `ctx`,
+    which stays valid for readers still holding it.
+
+    Rows must not already be in ctx['game_ids']. They may be older than games
+    already folded in (backfills, late score fills), so every touched sequence
+    is re-sorted by date; a game sharing a date with existing ones goes after them.
+    """
+    home_h2h_games = dict(ctx['home_h2h_games'])
+    gen_h2h_games = dict(ctx['gen_h2h_games'])
+    team_games = dict(ctx['team_games'])
+    touched = _index_rows(rows, home_h2h_games, gen_h2h_games, team_games)
+    new_sources = {'home_h2h': home_h2h_games, 'gen_h2h': gen_h2h_games, 'team': team_games}
+    for mode, keys in touched.items():
+        for key in keys:
+            # Each touched list is already a private copy (see _index_rows)
+            new_sources[mode][key].sort(key=lambda g: g['game_date'])
+
+    home_h2h_max = dict(ctx['home_h2h_max'])
+    for pair in touched['home_h2h']:
+        home_h2h_max[pair] = _home_h2h_max(home_h2h_games[pair])
+    gen_h2h_max = dict(ctx['gen_h2h_max'])
+    for pair in touched['gen_h2h']:
+        gen_h2h_max[pair] = _gen_h2h_max(gen_h2h_games[pair])
+
+    # Swap each touched sequence's contribution to the cube: old out, new in
+    old_sources = {'home_h2h': ctx['home_h2h_games'], 'gen_h2h': ctx['gen_h2h_games'], 'team': ctx['team_games']}
+    cube: Dict[str, Dict[str, Dict[int, List[int]]]] = {}
+    for mode, by_trend in ctx['continuation_cube'].items():
+        cube[mode] = {}
+        for tt, table in by_trend.items():
+            table = {length: list(cell) for length, cell in table.items()}
+            for key in touched[mode]:
+                for seq in _mode_sequences(mode, tt, old_sources[mode].get(key, [])):
+                    _apply_counts(table, _sequence_continuations(seq, tt), sign=-1)
+                for seq in _mode_sequences(mode, tt, new_sources[mode][key]):
+                    _apply_counts(table, _sequence_continuations(seq, tt))
+            cube[mode][tt] = {length: cell for length, cell in table.items() if cell[1]}
+
+    return {
+        'home_h2h_games':    home_h2h_games,
+        'gen_h2h_games':     gen_h2h_games,
+        'home_h2h_max':      home_h2h_max,
+        'gen_h2h_max':       gen_h2h_max,
+        'team_games':        team_games,
+        'continuation_cube': cube,
+        'version':           ctx['version'] + 1,
+        'max_game_id':       _max_game_id(rows, ctx['max_game_id']),
+        'game_ids':          ctx['game_ids'] | {row['game_id'] for row in rows},
+        'loaded_at':         time.monotonic(),
+    }
+
+
+def refresh_sport_context(sport: str) -> Optional[Dict]:
+    """
+    Bring the cached context for `sport` up to date (or do the initial full
+    load). A refresh folds in completed games not yet in the context: rows
+    inserted since its max game_id, whatever their date, plus anything in the
+    last REFRESH_WINDOW_DAYS whose scores were filled in late. The new version
+    replaces the cached one in a single assignment; readers never see a
+    partially-updated context.
+    """
+    with _load_locks[sport]:
+        ctx = _context_cache.get(sport)
+        try:
+            if ctx is None:
+                rows = _fetch_completed_rows(sport)
+                if rows is None:
+                    return None
+                print(f"[context] Loaded {len(rows)} completed {sport.upper()} games")
+                ctx = _build_context(rows)
+            else:
+                rows = _fetch_completed_rows(
+                    sport,
+                    since_id=ctx['max_game_id'] if ctx['max_game_id'] is not None else 0,
+                    window_start=date.today() - timedelta(days=REFRESH_WINDOW_DAYS),
+                )
+                rows = [row for row in rows if row['game_id'] not in ctx['game_ids']]
+                if rows:
+                    ctx = _apply_new_rows(ctx, rows)
+                    print(f"[context] {sport.upper()}: +{len(rows)} games → version {ctx['version']}")
+                else:
+                    ctx = dict(ctx, loaded_at=time.monotonic())
+        except Exception as e:
+            print(f"[context] Error loading {sport} context: {e}")
+            return ctx
+
+        _context_cache[sport] = ctx
         print(
             f"[context] {sport.upper()}: "
-            f"{len(home_h2h_games)} home matchup pairs, "
-            f"{len(gen_h2h_games)} H2H pairs, "
-            f"{len(team_games)} teams cached"
+            f"{len(ctx['home_h2h_games'])} home matchup pairs, "
+            f"{len(ctx['gen_h2h_games'])} H2H pairs, "
+            f"{len(ctx['team_games'])} teams cached"
         )
-        return context
+        return ctx
 
-    except Exception as e:
-        print(f"[context] Error loading {sport} context: {e}")
+
+def _refresh_in_background(sport: str) -> None:
+    """Start one background refresh per sport; no-op if one is already running."""
+    lock = _refresh_flags[sport]
+    if not lock.acquire(blocking=False):
+        return
+
+    def _run():
+        try:
+            refresh_sport_context(sport)
+        finally:
+            lock.release()
+
+    threading.Thread(target=_run, name=f'trend-context-refresh-{sport}', daemon=True).start()
+
+
+def _load_sport_context(sport: str) -> Optional[Dict]:
+    """
+    Returns:
+    {
+        'home_h2h_games': { (home_team, away_team): [game dicts sorted by date] },
+        'gen_h2h_games':  { (team_a, team_b):       [game dicts sorted by date] },   # a < b
+        'home_h2h_max':   { (home_team, away_team): { trend_type: max_streak, ... } },
+        'gen_h2h_max':    { (team_a, team_b):       { trend_type: max_streak, ... } },
+        'team_games':     { team:                   [team-perspective game dicts] },
+        'continuation_cube': { mode: { trend_type: { streak_length: cell } } },
+        'version':        int, bumped by every incremental refresh,
+        'max_game_id':    largest game_id folded in (insert-order watermark),
+        'game_ids':       frozenset of every game_id folded in,
+        'loaded_at':      time.monotonic() of the last load/refresh,
+    }
+
+    Only the first call per sport blocks on the database. Once the cached
+    context is older than CONTEXT_REFRESH_SECONDS it is refreshed in a
+    background thread while callers keep getting the current version.
+    """
+    if sport not in SPORT_CONFIG:
         return None
-    finally:
-        if conn:
-            conn.close()
+
+    ctx = _context_cache.get(sport)
+    if ctx is None:
+        return refresh_sport_context(sport)
+
+    if CONTEXT_REFRESH_SECONDS > 0 and time.monotonic() - ctx['loaded_at'] >= CONTEXT_REFRESH_SECONDS:
+        _refresh_in_background(sport)
+    return ctx
 
 
 # ---------------------------------------------------------------------------
 # Continuation analysis
 # ---------------------------------------------------------------------------
 
-def _continuation_stats(
-    all_pair_games: Dict[Tuple[str, str], List[Dict]],
-    trend_type: str,
-    target_length: int,
-    gen_h2h: bool = False,
-) -> Tuple[int, int, Optional[Dict[str, Tuple[int, int]]]]:
-    """
-    Scan every matchup pair's chronological game sequence.
-    Every time the running streak hits exactly `target_length`, record what happened
-    in the NEXT game (did the streak continue, or did it break?).
+# Cube cell layout: [continued, total, fav_continued, fav_total, dog_continued, dog_total]
+_CELL_SIZE = 6
 
-    Returns (continued, total_instances, ml_stats).
-    ml_stats = {'fav': (continued, total), 'dog': (continued, total)} for win/loss, else None.
 
-    For gen_h2h win/loss: check both team perspectives and count each separately.
+def _flip_games(games: List[Dict]) -> List[Dict]:
+    """Swap perspective (scores and ML) so the second-named team is the focal team."""
+    return [
+        {'hs': g['aw'], 'aw': g['hs'], 'tl': g['tl'], 'game_date': g['game_date'],
+         'hml': g.get('aml'), 'aml': g.get('hml')}
+        for g in games
+    ]
+
+
+def _sequence_continuations(games: List[Dict], trend_type: str) -> Dict[int, List[int]]:
+    """
+    Walk one chronological game sequence once and, for every streak length the
+    running streak passes through, count what happened in the NEXT game.
+
+    Returns {streak_length: cell} (see _CELL_SIZE). fav/dog splits are only
+    filled for win/loss, where the focal team's ML is known.
     """
-    continued = 0
-    total = 0
+    counts: Dict[int, List[int]] = {}
     track_ml = trend_type in ('win_streak', 'loss_streak')
-    fav_c = fav_t = dog_c = dog_t = 0
-
-    pairs_to_check = list(all_pair_games.items())
-
-    # For gen_h2h win/loss, also run the flipped perspective (swap scores and ML)
-    if gen_h2h and trend_type in ('win_streak', 'loss_streak'):
-        flipped_pairs = []
-        for pair, games in all_pair_games.items():
-            flipped = [
-                {'hs': g['aw'], 'aw': g['hs'], 'tl': g['tl'], 'game_date': g['game_date'],
-                 'hml': g.get('aml'), 'aml': g.get('hml')}
-                for g in games
-            ]
-            flipped_pairs.append((pair, flipped))
-        pairs_to_check = pairs_to_check + flipped_pairs
-
-    for _pair, games in pairs_to_check:
-        paired = _game_results_with_ml(games, trend_type)
-        current = 0
-        for i, (r, ml) in enumerate(paired):
-            if r:
-                current += 1
-                if current == target_length and i + 1 < len(paired):
-                    total += 1
-                    next_r = paired[i + 1][0]
-                    if next_r:
-                        continued += 1
-                    if track_ml and ml is not None:
-                        if ml < 0:
-                            fav_t += 1
-                            if next_r:
-                                fav_c += 1
-                        else:
-                            dog_t += 1
-                            if next_r:
-                                dog_c += 1
+    paired = _game_results_with_ml(games, trend_type)
+    current = 0
+    for i, (r, ml) in enumerate(paired):
+        if not r:
+            current = 0
+            continue
+        current += 1
+        if i + 1 >= len(paired):
+            continue
+        next_r = paired[i + 1][0]
+        cell = counts.get(current)
+        if cell is None:
+            cell = counts[current] = [0] * _CELL_SIZE
+        cell[1] += 1
+        if next_r:
+            cell[0] += 1
+        if track_ml and ml is not None:
+            if ml < 0:
+                cell[3] += 1
+                if next_r:
+                    cell[2] += 1
             else:
-                current = 0
+                cell[5] += 1
+                if next_r:
+                    cell[4] += 1
+    return counts
 
-    ml_stats: Optional[Dict[str, Tuple[int, int]]] = None
-    if track_ml and (fav_t + dog_t) > 0:
-        ml_stats = {'fav': (fav_c, fav_t), 'dog': (dog_c, dog_t)}
 
-    return continued, total, ml_stats
+def _mode_sequences(mode: str, trend_type: str, games: List[Dict]) -> List[List[Dict]]:
+    """
+    The sequences one pair/team contributes to a mode. For gen_h2h win/loss
+    both team perspectives are counted separately.
+    """
+    if mode == 'gen_h2h' and trend_type in ('win_streak', 'loss_streak'):
+        return [games, _flip_games(games)]
+    return [games]
 
 
-def _continuation_stats_team(
-    team_games: Dict[str, List[Dict]],
+def _apply_counts(table: Dict[int, List[int]], counts: Dict[int, List[int]], sign: int = 1) -> None:
+    for length, cell in counts.items():
+        target = table.get(length)
+        if target is None:
+            target = table[length] = [0] * _CELL_SIZE
+        for j in range(_CELL_SIZE):
+            target[j] += sign * cell[j]
+
+
+def _build_continuation_cube(context: Dict) -> Dict[str, Dict[str, Dict[int, List[int]]]]:
+    """
+    Precompute continuation counts for every (mode, trend_type, streak_length)
+    in a single pass over each sequence, so lookups no longer rescan history.
+    """
+    sources = {
+        'home_h2h': context.get('home_h2h_games', {}),
+        'gen_h2h':  context.get('gen_h2h_games', {}),
+        'team':     context.get('team_games', {}),
+    }
+    cube: Dict[str, Dict[str, Dict[int, List[int]]]] = {}
+    for mode, groups in sources.items():
+        cube[mode] = {}
+        for tt in TREND_TYPES:
+            table: Dict[int, List[int]] = {}
+            for games in groups.values():
+                for seq in _mode_sequences(mode, tt, games):
+                    _apply_counts(table, _sequence_continuations(seq, tt))
+            cube[mode][tt] = table
+    return cube
+
+
+def _continuation_lookup(
+    ctx: Dict,
+    mode: str,
     trend_type: str,
     target_length: int,
 ) -> Tuple[int, int, Optional[Dict[str, Tuple[int, int]]]]:
     """
-    Scan every team's chronological game sequence.
-    Every time the running streak hits exactly `target_length`, record what happened next.
-    Games are stored from each team's own perspective (their score as hs, opp as aw, own ML as hml).
+    Return (continued, total_instances, ml_stats) for every historical time a
+    running streak of `trend_type` hit exactly `target_length` in `mode`.
+
+    ml_stats = {'fav': (continued, total), 'dog': (continued, total)} for win/loss, else None.
     """
-    continued = 0
-    total = 0
-    track_ml = trend_type in ('win_streak', 'loss_streak')
-    fav_c = fav_t = dog_c = dog_t = 0
-
-    for _team, games in team_games.items():
-        paired = _game_results_with_ml(games, trend_type)
-        current = 0
-        for i, (r, ml) in enumerate(paired):
-            if r:
-                current += 1
-                if current == target_length and i + 1 < len(paired):
-                    total += 1
-                    next_r = paired[i + 1][0]
-                    if next_r:
-                        continued += 1
-                    if track_ml and ml is not None:
-                        if ml < 0:
-                            fav_t += 1
-                            if next_r:
-                                fav_c += 1
-                        else:
-                            dog_t += 1
-                            if next_r:
-                                dog_c += 1
-            else:
-                current = 0
+    cell = ctx.get('continuation_cube', {}).get(mode, {}).get(trend_type, {}).get(target_length)
+    if not cell:
+        return 0, 0, None
+    continued, total, fav_c, fav_t, dog_c, dog_t = cell
 
     ml_stats: Optional[Dict[str, Tuple[int, int]]] = None
-    if track_ml and (fav_t + dog_t) > 0:
+    if trend_type in ('win_streak', 'loss_streak') and (fav_t + dog_t) > 0:
         ml_stats = {'fav': (fav_c, fav_t), 'dog': (dog_c, dog_t)}
 
     return continued, total, ml_stats
@@ -367,16 +547,7 @@ def get_streak_stats(
         if not ctx:
             return None
 
-        if h2h_mode == 'team':
-            continued, total, _ = _continuation_stats_team(
-                ctx.get('team_games', {}), trend_type, streak_length
-            )
-        else:
-            games_key = 'home_h2h_games' if h2h_mode == 'home_h2h' else 'gen_h2h_games'
-            continued, total, _ = _continuation_stats(
-                ctx.get(games_key, {}), trend_type, streak_length,
-                gen_h2h=(h2h_mode == 'gen_h2h'),
-            )
+        continued, total, _ = _continuation_lookup(ctx, h2h_mode, trend_type, streak_length)
 
         if total == 0:
             return None
@@ -420,22 +591,7 @@ def get_streak_context(
         if not ctx:
             return ''
 
-        if h2h_mode == 'team':
-            all_team_games = ctx.get('team_games', {})
-            if not all_team_games:
-                return ''
-            continued, total, ml_stats = _continuation_stats_team(
-                all_team_games, trend_type, streak_length,
-            )
-        else:
-            games_key = 'home_h2h_games' if h2h_mode == 'home_h2h' else 'gen_h2h_games'
-            all_pair_games = ctx.get(games_key, {})
-            if not all_pair_games:
-                return ''
-            continued, total, ml_stats = _continuation_stats(
-                all_pair_games, trend_type, streak_length,
-                gen_h2h=(h2h_mode == 'gen_h2h'),
-            )
+        continued, total, ml_stats = _continuation_lookup(ctx, h2h_mode, trend_type, streak_length)
 
         if total == 0:
             return ''
@@ -1,8 +1,9 @@
 """World Cup Historical Data Service (international_soccer_games table)."""
 
 from typing import List, Dict, Optional, Tuple
+from datetime import date
 from psycopg2.extras import RealDictCursor
-from .base_service import BaseHistoricalService
+from .base_service import BaseHistoricalService, GameStream
 
 # Columns present in international_soccer_games
 _COLS = """
@@ -137,42 +138,60 @@ class WorldcupService(BaseHistoricalService):
             if conn:
                 conn.close()
 
+    @staticmethod
+    def _games_query(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """Filtered SELECT over international_soccer_games shared by get_games and stream_games."""
+        query = f"SELECT {_COLS} FROM international_soccer_games WHERE 1=1"
+        params = []
+
+        if start_date:
+            query += " AND game_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND game_date <= %s"
+            params.append(end_date)
+        if team:
+            query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
+            params.extend([f"%{team}%", f"%{team}%"])
+        return query, params
+
     @staticmethod
     def get_games(
         limit: int = 50,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        team: Optional[str] = None
-    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
-        """Get World Cup games, optionally filtered by date/team."""
+        team: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str], Optional[str]]:
+        """Get one page of World Cup games, optionally filtered by date/team, and the next page's cursor."""
         try:
             conn = WorldcupService._get_connection()
             if not conn:
-                return None, "Database connection failed"
+                return None, None, "Database connection failed"
 
-            query = f"SELECT {_COLS} FROM international_soccer_games WHERE 1=1"
-            params = []
+            query, params = WorldcupService._games_query(start_date, end_date, team)
 
-            if start_date:
-                query += " AND game_date >= %s"
-                params.append(start_date)
-            if end_date:
-                query += " AND game_date <= %s"
-                params.append(end_date)
-            if team:
-                query += " AND (home_team_name ILIKE %s OR away_team_name ILIKE %s)"
-                params.extend([f"%{team}%", f"%{team}%"])
-
-            query += " ORDER BY game_date DESC, start_time DESC LIMIT %s"
-            params.append(limit)
-
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                games = [dict(g) for g in cursor.fetchall()]
-                return WorldcupService._process_games_list(games), None
+            games, next_cursor = WorldcupService._fetch_games_page(conn, query, params, limit, after)
+            return WorldcupService._process_games_list(games), next_cursor, None
 
         except Exception as e:
-            return None, f"Error fetching games: {str(e)}"
+            return None, None, f"Error fetching games: {str(e)}"
         finally:
             if conn:
                 conn.close()
+
+    @staticmethod
+    def stream_games(
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        team: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None
+    ) -> Tuple[Optional[GameStream], Optional[str]]:
+        """Stream World Cup historical games (newest first) through a server-side cursor, for exports."""
+        query, params = WorldcupService._games_query(start_date, end_date, team)
+        return WorldcupService._stream_games(query, params, limit, after)
@@ -106,53 +106,17 @@ class WorldcupTrendsService(SoccerTrendsService):
             if not conn:
                 return {}
 
-            h2h_conditions = []
-            params = []
-            valid_pairs = []
-
-            for home_team, away_team in team_pairs:
-                home_id = team_id_map.get(home_team)
-                away_id = team_id_map.get(away_team)
-                if home_id and away_id:
-                    h2h_conditions.append(
-                        "(home_team_id = %s AND away_team_id = %s) OR "
-                        "(home_team_id = %s AND away_team_id = %s)"
-                    )
-                    params.extend([home_id, away_id, away_id, home_id])
-                    valid_pairs.append((home_team, away_team))
-
-            h2h_results = {pair: [] for pair in team_pairs}
-
-            if h2h_conditions:
-                query = f"""
-                    SELECT
-                        game_id, game_date, home_team_name, away_team_name,
-                        home_goals, away_goals, total_goals,
-                        home_spread, away_spread,
-                        home_money_line, draw_money_line, away_money_line,
-                        start_time, total_over_point, total_over_price,
-                        total_under_point, total_under_price,
-                        home_team_id, away_team_id
-                    FROM international_soccer_games
-                    WHERE ({' OR '.join(h2h_conditions)})
-                    ORDER BY game_date DESC
-                """
-                reverse_id_map = {v: k for k, v in team_id_map.items()}
-
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute(query, params)
-                    all_h2h = cursor.fetchall()
-
-                for game in all_h2h:
-                    g = dict(game)
-                    g['home_team_orig'] = reverse_id_map.get(g['home_team_id'])
-                    g['away_team_orig'] = reverse_id_map.get(g['away_team_id'])
-                    for home, away in valid_pairs:
-                        if ((g['home_team_orig'] == home and g['away_team_orig'] == away) or
-                                (g['home_team_orig'] == away and g['away_team_orig'] == home)):
-                            if len(h2h_results[(home, away)]) < limit:
-                                h2h_results[(home, away)].append(g)
-                            break
+            h2h_results = cls._fetch_head_to_head_games(
+                conn, 'international_soccer_games',
+                ['game_id', 'game_date', 'home_team_name', 'away_team_name',
+                 'home_goals', 'away_goals', 'total_goals',
+                 'home_spread', 'away_spread',
+                 'home_money_line', 'draw_money_line', 'away_money_line',
+                 'start_time', 'total_over_point', 'total_over_price',
+                 'total_under_point', 'total_under_price',
+                 'home_team_id', 'away_team_id'],
+                team_pairs, team_id_map, limit,
+            )
 
             print(f"Batch fetched worldcup H2H for {len(team_pairs)} pairs")
             return h2h_results
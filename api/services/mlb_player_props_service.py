@@ -2,31 +2,20 @@ import os
 import logging
 import time
 from datetime import datetime
-from sqlalchemy import create_engine, text
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import text
 from dotenv import load_dotenv
 from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 
 from ..external_requests.mlb_player_props_api import get_mlb_player_props, combine_mlb_player_props
 from ..external_requests.team_lookup import get_mlb_team_id_by_odds_api_team_name
 from utils.player_name_utils import normalize_name
+from db import get_engine
 
 load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
-
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=1,
-    max_overflow=2,
-    pool_pre_ping=True,
-    pool_recycle=900,
-    pool_timeout=10,
-    connect_args={
-        "connect_timeout": 5,
-        "application_name": "mlb_player_props_service"
-    }
-)
+
+# Shared process-wide pool (see db.py)
+engine = get_engine()
 
 _mlb_props_cache = TTLCache(maxsize=1000, ttl=21600)  # 6 hours
 
@@ -39,6 +28,29 @@ PITCHER_MARKETS = {
     "pitcher_hits_allowed", "pitcher_walks"
 }
 
+# Per-game aggregates for each props table. Each game has multiple rows (one
+# per market), so histories GROUP BY game and take the MAX of every stat.
+BATTER_HISTORY_COLUMNS = """
+    MAX(odds_batter_hits)          AS odds_batter_hits,
+    MAX(odds_batter_home_runs)     AS odds_batter_home_runs,
+    MAX(odds_batter_rbi)           AS odds_batter_rbi,
+    MAX(actual_batter_hits)        AS actual_batter_hits,
+    MAX(actual_batter_home_runs)   AS actual_batter_home_runs,
+    MAX(actual_batter_rbi)         AS actual_batter_rbi,
+    MAX(opponent_team_name)        AS opponent_team_name,
+    MAX(player_team_name)          AS player_team_name
+"""
+PITCHER_HISTORY_COLUMNS = """
+    MAX(odds_pitcher_strikeouts)   AS odds_pitcher_strikeouts,
+    MAX(odds_pitcher_earned_runs)  AS odds_pitcher_earned_runs,
+    MAX(odds_pitcher_hits_allowed) AS odds_pitcher_hits_allowed,
+    MAX(actual_pitcher_strikeouts)   AS actual_pitcher_strikeouts,
+    MAX(actual_pitcher_earned_runs)  AS actual_pitcher_earned_runs,
+    MAX(actual_pitcher_hits_allowed) AS actual_pitcher_hits_allowed,
+    MAX(opponent_team_name)        AS opponent_team_name,
+    MAX(player_team_name)          AS player_team_name
+"""
+
 
 def execute_with_retry(sql, params, max_retries=3):
     for attempt in range(max_retries):
@@ -105,20 +117,54 @@ def resolve_mlb_player(player_name):
         return None, None
 
 
+def resolve_mlb_players(player_names):
+    """
+    Bulk resolve_mlb_player in one query: {player_name: (team_id, player_id)}.
+
+    Same precedence as the per-player path: an alias wins over mlb_players,
+    the team comes from the resolved player's mlb_players row, and names that
+    resolve to nothing (or a failed lookup) map to (None, None).
+    """
+    normalized = {name: normalize_name(name) for name in player_names}
+    if not normalized:
+        return {}
+    sql = """
+        SELECT n.name, resolved.player_id, p.team_id
+        FROM unnest(CAST(:names AS text[])) AS n(name)
+        LEFT JOIN LATERAL (
+            SELECT player_id, TRUE AS aliased
+            FROM mlb_player_aliases
+            WHERE normalized_name = n.name
+            LIMIT 1
+        ) a ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT id
+            FROM mlb_players
+            WHERE normalized_name = n.name
+            LIMIT 1
+        ) direct ON TRUE
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN a.aliased THEN a.player_id ELSE direct.id END AS player_id
+        ) resolved
+        LEFT JOIN mlb_players p ON p.id = resolved.player_id
+    """
+    found = {}
+    try:
+        for name, player_id, team_id in execute_with_retry(sql, {"names": list(set(normalized.values()))}):
+            if player_id is not None:
+                found[name] = (team_id, player_id)
+    except Exception as e:
+        logging.error(f"Error resolving {len(normalized)} MLB players: {str(e)}")
+    return {name: found.get(key, (None, None)) for name, key in normalized.items()}
+
+
 @cached(cache=_mlb_props_cache)
 def get_last_n_batter_props(player_id, n=5):
     # Each game has multiple rows (one per market), so GROUP BY game to aggregate all stats
-    sql = """
+    sql = f"""
         SELECT
             game_date,
-            MAX(odds_batter_hits)          AS odds_batter_hits,
-            MAX(odds_batter_home_runs)     AS odds_batter_home_runs,
-            MAX(odds_batter_rbi)           AS odds_batter_rbi,
-            MAX(actual_batter_hits)        AS actual_batter_hits,
-            MAX(actual_batter_home_runs)   AS actual_batter_home_runs,
-            MAX(actual_batter_rbi)         AS actual_batter_rbi,
-            MAX(opponent_team_name)        AS opponent_team_name,
-            MAX(player_team_name)          AS player_team_name
+            {BATTER_HISTORY_COLUMNS}
         FROM mlb_batter_props
         WHERE player_id = :player_id
         GROUP BY game_date, odds_event_id
@@ -141,17 +187,10 @@ def get_last_n_batter_props(player_id, n=5):
 @cached(cache=_mlb_props_cache)
 def get_last_n_pitcher_props(player_id, n=5):
     # Each game has multiple rows (one per market), so GROUP BY game to aggregate all stats
-    sql = """
+    sql = f"""
         SELECT
             game_date,
-            MAX(odds_pitcher_strikeouts)   AS odds_pitcher_strikeouts,
-            MAX(odds_pitcher_earned_runs)  AS odds_pitcher_earned_runs,
-            MAX(odds_pitcher_hits_allowed) AS odds_pitcher_hits_allowed,
-            MAX(actual_pitcher_strikeouts)   AS actual_pitcher_strikeouts,
-            MAX(actual_pitcher_earned_runs)  AS actual_pitcher_earned_runs,
-            MAX(actual_pitcher_hits_allowed) AS actual_pitcher_hits_allowed,
-            MAX(opponent_team_name)        AS opponent_team_name,
-            MAX(player_team_name)          AS player_team_name
+            {PITCHER_HISTORY_COLUMNS}
         FROM mlb_pitcher_props
         WHERE player_id = :player_id
         GROUP BY game_date, odds_event_id
@@ -171,6 +210,69 @@ def get_last_n_pitcher_props(player_id, n=5):
         return []
 
 
+def _get_last_n_props_batch(table, columns, player_ids, n):
+    """
+    Windowed version of get_last_n_batter_props / get_last_n_pitcher_props:
+    the last N games of every player in one query, {player_id: rows}.
+
+    Entries are read from and written to _mlb_props_cache under the same keys
+    the single-player functions use, so both paths share one cache.
+    """
+    history = {}
+    missing = []
+    for player_id in dict.fromkeys(player_ids):
+        rows = _mlb_props_cache.get(hashkey(player_id, n=n))
+        if rows is not None:
+            history[player_id] = rows
+        else:
+            missing.append(player_id)
+    if not missing:
+        return history
+
+    sql = f"""
+        SELECT
+            player_id,
+            game_date,
+            {columns}
+        FROM (
+            SELECT
+                player_id,
+                game_date,
+                {columns},
+                ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) AS rn
+            FROM {table}
+            WHERE player_id = ANY(:player_ids)
+            GROUP BY player_id, game_date, odds_event_id
+        ) ranked
+        WHERE rn <= :n
+        ORDER BY player_id, game_date DESC
+    """
+    try:
+        result_rows = execute_with_retry(sql, {"player_ids": missing, "n": n})
+    except Exception as e:
+        logging.error(f"Error loading {table} history for {len(missing)} players: {str(e)}")
+        history.update((player_id, []) for player_id in missing)
+        return history
+
+    fetched = {player_id: [] for player_id in missing}
+    for row in result_rows:
+        record = dict(row._mapping)
+        player_id = record.pop("player_id")
+        fetched[player_id].append(_format_date(record))
+    for player_id, rows in fetched.items():
+        _mlb_props_cache[hashkey(player_id, n=n)] = rows
+    history.update(fetched)
+    return history
+
+
+def get_last_n_batter_props_batch(player_ids, n=5):
+    return _get_last_n_props_batch("mlb_batter_props", BATTER_HISTORY_COLUMNS, player_ids, n)
+
+
+def get_last_n_pitcher_props_batch(player_ids, n=5):
+    return _get_last_n_props_batch("mlb_pitcher_props", PITCHER_HISTORY_COLUMNS, player_ids, n)
+
+
 def _classify_player(markets: dict) -> str:
     """Return 'batter', 'pitcher', or 'unknown' based on market keys."""
     for key in markets:
@@ -200,6 +302,26 @@ def get_structured_mlb_player_props(event_id, limit=5):
             logging.error(f"Error getting MLB team IDs: {str(e)}")
             return None, f"Database error while resolving team IDs: {str(e)}"
 
+        # Resolve every quoted player, then load each table's histories in one query
+        quoted = []
+        for bookmaker in result.get("bookmakers", []):
+            for player_name, player_markets in bookmaker.get("players", {}).items():
+                player_type = _classify_player(player_markets)
+                if player_type != "unknown":
+                    quoted.append((player_name, player_type))
+        resolved = resolve_mlb_players({player_name for player_name, _ in quoted})
+
+        def _player_ids(wanted_type):
+            return [
+                resolved[player_name][1] for player_name, player_type in quoted
+                if player_type == wanted_type and resolved[player_name][1]
+            ]
+
+        historical = {
+            "batter": get_last_n_batter_props_batch(_player_ids("batter"), n=limit),
+            "pitcher": get_last_n_pitcher_props_batch(_player_ids("pitcher"), n=limit),
+        }
+
         home_batters = {}
         home_pitchers = {}
         away_batters = {}
@@ -211,26 +333,11 @@ def get_structured_mlb_player_props(event_id, limit=5):
                 if player_type == "unknown":
                     continue
 
-                try:
-                    team_id, player_id = resolve_mlb_player(player_name)
-                except Exception as e:
-                    logging.error(f"Error resolving MLB player '{player_name}': {str(e)}")
-                    continue
+                team_id, player_id = resolved[player_name]
 
                 player_data = dict(player_markets)
                 player_data["player_id"] = player_id
-
-                if player_id:
-                    try:
-                        if player_type == "batter":
-                            player_data["historical"] = get_last_n_batter_props(player_id, n=limit)
-                        else:
-                            player_data["historical"] = get_last_n_pitcher_props(player_id, n=limit)
-                    except Exception as e:
-                        logging.error(f"Error getting historical data for player {player_id}: {str(e)}")
-                        player_data["historical"] = []
-                else:
-                    player_data["historical"] = []
+                player_data["historical"] = historical[player_type].get(player_id, []) if player_id else []
 
                 if team_id == home_team_id:
                     if player_type == "batter":
@@ -1,6 +1,5 @@
 import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import text
 from dotenv import load_dotenv
 import pytz
 from datetime import datetime
@@ -8,33 +7,36 @@ import time
 import logging
 # Add cache import
 from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 
 # Add missing imports
 from ..external_requests.player_props_api import get_player_props, combine_player_props
-from ..external_requests.player_team_lookup import get_team_id_for_player
+from ..external_requests.player_team_lookup import get_team_ids_for_players
 from ..external_requests.team_lookup import get_team_id_by_odds_api_team_name
+from db import get_engine
 
 load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
-
-# VERY aggressive connection limits for player props service
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=1,        # Only 1 persistent connection
-    max_overflow=2,     # Only 2 overflow connections  
-    pool_pre_ping=True,
-    pool_recycle=900,   # Recycle every 15 minutes
-    pool_timeout=10,    # Short timeout
-    connect_args={
-        "connect_timeout": 5,
-        "application_name": "player_props_service"
-    }
-)
+
+# Shared process-wide pool (see db.py)
+engine = get_engine()
 
 # Use cachetools for Python function caching (not Flask route caching)
 _player_props_cache = TTLCache(maxsize=1000, ttl=21600)  # 6 hours
 
+# Fields to include (all except odds_event_id, espn_event_id, odds_source, bookmaker)
+PROPS_FIELDS = [
+    "id", "player_id", "normalized_name", "game_date",
+    "odds_player_points", "odds_player_points_over_price", "odds_player_points_under_price",
+    "odds_player_rebounds", "odds_player_rebounds_over_price", "odds_player_rebounds_under_price",
+    "odds_player_assists", "odds_player_assists_over_price", "odds_player_assists_under_price",
+    "odds_player_threes", "odds_player_threes_over_price", "odds_player_threes_under_price",
+    "actual_player_points", "actual_player_rebounds", "actual_player_assists", "actual_player_threes",
+    "actual_player_minutes", "actual_player_fg", "actual_player_ft", "actual_plus_minus",
+    "player_team_name", "player_team_id", "opponent_team_name", "opponent_team_id",
+    "created_at", "updated_at", "odds_home_team", "odds_away_team", "odds_home_team_id", "odds_away_team_id", "did_not_play"
+]
+PROPS_COLUMNS = ', '.join(PROPS_FIELDS)
+
 def execute_with_retry(sql, params, max_retries=3):
     """Execute SQL with connection retry logic and proper connection handling"""
     for attempt in range(max_retries):
@@ -54,22 +56,23 @@ def execute_with_retry(sql, params, max_retries=3):
                 conn.close()  # Ensure connection is always closed
     return []
 
+def _format_date(record):
+    """Add short_game_date (MM/DD/YY) to a props record."""
+    if record.get("game_date"):
+        for fmt in ("%a, %d %b %Y %H:%M:%S %Z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+            try:
+                dt = datetime.strptime(str(record["game_date"]), fmt)
+                record["short_game_date"] = dt.strftime("%m/%d/%y")
+                return record
+            except Exception:
+                continue
+    record["short_game_date"] = None
+    return record
+
 @cached(cache=_player_props_cache)
 def get_last_n_player_props(player_id, n=5):
-    # Fields to include (all except odds_event_id, espn_event_id, odds_source, bookmaker)
-    fields = [
-        "id", "player_id", "normalized_name", "game_date",
-        "odds_player_points", "odds_player_points_over_price", "odds_player_points_under_price",
-        "odds_player_rebounds", "odds_player_rebounds_over_price", "odds_player_rebounds_under_price",
-        "odds_player_assists", "odds_player_assists_over_price", "odds_player_assists_under_price",
-        "odds_player_threes", "odds_player_threes_over_price", "odds_player_threes_under_price",
-        "actual_player_points", "actual_player_rebounds", "actual_player_assists", "actual_player_threes",
-        "actual_player_minutes", "actual_player_fg", "actual_player_ft", "actual_plus_minus",
-        "player_team_name", "player_team_id", "opponent_team_name", "opponent_team_id",
-        "created_at", "updated_at", "odds_home_team", "odds_away_team", "odds_home_team_id", "odds_away_team_id", "did_not_play"
-    ]
     sql = f"""
-        SELECT {', '.join(fields)}
+        SELECT {PROPS_COLUMNS}
         FROM nba_player_props
         WHERE player_id = :player_id
         ORDER BY game_date DESC, id DESC
@@ -81,23 +84,7 @@ def get_last_n_player_props(player_id, n=5):
         rows = []
         for row in result_rows:
             record = dict(row._mapping)
-            # Convert game_date to MM/DD/YY format
-            if record.get("game_date"):
-                try:
-                    dt = datetime.strptime(str(record["game_date"]), "%a, %d %b %Y %H:%M:%S %Z")
-                    record["short_game_date"] = dt.strftime("%m/%d/%y")
-                except Exception:
-                    try:
-                        dt = datetime.strptime(str(record["game_date"]), "%Y-%m-%d %H:%M:%S")
-                        record["short_game_date"] = dt.strftime("%m/%d/%y")
-                    except Exception:
-                        try:
-                            dt = datetime.strptime(str(record["game_date"]), "%Y-%m-%d")
-                            record["short_game_date"] = dt.strftime("%m/%d/%y")
-                        except Exception:
-                            record["short_game_date"] = None
-            else:
-                record["short_game_date"] = None
+            record = _format_date(record)
             rows.append(record)
         return rows
     except Exception as e:
@@ -107,21 +94,10 @@ def get_last_n_player_props(player_id, n=5):
 @cached(cache=_player_props_cache)
 def get_last_n_player_props_venue(player_id, venue_type, team_name, n=5):
     """Get last N games for player at specific venue (home/away)"""
-    fields = [
-        "id", "player_id", "normalized_name", "game_date",
-        "odds_player_points", "odds_player_points_over_price", "odds_player_points_under_price",
-        "odds_player_rebounds", "odds_player_rebounds_over_price", "odds_player_rebounds_under_price",
-        "odds_player_assists", "odds_player_assists_over_price", "odds_player_assists_under_price",
-        "odds_player_threes", "odds_player_threes_over_price", "odds_player_threes_under_price",
-        "actual_player_points", "actual_player_rebounds", "actual_player_assists", "actual_player_threes",
-        "actual_player_minutes", "actual_player_fg", "actual_player_ft", "actual_plus_minus",
-        "player_team_name", "player_team_id", "opponent_team_name", "opponent_team_id",
-        "created_at", "updated_at", "odds_home_team", "odds_away_team", "odds_home_team_id", "odds_away_team_id", "did_not_play"
-    ]
     
     if venue_type == 'home':
         sql = f"""
-            SELECT {', '.join(fields)}
+            SELECT {PROPS_COLUMNS}
             FROM nba_player_props
             WHERE player_id = :player_id AND odds_home_team = :team_name
             ORDER BY game_date DESC, id DESC
@@ -129,7 +105,7 @@ def get_last_n_player_props_venue(player_id, venue_type, team_name, n=5):
         """
     else:  # away
         sql = f"""
-            SELECT {', '.join(fields)}
+            SELECT {PROPS_COLUMNS}
             FROM nba_player_props
             WHERE player_id = :player_id AND odds_away_team = :team_name
             ORDER BY game_date DESC, id DESC
@@ -141,23 +117,7 @@ def get_last_n_player_props_venue(player_id, venue_type, team_name, n=5):
         rows = []
         for row in result_rows:
             record = dict(row._mapping)
-            # Convert game_date to MM/DD/YY format
-            if record.get("game_date"):
-                try:
-                    dt = datetime.strptime(str(record["game_date"]), "%a, %d %b %Y %H:%M:%S %Z")
-                    record["short_game_date"] = dt.strftime("%m/%d/%y")
-                except Exception:
-                    try:
-                        dt = datetime.strptime(str(record["game_date"]), "%Y-%m-%d %H:%M:%S")
-                        record["short_game_date"] = dt.strftime("%m/%d/%y")
-                    except Exception:
-                        try:
-                            dt = datetime.strptime(str(record["game_date"]), "%Y-%m-%d")
-                            record["short_game_date"] = dt.strftime("%m/%d/%y")
-                        except Exception:
-                            record["short_game_date"] = None
-            else:
-                record["short_game_date"] = None
+            record = _format_date(record)
             rows.append(record)
         return rows
     except Exception as e:
@@ -167,21 +127,10 @@ def get_last_n_player_props_venue(player_id, venue_type, team_name, n=5):
 @cached(cache=_player_props_cache)
 def get_last_n_player_props_vs_opponent(player_id, venue_type, team_name, opponent_name, n=5):
     """Get last N games for player at venue against specific opponent"""
-    fields = [
-        "id", "player_id", "normalized_name", "game_date",
-        "odds_player_points", "odds_player_points_over_price", "odds_player_points_under_price",
-        "odds_player_rebounds", "odds_player_rebounds_over_price", "odds_player_rebounds_under_price",
-        "odds_player_assists", "odds_player_assists_over_price", "odds_player_assists_under_price",
-        "odds_player_threes", "odds_player_threes_over_price", "odds_player_threes_under_price",
-        "actual_player_points", "actual_player_rebounds", "actual_player_assists", "actual_player_threes",
-        "actual_player_minutes", "actual_player_fg", "actual_player_ft", "actual_plus_minus",
-        "player_team_name", "player_team_id", "opponent_team_name", "opponent_team_id",
-        "created_at", "updated_at", "odds_home_team", "odds_away_team", "odds_home_team_id", "odds_away_team_id", "did_not_play"
-    ]
     
     if venue_type == 'home':
         sql = f"""
-            SELECT {', '.join(fields)}
+            SELECT {PROPS_COLUMNS}
             FROM nba_player_props
             WHERE player_id = :player_id 
             AND odds_home_team = :team_name 
@@ -191,7 +140,7 @@ def get_last_n_player_props_vs_opponent(player_id, venue_type, team_name, oppone
         """
     else:  # away
         sql = f"""
-            SELECT {', '.join(fields)}
+            SELECT {PROPS_COLUMNS}
             FROM nba_player_props
             WHERE player_id = :player_id 
             AND odds_away_team = :team_name 
@@ -205,29 +154,94 @@ def get_last_n_player_props_vs_opponent(player_id, venue_type, team_name, oppone
         rows = []
         for row in result_rows:
             record = dict(row._mapping)
-            # Convert game_date to MM/DD/YY format
-            if record.get("game_date"):
-                try:
-                    dt = datetime.strptime(str(record["game_date"]), "%a, %d %b %Y %H:%M:%S %Z")
-                    record["short_game_date"] = dt.strftime("%m/%d/%y")
-                except Exception:
-                    try:
-                        dt = datetime.strptime(str(record["game_date"]), "%Y-%m-%d %H:%M:%S")
-                        record["short_game_date"] = dt.strftime("%m/%d/%y")
-                    except Exception:
-                        try:
-                            dt = datetime.strptime(str(record["game_date"]), "%Y-%m-%d")
-                            record["short_game_date"] = dt.strftime("%m/%d/%y")
-                        except Exception:
-                            record["short_game_date"] = None
-            else:
-                record["short_game_date"] = None
+            record = _format_date(record)
             rows.append(record)
         return rows
     except Exception as e:
         logging.error(f"Error in get_last_n_player_props_vs_opponent for player {player_id}: {str(e)}")
         return []
 
+def _get_last_n_player_props_batch(player_ids, n, cache_key, venue_filter="", params=None):
+    """
+    Last N props rows for many players in one windowed query: {player_id: rows}.
+
+    ``cache_key(player_id)`` is the key the matching single-player function
+    uses in _player_props_cache, so cached players skip the query and fetched
+    ones are stored for later single-player lookups.
+    """
+    history = {}
+    missing = []
+    for player_id in dict.fromkeys(player_ids):
+        rows = _player_props_cache.get(cache_key(player_id))
+        if rows is not None:
+            history[player_id] = rows
+        else:
+            missing.append(player_id)
+    if not missing:
+        return history
+
+    sql = f"""
+        SELECT {PROPS_COLUMNS}
+        FROM (
+            SELECT {PROPS_COLUMNS},
+                   ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC, id DESC) AS rn
+            FROM nba_player_props
+            WHERE player_id = ANY(:player_ids){venue_filter}
+        ) ranked
+        WHERE rn <= :n
+        ORDER BY player_id, game_date DESC, id DESC
+    """
+    try:
+        result_rows = execute_with_retry(sql, dict(params or {}, player_ids=missing, n=n))
+    except Exception as e:
+        logging.error(f"Error in _get_last_n_player_props_batch for {len(missing)} players: {str(e)}")
+        history.update((player_id, []) for player_id in missing)
+        return history
+
+    fetched = {player_id: [] for player_id in missing}
+    for row in result_rows:
+        record = _format_date(dict(row._mapping))
+        fetched[record["player_id"]].append(record)
+    for player_id, rows in fetched.items():
+        _player_props_cache[cache_key(player_id)] = rows
+    history.update(fetched)
+    return history
+
+def get_last_n_player_props_batch(player_ids, n=5):
+    """Batched get_last_n_player_props: {player_id: rows} from a single query"""
+    return _get_last_n_player_props_batch(player_ids, n, lambda player_id: hashkey(player_id, n=n))
+
+def get_last_n_player_props_venue_batch(player_ids, venue_type, team_name, n=5):
+    """Batched get_last_n_player_props_venue: {player_id: rows} from a single query"""
+    team_column = 'odds_home_team' if venue_type == 'home' else 'odds_away_team'
+    return _get_last_n_player_props_batch(
+        player_ids, n,
+        lambda player_id: hashkey(player_id, venue_type, team_name, n=n),
+        f" AND {team_column} = :team_name",
+        {"team_name": team_name}
+    )
+
+def get_last_n_player_props_vs_opponent_batch(player_ids, venue_type, team_name, opponent_name, n=5):
+    """Batched get_last_n_player_props_vs_opponent: {player_id: rows} from a single query"""
+    if venue_type == 'home':
+        team_column, opponent_column = 'odds_home_team', 'odds_away_team'
+    else:
+        team_column, opponent_column = 'odds_away_team', 'odds_home_team'
+    return _get_last_n_player_props_batch(
+        player_ids, n,
+        lambda player_id: hashkey(player_id, venue_type, team_name, opponent_name, n=n),
+        f" AND {team_column} = :team_name AND {opponent_column} = :opponent_name",
+        {"team_name": team_name, "opponent_name": opponent_name}
+    )
+
+def _player_names(result):
+    """Every player name quoted by any bookmaker for the event"""
+    return {
+        player_name
+        for bookmaker in result.get("bookmakers", [])
+        for player_name in bookmaker.get("players", {})
+    }
+
 def get_structured_player_props(event_id, limit=5):
     try:
         event_data = get_player_props(event_id)
@@ -248,26 +262,28 @@ def get_structured_player_props(event_id, limit=5):
             logging.error(f"Error getting team IDs: {str(e)}")
             return None, f'Database error while resolving team IDs: {str(e)}'
 
+        # Resolve every quoted player and load all their histories up front:
+        # one query each, however many players the bookmakers list
+        try:
+            resolved = get_team_ids_for_players(_player_names(result))
+        except Exception as e:
+            logging.error(f"Error getting player/team for event {event_id}: {str(e)}")
+            resolved = {}  # Skip the players instead of failing entire request
+        historical = get_last_n_player_props_batch(
+            [player_id for _, player_id in resolved.values() if player_id], n=limit
+        )
+
         home_players = {}
         away_players = {}
         for bookmaker in result.get("bookmakers", []):
             for player_name, player_markets in bookmaker.get("players", {}).items():
-                try:
-                    team_id, player_id = get_team_id_for_player(player_name)
-                except Exception as e:
-                    logging.error(f"Error getting player/team for {player_name}: {str(e)}")
-                    continue  # Skip this player instead of failing entire request
-                
+                if player_name not in resolved:
+                    continue
+                team_id, player_id = resolved[player_name]
+
                 player_markets["player_id"] = player_id
-                if player_id:
-                    try:
-                        player_markets["historical"] = get_last_n_player_props(player_id, n=limit)
-                    except Exception as e:
-                        logging.error(f"Error getting historical data for player {player_id}: {str(e)}")
-                        player_markets["historical"] = []
-                else:
-                    player_markets["historical"] = []
-                    
+                player_markets["historical"] = historical.get(player_id, []) if player_id else []
+
                 if team_id == home_team_id:
                     home_players[player_name] = player_markets
                 elif team_id == away_team_id:
@@ -316,24 +332,24 @@ def get_structured_player_props_venue(event_id, venue_type, limit=5):
         target_team_name = home_team_name if venue_type == 'home' else away_team_name
         target_team_id = home_team_id if venue_type == 'home' else away_team_id
 
+        try:
+            resolved = get_team_ids_for_players(_player_names(result))
+        except Exception as e:
+            return None, f'Database error while resolving player/team: {str(e)}'
+        target_ids = [
+            player_id for team_id, player_id in resolved.values()
+            if team_id == target_team_id and player_id
+        ]
+        historical = get_last_n_player_props_venue_batch(
+            target_ids, venue_type, target_team_name, n=limit
+        )
+
         for bookmaker in result.get("bookmakers", []):
             for player_name, player_markets in bookmaker.get("players", {}).items():
-                try:
-                    team_id, player_id = get_team_id_for_player(player_name)
-                except Exception as e:
-                    return None, f'Database error while resolving player/team: {str(e)}'
-                
+                team_id, player_id = resolved[player_name]
                 if team_id == target_team_id:
                     player_markets["player_id"] = player_id
-                    if player_id:
-                        try:
-                            player_markets["historical"] = get_last_n_player_props_venue(
-                                player_id, venue_type, target_team_name, n=limit
-                            )
-                        except Exception as e:
-                            player_markets["historical"] = []
-                    else:
-                        player_markets["historical"] = []
+                    player_markets["historical"] = historical.get(player_id, []) if player_id else []
                     target_players[player_name] = player_markets
 
         if not target_players:
@@ -363,24 +379,24 @@ def get_structured_player_props_vs_opponent(event_id, venue_type, limit=5):
         target_team_id = home_team_id if venue_type == 'home' else away_team_id
         opponent_team_name = away_team_name if venue_type == 'home' else home_team_name
 
+        try:
+            resolved = get_team_ids_for_players(_player_names(result))
+        except Exception as e:
+            return None, f'Database error while resolving player/team: {str(e)}'
+        target_ids = [
+            player_id for team_id, player_id in resolved.values()
+            if team_id == target_team_id and player_id
+        ]
+        historical = get_last_n_player_props_vs_opponent_batch(
+            target_ids, venue_type, target_team_name, opponent_team_name, n=limit
+        )
+
         for bookmaker in result.get("bookmakers", []):
             for player_name, player_markets in bookmaker.get("players", {}).items():
-                try:
-                    team_id, player_id = get_team_id_for_player(player_name)
-                except Exception as e:
-                    return None, f'Database error while resolving player/team: {str(e)}'
-                
+                team_id, player_id = resolved[player_name]
                 if team_id == target_team_id:
                     player_markets["player_id"] = player_id
-                    if player_id:
-                        try:
-                            player_markets["historical"] = get_last_n_player_props_vs_opponent(
-                                player_id, venue_type, target_team_name, opponent_team_name, n=limit
-                            )
-                        except Exception as e:
-                            player_markets["historical"] = []
-                    else:
-                        player_markets["historical"] = []
+                    player_markets["historical"] = historical.get(player_id, []) if player_id else []
                     target_players[player_name] = player_markets
 
         if not target_players:
@@ -27,20 +27,6 @@ def get_next_game_date_within_7_days(scores, selected_date_start):
     
     return None
 
-def filter_games_by_date(scores, selected_date_start):
-    """Filter games by selected date"""
-    if not selected_date_start:
-        return scores
-    
-    filtered_scores = []
-    for score in scores:
-        commence_time_str = score['commence_time']
-        commence_date = parser.parse(commence_time_str).astimezone(pytz.utc)
-        if convert_to_eastern(commence_date).date() == selected_date_start.date():
-            filtered_scores.append(score)
-    
-    return filtered_scores
-
 def format_commence_time(commence_time_str):
     """Format commence time to ISO string"""
     if not commence_time_str:
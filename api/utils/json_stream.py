@@ -0,0 +1,46 @@
+"""
+Streamed JSON responses for result sets too large to build in memory
+"""
+from typing import Dict, Iterable
+
+from flask import Response, current_app
+
+# Encoded rows are sent in chunks of about this many bytes
+CHUNK_SIZE = 64 * 1024
+
+
+def stream_json_array(rows: Iterable[Dict], key: str, envelope: Dict) -> Response:
+    """
+    Respond with ``{**envelope, key: [...rows], "count": n}``, encoding and
+    sending the rows as they are produced instead of building the document.
+
+    If ``rows`` has a ``close()`` (e.g. a GameStream) it is called when the
+    response is closed, including when the client goes away mid-stream.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        head = dumps(envelope)[:-1]
+        chunk = [head, ', ' if envelope else '', dumps(key), ': [']
+        size = 0
+        count = 0
+        for row in rows:
+            encoded = dumps(row)
+            chunk.append(', ' + encoded if count else encoded)
+            count += 1
+            size += len(encoded)
+            if size >= CHUNK_SIZE:
+                yield ''.join(chunk)
+                chunk, size = [], 0
+        chunk.append(f'], "count": {count}}}')
+        yield ''.join(chunk)
+
+    response = Response(generate(), mimetype='application/json')
+    if hasattr(rows, 'close'):
+        response.call_on_close(rows.close)
+    return response
+
+
+def wants_stream(args) -> bool:
+    """True when the request asked for a streamed export (``?stream=1`` / ``?stream=true``)."""
+    return args.get('stream', '').lower() in ('1', 'true', 'yes')
@@ -63,12 +63,16 @@ def process_market_outcomes(market, home_team, away_team, home_odds, away_odds,
                 totals["under_point"] = point
                 totals["under_price"] = price
 
-def process_odds_data(match, odds, home_team, away_team):
-    """Process all odds data for a match"""
+def extract_markets(match_odds, home_team, away_team):
+    """Pull h2h/spread/total (and draw) prices for one game out of its Odds API odds entry"""
     home_odds, away_odds, totals, draw_odds = initialize_odds_structure()
-    match_odds = next((o for o in odds if o['id'] == match['id']), None)
     if match_odds:
         for bookmaker in match_odds['bookmakers']:
             for market in bookmaker['markets']:
                 process_market_outcomes(market, home_team, away_team, home_odds, away_odds, totals, draw_odds=draw_odds)
     return home_odds, away_odds, totals, draw_odds
+
+def process_odds_data(match, odds, home_team, away_team):
+    """Process all odds data for a match (one-off lookup; use OddsSnapshot for a whole slate)"""
+    match_odds = next((o for o in odds if o['id'] == match['id']), None)
+    return extract_markets(match_odds, home_team, away_team)
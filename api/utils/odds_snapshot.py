@@ -0,0 +1,81 @@
+"""
+Parsed, indexed view of one Odds API scores + odds payload
+"""
+from collections import defaultdict
+from dateutil import parser
+import pytz
+
+from .date_utils import convert_to_eastern
+from .odds_formatter import extract_markets
+
+
+def _eastern_date(commence_time):
+    """ET calendar date of an Odds API commence_time, or None if missing/unparseable"""
+    if not commence_time:
+        return None
+    try:
+        return convert_to_eastern(parser.parse(commence_time).astimezone(pytz.utc)).date()
+    except (ValueError, OverflowError):
+        return None
+
+
+class OddsSnapshot:
+    """One sport's scores + odds payload, parsed once.
+
+    Scores entries are indexed by Odds API id, by (away team, home team, ET date)
+    and by ET date, keeping the payload's order, and every game's h2h / spread /
+    total prices are extracted from the bookmaker markets up front, so a slate is
+    formatted in O(n) and a single game is found without rebuilding the slate.
+    """
+
+    def __init__(self, scores, odds):
+        self.scores = scores
+        self.odds = odds
+
+        odds_by_id = {}
+        for entry in odds:
+            odds_by_id.setdefault(entry.get('id'), entry)
+
+        self._by_id = {}
+        self._by_date = defaultdict(list)
+        self._by_matchup = defaultdict(list)
+        self._markets = {}
+        for match in scores:
+            game_id = match.get('id')
+            home_team = match.get('home_team', 'N/A')
+            away_team = match.get('away_team', 'N/A')
+            day = _eastern_date(match.get('commence_time'))
+
+            self._by_id.setdefault(game_id, match)
+            self._by_date[day].append(match)
+            self._by_matchup[(away_team, home_team, day)].append(match)
+            if game_id not in self._markets:
+                self._markets[game_id] = extract_markets(odds_by_id.get(game_id), home_team, away_team)
+
+    def get(self, game_id):
+        """Scores entry for an Odds API game id, or None"""
+        return self._by_id.get(game_id)
+
+    def games_on(self, day):
+        """Scores entries starting on an ET calendar date (a datetime.date)"""
+        return list(self._by_date.get(day, ()))
+
+    def find(self, away_team, home_team, day):
+        """Scores entries for a matchup on an ET date, earliest first (doubleheaders)"""
+        matches = self._by_matchup.get((away_team, home_team, day), ())
+        return sorted(matches, key=lambda m: m.get('commence_time') or '')
+
+    def markets(self, match):
+        """(home_odds, away_odds, totals, draw_odds) for a scores entry, same shape as
+        process_odds_data; each call returns fresh dicts the caller may keep or modify"""
+        extracted = self._markets.get(match.get('id'))
+        if extracted is None:
+            extracted = extract_markets(None, None, None)
+        return tuple(dict(part) for part in extracted)
+
+    def moneylines(self, game_id):
+        """(home_h2h, away_h2h) for a game id; (None, None) when there is no h2h market"""
+        extracted = self._markets.get(game_id)
+        if extracted is None:
+            return None, None
+        return extracted[0]['h2h'], extracted[1]['h2h']
@@ -2,18 +2,22 @@ import os
 from dotenv import load_dotenv
 load_dotenv(override=True)  # Must run before any other imports that read env vars
 
-from flask import Flask, jsonify, Blueprint, send_from_directory, make_response
-from datetime import datetime, timedelta
+from flask import Flask, jsonify, Blueprint, send_from_directory, make_response, request
+from datetime import datetime
 import pytz
 import re
+import gzip
 import html
 import json
 
 from cache import cache, init_cache
+from metrics import init_metrics, render as render_metrics
+from ssr_shell import ShellTemplate, RenderedPageCache, meta_hash
+from sitemaps import get_sitemap_file, start_sitemap_builder, INDEX as SITEMAP_INDEX, SECTIONS as SITEMAP_SECTIONS
 from api.services.blog_service import BlogService
-from api.utils.team_slugs import team_slug as _team_slug, SPORT_TEAMS as _SPORT_TEAMS, resolve_team_slug
+from api.utils.team_slugs import resolve_team_slug
 from api.services.game_service import GameService
-from api.external_requests.odds_api import convert_sport_url_to_api_key
+from api.external_requests.odds_api import convert_sport_url_to_api_key, clear_odds_snapshots
 import logging
 from api.routes.games import games_bp
 from api.routes.odds import odds_bp
@@ -84,6 +88,10 @@ eastern_tz = pytz.timezone('US/Eastern')
 # Determine if caching should be enabled based on the environment
 cache = init_cache(app)
 
+# Per-route / DB / outbound HTTP / cache latency, served on /internal/metrics
+init_metrics(app)
+INTERNAL_PASSWORD = os.getenv("INTERNAL_PASSWORD")
+
 app.register_blueprint(games_bp)
 app.register_blueprint(odds_bp)
 app.register_blueprint(rankings_bp)
@@ -331,44 +339,24 @@ def _get_page_meta(path):
     return meta
 
 
-_index_html_content = None
+_shell_template = None
+_rendered_pages = RenderedPageCache(int(os.getenv('SSR_PAGE_CACHE_SIZE', '2048')))
 
-def _get_index_html():
-    global _index_html_content
-    if _index_html_content is None:
+def _get_shell_template():
+    """index.html, split once into a ShellTemplate (reset by /clear-cache)."""
+    global _shell_template
+    if _shell_template is None:
         with open('getstam-react/build/index.html', 'r') as f:
-            _index_html_content = f.read()
-    return _index_html_content
+            _shell_template = ShellTemplate(f.read())
+    return _shell_template
 
 
-def _inject_meta(page_html, meta):
+def _inject_meta(shell, meta):
     title = html.escape(meta['title'])
     description = html.escape(meta['description'])
     og_image = html.escape(meta['og_image'])
     canonical_url = html.escape(f"{BASE_URL}{meta['canonical_path']}")
 
-    page_html = re.sub(r'<title>[^<]*</title>', f'<title>{title}</title>', page_html)
-    page_html = re.sub(
-        r'<meta\s+name="description"\s+content="[^"]*"\s*/?>',
-        f'<meta name="description" content="{description}" />',
-        page_html,
-    )
-    page_html = re.sub(
-        r'<meta\s+property="og:title"\s+content="[^"]*"\s*/?>',
-        f'<meta property="og:title" content="{title}" />',
-        page_html,
-    )
-    page_html = re.sub(
-        r'<meta\s+property="og:description"\s+content="[^"]*"\s*/?>',
-        f'<meta property="og:description" content="{description}" />',
-        page_html,
-    )
-    page_html = re.sub(
-        r'<meta\s+property="og:image"\s+content="[^"]*"\s*/?>',
-        f'<meta property="og:image" content="{og_image}" />',
-        page_html,
-    )
-
     extra_tags = (
         f'<meta property="og:url" content="{canonical_url}" />'
         f'<link rel="canonical" href="{canonical_url}" />'
@@ -384,97 +372,74 @@ def _inject_meta(page_html, meta):
         for block in meta['json_ld']
     )
 
-    return page_html.replace('</head>', extra_tags + json_ld_tags + '</head>', 1)
+    return shell.render({
+        'title': f'<title>{title}</title>',
+        'description': f'<meta name="description" content="{description}" />',
+        'og_title': f'<meta property="og:title" content="{title}" />',
+        'og_description': f'<meta property="og:description" content="{description}" />',
+        'og_image': f'<meta property="og:image" content="{og_image}" />',
+        'head_end': extra_tags + json_ld_tags,
+    })
+
+
+def _get_rendered_page(meta):
+    """Rendered shell for a page's meta, from the LRU when this exact meta was served before."""
+    key = (meta['canonical_path'], meta_hash(meta))
+    page = _rendered_pages.get(key)
+    if page is None:
+        page = _rendered_pages.put(key, _inject_meta(_get_shell_template(), meta))
+    return page
 
 
 #Route to clear the cache
 @app.route('/clear-cache')
 def clear_cache():
-    global _index_html_content
+    global _shell_template
     cache.clear()
-    _index_html_content = None
+    clear_odds_snapshots()
+    _shell_template = None
+    _rendered_pages.clear()
     logging.info("Cache cleared")
     return "Cache cleared", 200
 
-# Serve sitemap dynamically so daily pages always get today's lastmod
+@app.route('/internal/metrics')
+def internal_metrics():
+    if not INTERNAL_PASSWORD or request.headers.get("X-Internal-Password") != INTERNAL_PASSWORD:
+        return jsonify({"error": "Unauthorized"}), 401
+    response = make_response(render_metrics())
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
+def _sitemap_response(name):
+    """Serve a stored sitemap file, gzipped as stored unless the client can't take it."""
+    # Started here rather than at import so scripts and benchmarks importing app don't build sitemaps
+    start_sitemap_builder(app)
+    found = get_sitemap_file(name)
+    if found is None:
+        return "Not found", 404
+    body, built_at = found
+    if 'gzip' in request.accept_encodings:
+        response = make_response(body)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = make_response(gzip.decompress(body))
+    response.headers['Content-Type'] = 'application/xml'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.last_modified = datetime.fromtimestamp(built_at, pytz.utc)
+    return response.make_conditional(request)
+
+
+# Sitemap index + per-section files, built in the background (see sitemaps.py)
 @app.route('/sitemap.xml')
 def sitemap():
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    daily_sports = [
-        ('nba', '0.9'), ('mlb', '0.9'), ('nfl', '0.9'), ('nhl', '0.9'),
-        ('ncaaf', '0.8'), ('ncaab', '0.8'), ('epl', '0.8'), ('laliga', '0.8'),
-        ('bundesliga', '0.8'), ('ligue1', '0.8'), ('seriea', '0.8'),
-    ]
-    daily_trends = [
-        ('nba', '0.8'), ('mlb', '0.8'), ('nfl', '0.8'), ('nhl', '0.8'),
-        ('ncaaf', '0.7'), ('ncaab', '0.7'), ('epl', '0.7'), ('laliga', '0.7'),
-        ('bundesliga', '0.7'), ('ligue1', '0.7'), ('seriea', '0.7'),
-    ]
-    static_pages = [
-        ('https://www.getstam.com/',              'daily',   '1.0', today),
-        ('https://www.getstam.com/about-us',      'monthly', '0.5', '2025-01-01'),
-        ('https://www.getstam.com/betting-guide',  'monthly', '0.6', '2025-01-01'),
-        ('https://www.getstam.com/contact-us',     'monthly', '0.4', '2025-01-01'),
-        ('https://www.getstam.com/privacy-policy', 'yearly',  '0.3', '2025-01-01'),
-        ('https://www.getstam.com/blog',           'weekly',  '0.7', today),
-    ]
-
-    team_page_priority = {'nba': '0.7', 'nfl': '0.7', 'mlb': '0.7', 'nhl': '0.7', 'ncaaf': '0.6', 'ncaab': '0.6'}
-
-    urls = []
-    for sport, priority in daily_sports:
-        urls.append(f'  <url><loc>https://www.getstam.com/{sport}</loc><lastmod>{today}</lastmod><changefreq>daily</changefreq><priority>{priority}</priority></url>')
-    for sport, priority in daily_trends:
-        urls.append(f'  <url><loc>https://www.getstam.com/{sport}/trends</loc><lastmod>{today}</lastmod><changefreq>daily</changefreq><priority>{priority}</priority></url>')
-    for sport, teams in _SPORT_TEAMS.items():
-        priority = team_page_priority.get(sport, '0.6')
-        for team in teams:
-            slug = _team_slug(team)
-            urls.append(f'  <url><loc>https://www.getstam.com/team/{sport}/{slug}</loc><lastmod>{today}</lastmod><changefreq>weekly</changefreq><priority>{priority}</priority></url>')
-    for loc, changefreq, priority, lastmod in static_pages:
-        urls.append(f'  <url><loc>{loc}</loc><lastmod>{lastmod}</lastmod><changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>')
-
-    # Blog post pages
-    try:
-        from api.services.blog_service import BlogService as _BlogService
-        post_slugs, _ = _BlogService.get_published_slugs()
-        for post_slug in post_slugs:
-            urls.append(f'  <url><loc>https://www.getstam.com/blog/{post_slug}</loc><lastmod>{today}</lastmod><changefreq>monthly</changefreq><priority>0.6</priority></url>')
-    except Exception:
-        pass
-
-    # Matchup pages — today + tomorrow only, for the 6 sports with team-slug infrastructure.
-    # Doubleheader "-2" URLs are intentionally omitted (low value; still reachable via
-    # internal links, just not proactively submitted).
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
-    matchup_sport_keys = {
-        'nba': 'basketball_nba', 'nfl': 'americanfootball_nfl', 'mlb': 'baseball_mlb',
-        'nhl': 'icehockey_nhl', 'ncaaf': 'americanfootball_ncaaf', 'ncaab': 'basketball_ncaab',
-    }
-    for date_str in (today, tomorrow):
-        for sport, sport_key in matchup_sport_keys.items():
-            try:
-                result, err = GameService.get_games_for_date(sport_key, date_str)
-                if err or not result:
-                    continue
-                for g in result['games']:
-                    away_slug = _team_slug(g['away']['team'])
-                    home_slug = _team_slug(g['home']['team'])
-                    urls.append(
-                        f'  <url><loc>https://www.getstam.com/game-details/{sport}/{away_slug}-vs-{home_slug}-{date_str}</loc>'
-                        f'<lastmod>{today}</lastmod><changefreq>hourly</changefreq><priority>0.75</priority></url>'
-                    )
-            except Exception:
-                continue
-
-    xml = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-    xml += '\n'.join(urls)
-    xml += '\n</urlset>'
-
-    response = make_response(xml)
-    response.headers['Content-Type'] = 'application/xml'
-    return response
+    return _sitemap_response(SITEMAP_INDEX)
+
+
+@app.route('/sitemap-<section>.xml')
+def sitemap_section(section):
+    if section not in SITEMAP_SECTIONS:
+        return "Not found", 404
+    return _sitemap_response(section)
 
 
 # Serve Firebase messaging service worker from root
@@ -498,10 +463,12 @@ def serve(path):
         return send_from_directory(app.static_folder, path)
     # Serve index.html with injected meta tags for crawler-friendly SSR
     meta = _get_page_meta(path)
-    html_out = _inject_meta(_get_index_html(), meta)
-    response = make_response(html_out)
+    page = _get_rendered_page(meta)
+    response = make_response(page.body)
     response.headers['Content-Type'] = 'text/html'
-    return response
+    # Strong ETag over the exact bytes; a matching If-None-Match gets a bodiless 304
+    response.set_etag(page.etag)
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     # Start the Flask application
@@ -0,0 +1,31 @@
+"""Offline benchmarks for the API's hot paths.
+
+    python -m benchmarks [--scales 1 10] [--repeat 5] [--cases trends context]
+                         [--output results.json] [--compare baseline.json]
+
+Cases (see runner.CASES):
+
+    odds.process_odds_data   per-game odds formatting over a recorded Odds API slate
+    odds.snapshot_markets    the same slate through OddsSnapshot
+    ssr.inject_meta          app._inject_meta for every game-details page on the slate
+    context.build            trend_context_service context + continuation cube build
+    context.lookup           get_streak_context for every streak on the slate
+    context.refresh          full trend-context load from Postgres            (DB)
+    trends.nba               NBATrendsService.analyze_multiple_games_trends   (DB)
+
+Scale 1 is a realistic NBA night (12 games, 30 teams, five seasons of
+history); scale N multiplies the slate, the league and the history by N.
+Inputs come from benchmarks.fixtures and are identical on every run.
+
+The DB cases need BENCH_DATABASE_URL, a throwaway local Postgres. Only the
+``getstam_bench`` schema in it is touched; it is dropped and reseeded for each
+scale. Without it those cases are reported under "skipped".
+
+``python -m benchmarks.query_plans`` is the companion plan check: it runs
+EXPLAIN (ANALYZE, BUFFERS) over a catalogue of hot queries against a seeded
+database and fails when one of them falls back to a sequential scan.
+
+Results are a JSON document (commit, interpreter, and min/median/mean/p95/max
+milliseconds per case and scale) so runs can be stored and compared with
+--compare.
+"""
@@ -0,0 +1,290 @@
+"""Deterministic synthetic fixtures for the benchmarks.
+
+Everything here is generated from a fixed seed, so two runs (on two commits)
+time exactly the same inputs:
+
+- an NBA league (the 30 real teams, padded with synthetic ones at larger
+  scales) and several seasons of completed games, seeded into Postgres;
+- today's slate in Odds API shape, read from the recorded payload in
+  ``data/odds_nba.json`` and replicated with fresh ids for larger slates;
+- the React build's index.html shell (``data/index.html``).
+"""
+
+import copy
+import json
+import os
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+from sqlalchemy import create_engine, text
+
+from shared_utils import convert_team_name
+from team_game_log import rebuild_team_game_log
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+SEED = 20240101
+BENCH_SCHEMA = 'getstam_bench'
+
+# Realistic (scale 1) sizes; scale N multiplies the league, history and slate
+SLATE_GAMES = 12
+SEASONS = 5
+GAMES_PER_TEAM_PER_SEASON = 82
+SEASON_DAYS = 170
+FIRST_SEASON = date(2019, 10, 22)
+
+NBA_TEAMS = [
+    'Atlanta Hawks', 'Boston Celtics', 'Brooklyn Nets', 'Charlotte Hornets',
+    'Chicago Bulls', 'Cleveland Cavaliers', 'Dallas Mavericks', 'Denver Nuggets',
+    'Detroit Pistons', 'Golden State Warriors', 'Houston Rockets', 'Indiana Pacers',
+    'Los Angeles Clippers', 'Los Angeles Lakers', 'Memphis Grizzlies', 'Miami Heat',
+    'Milwaukee Bucks', 'Minnesota Timberwolves', 'New Orleans Pelicans', 'New York Knicks',
+    'Oklahoma City Thunder', 'Orlando Magic', 'Philadelphia 76ers', 'Phoenix Suns',
+    'Portland Trail Blazers', 'Sacramento Kings', 'San Antonio Spurs', 'Toronto Raptors',
+    'Utah Jazz', 'Washington Wizards',
+]
+
+
+def league(scale: int = 1) -> List[str]:
+    """Full team names: the real NBA, plus synthetic teams past scale 1."""
+    teams = list(NBA_TEAMS)
+    # One-word nicknames keep the trends service's last-word name matching unambiguous
+    teams.extend(f'Benchville B{i:04d}' for i in range(len(NBA_TEAMS) * (scale - 1)))
+    return teams
+
+
+def slate(scale: int = 1) -> List[Tuple[str, str]]:
+    """(home, away) full names for today's slate; every team plays at most once."""
+    teams = league(scale)
+    rng = random.Random(SEED + scale)
+    rng.shuffle(teams)
+    games = min(SLATE_GAMES * scale, len(teams) // 2)
+    return [(teams[2 * i], teams[2 * i + 1]) for i in range(games)]
+
+
+def nba_history(scale: int = 1) -> List[Dict]:
+    """Completed nba_games_1 rows, newest season last, with scores and closing lines."""
+    teams = league(scale)
+    rng = random.Random(SEED * 7 + scale)
+    strength = {team: rng.gauss(0, 4) for team in teams}
+    per_day = max(1, round(len(teams) * GAMES_PER_TEAM_PER_SEASON / (2 * SEASON_DAYS)))
+
+    rows = []
+    game_id = 0
+    for season in range(SEASONS):
+        opening = FIRST_SEASON.replace(year=FIRST_SEASON.year + season)
+        for day in range(SEASON_DAYS):
+            game_date = opening + timedelta(days=day)
+            order = list(teams)
+            rng.shuffle(order)
+            for slot in range(per_day):
+                home, away = order[2 * slot], order[2 * slot + 1]
+                game_id += 1
+                expected = strength[home] - strength[away] + 2.5
+                line = round(expected * 2) / 2
+                total = rng.randint(212, 236)
+                home_points = max(70, int(rng.gauss(total / 2 + expected / 2, 11)))
+                away_points = max(70, int(rng.gauss(total / 2 - expected / 2, 11)))
+                if home_points == away_points:
+                    home_points += 1 if rng.random() < 0.5 else -1
+                favorite_price = -int(110 + abs(expected) * 25)
+                underdog_price = int(100 + abs(expected) * 20)
+                rows.append({
+                    'game_id': game_id,
+                    'game_date': game_date,
+                    'start_time': time(19 + slot % 4, 0 if slot % 2 else 30),
+                    'home_team_name': convert_team_name(home),
+                    'away_team_name': convert_team_name(away),
+                    'home_points': home_points,
+                    'away_points': away_points,
+                    'total_points': float(home_points + away_points),
+                    'home_line': -line,
+                    'away_line': line,
+                    'home_money_line': favorite_price if expected >= 0 else underdog_price,
+                    'away_money_line': underdog_price if expected >= 0 else favorite_price,
+                    'total': total,
+                })
+    return rows
+
+
+def seed_postgres(database_url: str, scale: int = 1) -> int:
+    """(Re)create the bench schema in ``database_url`` and load the league and history.
+
+    Only ever touches BENCH_SCHEMA, which is dropped and rebuilt on every call.
+    Returns the number of seeded games.
+    """
+    teams = league(scale)
+    team_ids = {convert_team_name(team): i + 1 for i, team in enumerate(teams)}
+    rows = nba_history(scale)
+
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(f'DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE')
+            cur.execute(f'CREATE SCHEMA {BENCH_SCHEMA}')
+            cur.execute(f"""
+                CREATE TABLE {BENCH_SCHEMA}.teams (
+                    team_id INTEGER PRIMARY KEY,
+                    team_name VARCHAR(100) NOT NULL,
+                    sport VARCHAR(20) NOT NULL
+                )
+            """)
+            cur.execute(f"""
+                CREATE TABLE {BENCH_SCHEMA}.nba_games_1 (
+                    game_id INTEGER PRIMARY KEY,
+                    game_date DATE NOT NULL,
+                    start_time TIME,
+                    home_team_id INTEGER NOT NULL REFERENCES {BENCH_SCHEMA}.teams (team_id),
+                    away_team_id INTEGER NOT NULL REFERENCES {BENCH_SCHEMA}.teams (team_id),
+                    home_team_name VARCHAR(100) NOT NULL,
+                    away_team_name VARCHAR(100) NOT NULL,
+                    home_points INTEGER,
+                    away_points INTEGER,
+                    total_points FLOAT,
+                    home_line FLOAT,
+                    away_line FLOAT,
+                    home_money_line INTEGER,
+                    away_money_line INTEGER,
+                    total INTEGER
+                )
+            """)
+            execute_values(
+                cur,
+                f'INSERT INTO {BENCH_SCHEMA}.teams (team_id, team_name, sport) VALUES %s',
+                [(team_id, name, 'NBA') for name, team_id in team_ids.items()],
+            )
+            execute_values(
+                cur,
+                f"""
+                INSERT INTO {BENCH_SCHEMA}.nba_games_1 (
+                    game_id, game_date, start_time, home_team_id, away_team_id,
+                    home_team_name, away_team_name, home_points, away_points, total_points,
+                    home_line, away_line, home_money_line, away_money_line, total
+                ) VALUES %s
+                """,
+                [(
+                    r['game_id'], r['game_date'], r['start_time'],
+                    team_ids[r['home_team_name']], team_ids[r['away_team_name']],
+                    r['home_team_name'], r['away_team_name'], r['home_points'], r['away_points'],
+                    r['total_points'], r['home_line'], r['away_line'],
+                    r['home_money_line'], r['away_money_line'], r['total'],
+                ) for r in rows],
+                page_size=5000,
+            )
+            cur.execute(f'CREATE INDEX ON {BENCH_SCHEMA}.nba_games_1 (game_date DESC)')
+            cur.execute(f"""
+                CREATE TABLE {BENCH_SCHEMA}.team_game_log (
+                    sport VARCHAR(20) NOT NULL,
+                    game_id INTEGER NOT NULL,
+                    side VARCHAR(4) NOT NULL,
+                    game_date DATE NOT NULL,
+                    start_time TIME,
+                    league VARCHAR(100),
+                    team_id INTEGER NOT NULL,
+                    team_name VARCHAR(100) NOT NULL,
+                    opponent_id INTEGER NOT NULL,
+                    opponent_name VARCHAR(100) NOT NULL,
+                    scored INTEGER,
+                    allowed INTEGER,
+                    line FLOAT,
+                    total FLOAT,
+                    money_line FLOAT,
+                    opponent_money_line FLOAT,
+                    draw_money_line FLOAT,
+                    PRIMARY KEY (sport, game_id, side)
+                )
+            """)
+            cur.execute(f'CREATE INDEX ON {BENCH_SCHEMA}.team_game_log (sport, team_id, game_date DESC)')
+            cur.execute(f'CREATE INDEX ON {BENCH_SCHEMA}.team_game_log (sport, team_name, game_date DESC)')
+    finally:
+        conn.close()
+
+    # Same code path as the seed jobs, run against the bench schema
+    engine = create_engine(bench_database_url(database_url))
+    try:
+        with engine.begin() as sa_conn:
+            rebuild_team_game_log(sa_conn, 'nba')
+            for table in ('teams', 'nba_games_1', 'team_game_log'):
+                sa_conn.execute(text(f'ANALYZE {BENCH_SCHEMA}.{table}'))
+    finally:
+        engine.dispose()
+    return len(rows)
+
+
+def bench_database_url(database_url: str) -> str:
+    """``database_url`` with BENCH_SCHEMA first on the search_path, for the app's pool."""
+    separator = '&' if '?' in database_url else '?'
+    return f'{database_url}{separator}options=-csearch_path%3D{BENCH_SCHEMA}'
+
+
+def trends_request_games(scale: int = 1) -> List[Dict]:
+    """The slate as the frontend posts it to /api/historical/trends/nba."""
+    return [
+        {'game_id': f'bench-{i}', 'home': {'team': home}, 'away': {'team': away}}
+        for i, (home, away) in enumerate(slate(scale))
+    ]
+
+
+def _load_json(name: str):
+    with open(os.path.join(DATA_DIR, name)) as f:
+        return json.load(f)
+
+
+def odds_payloads(scale: int = 1) -> Tuple[List[Dict], List[Dict]]:
+    """(scores, odds) Odds API payloads for a slate of SLATE_GAMES * scale games.
+
+    Scale 1 is the recorded payload as-is; larger scales repeat it with fresh
+    event ids so every game still needs its own lookup.
+    """
+    recorded = _load_json('odds_nba.json')
+    scores, odds = [], []
+    for copy_index in range(scale):
+        for event in recorded['scores']:
+            event = copy.deepcopy(event)
+            event['id'] = f"{event['id']}-{copy_index}"
+            scores.append(event)
+        for event in recorded['odds']:
+            event = copy.deepcopy(event)
+            event['id'] = f"{event['id']}-{copy_index}"
+            odds.append(event)
+    return scores, odds
+
+
+def index_html() -> str:
+    with open(os.path.join(DATA_DIR, 'index.html')) as f:
+        return f.read()
+
+
+def matchup_meta(scale: int = 1) -> List[Dict]:
+    """SSR meta for every game-details page on the slate, shaped like app._get_page_meta()."""
+    import app
+
+    metas = []
+    commence = datetime(2024, 1, 15, 0, 30)
+    for home, away in slate(scale):
+        slug = f"{away}-vs-{home}-{commence.date().isoformat()}".lower().replace(' ', '-')
+        canonical_path = f'/game-details/nba/{slug}'
+        matchup = {
+            'away_team': away,
+            'home_team': home,
+            'commence_time': commence.isoformat() + 'Z',
+        }
+        metas.append({
+            'title': f'{away} vs {home} NBA Odds & Trends | GetSTAM',
+            'description': (f'{away} vs {home} betting odds, ATS records, over/under trends, '
+                            'and head-to-head history.'),
+            'canonical_path': canonical_path,
+            'og_image': app.DEFAULT_OG_IMAGE,
+            'json_ld': [
+                app._ORG_WEBSITE_JSON_LD,
+                app._sports_event_json_ld(matchup, canonical_path),
+                app._breadcrumb_json_ld(
+                    ['Home', 'NBA', f'{away} vs {home}'],
+                    ['/', '/nba', canonical_path],
+                ),
+            ],
+        })
+    return metas
@@ -0,0 +1,304 @@
+"""Plan regression check: EXPLAIN (ANALYZE, BUFFERS) the hot queries and flag sequential scans.
+
+    python -m benchmarks.query_plans [--database-url URL] [--min-rows 10000]
+                                     [--queries nba_props blog] [--output plans.json]
+
+Run it against a seeded copy of the production schema (a restored dump or a
+staging database); it defaults to DATABASE_URL. Every statement runs inside
+a read-only transaction that is rolled back.
+
+Each catalogue entry pairs a hot query, written the way its service issues
+it, with a small query that picks realistic parameters from the same
+database. A ``Seq Scan`` on a relation with at least --min-rows rows is
+flagged (unless the entry allows it), and the exit status is 1 when anything
+is flagged, so the check can gate a migration or a query change.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+
+class PlanQuery(NamedTuple):
+    name: str
+    source: str
+    sql: str
+    # One-row query returning the named parameters for `sql`; None if it takes none
+    params_sql: Optional[str] = None
+    # Relations a sequential scan is expected on (small dimension tables)
+    allow_seq_scan: Tuple[str, ...] = ()
+
+
+CATALOGUE: List[PlanQuery] = [
+    PlanQuery(
+        'nba_props.last_n',
+        'player_props_service.get_last_n_player_props',
+        """
+        SELECT id, player_id, game_date, odds_event_id
+        FROM nba_player_props
+        WHERE player_id = %(player_id)s
+        ORDER BY game_date DESC, id DESC
+        LIMIT 20
+        """,
+        "SELECT player_id FROM nba_player_props ORDER BY game_date DESC LIMIT 1",
+    ),
+    PlanQuery(
+        'nba_props.last_n_batch',
+        'player_props_service._get_last_n_player_props_batch',
+        """
+        SELECT * FROM (
+            SELECT id, player_id, game_date,
+                   ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC, id DESC) AS rn
+            FROM nba_player_props
+            WHERE player_id = ANY(%(player_ids)s)
+        ) ranked
+        WHERE rn <= 20
+        """,
+        """
+        SELECT array_agg(DISTINCT player_id) AS player_ids
+        FROM (SELECT player_id FROM nba_player_props ORDER BY game_date DESC LIMIT 100) recent
+        """,
+    ),
+    PlanQuery(
+        'mlb_batter_props.recent_streaks',
+        'MLBPlayerTrendsService (step 1)',
+        """
+        SELECT bp.player_id, bp.player_team_name, p.player_name, bp.game_date,
+               bp.actual_batter_hits, bp.actual_batter_home_runs, bp.actual_batter_rbi
+        FROM mlb_batter_props bp
+        JOIN mlb_players p ON p.id = bp.player_id
+        WHERE bp.did_not_play IS NOT TRUE
+          AND bp.game_date >= NOW() - INTERVAL '45 days'
+          AND (
+              bp.actual_batter_hits IS NOT NULL
+              OR bp.actual_batter_home_runs IS NOT NULL
+              OR bp.actual_batter_rbi IS NOT NULL
+          )
+          AND bp.player_team_name = ANY(%(team_names)s)
+        ORDER BY bp.player_id, bp.game_date DESC
+        """,
+        """
+        SELECT array_agg(DISTINCT player_team_name) AS team_names
+        FROM (SELECT player_team_name FROM mlb_batter_props ORDER BY game_date DESC LIMIT 200) recent
+        """,
+    ),
+    PlanQuery(
+        'mlb_games.by_odds_event_id',
+        'game_service.get_single_game_from_db',
+        "SELECT * FROM mlb_games WHERE odds_event_id = %(odds_event_id)s LIMIT 1",
+        "SELECT odds_event_id FROM mlb_games WHERE odds_event_id IS NOT NULL ORDER BY game_date DESC LIMIT 1",
+    ),
+    PlanQuery(
+        'team_game_log.recent',
+        'BaseHistoricalService._fetch_recent_team_games',
+        """
+        SELECT n.name, l.side, g.game_id, g.game_date
+        FROM unnest(%(names)s::text[]) AS n(name)
+        CROSS JOIN LATERAL (
+            (SELECT game_id, side, game_date FROM team_game_log
+             WHERE sport = 'nba' AND team_name = n.name
+             ORDER BY game_date DESC, game_id DESC LIMIT 20)
+            UNION
+            (SELECT game_id, side, game_date FROM team_game_log
+             WHERE sport = 'nba' AND team_name = n.name AND side = 'home'
+             ORDER BY game_date DESC, game_id DESC LIMIT 20)
+            UNION
+            (SELECT game_id, side, game_date FROM team_game_log
+             WHERE sport = 'nba' AND team_name = n.name AND side = 'away'
+             ORDER BY game_date DESC, game_id DESC LIMIT 20)
+        ) l
+        JOIN nba_games_1 g ON g.game_id = l.game_id
+        ORDER BY g.game_date DESC, g.game_id DESC
+        """,
+        """
+        SELECT array_agg(DISTINCT team_name) AS names
+        FROM (SELECT team_name FROM team_game_log WHERE sport = 'nba' ORDER BY game_date DESC LIMIT 24) recent
+        """,
+    ),
+    PlanQuery(
+        'nba_games.head_to_head',
+        'BaseHistoricalService._fetch_head_to_head_games',
+        """
+        SELECT p.lo, p.hi, g.*
+        FROM unnest(%(lo)s::int[], %(hi)s::int[]) AS p(lo, hi)
+        CROSS JOIN LATERAL (
+            SELECT game_id, game_date, home_team_id, away_team_id
+            FROM nba_games_1
+            WHERE LEAST(home_team_id, away_team_id) = p.lo
+              AND GREATEST(home_team_id, away_team_id) = p.hi
+            ORDER BY game_date DESC
+            LIMIT 10
+        ) g
+        ORDER BY p.lo, p.hi, g.game_date DESC
+        """,
+        """
+        SELECT array_agg(LEAST(home_team_id, away_team_id)) AS lo,
+               array_agg(GREATEST(home_team_id, away_team_id)) AS hi
+        FROM (SELECT home_team_id, away_team_id FROM nba_games_1 ORDER BY game_date DESC LIMIT 12) recent
+        """,
+    ),
+    PlanQuery(
+        'nba_games.keyset_page',
+        'BaseHistoricalService._fetch_games_page',
+        """
+        SELECT game_id, game_date, home_team_name, away_team_name
+        FROM nba_games_1
+        WHERE 1=1 AND (game_date, game_id) < (%(game_date)s, %(game_id)s)
+        ORDER BY game_date DESC, game_id DESC
+        LIMIT 51
+        """,
+        """
+        SELECT game_date, game_id FROM nba_games_1
+        ORDER BY game_date ASC, game_id ASC LIMIT 1 OFFSET 50
+        """,
+    ),
+    PlanQuery(
+        'blog.published_list',
+        'BlogService.get_published_posts',
+        """
+        SELECT id, slug, title, excerpt, published_at, category
+        FROM blog_posts
+        WHERE status = 'published'
+        ORDER BY published_at DESC LIMIT 20 OFFSET 0
+        """,
+    ),
+    PlanQuery(
+        'blog.published_by_category',
+        'BlogService.get_published_posts(category=...)',
+        """
+        SELECT id, slug, title, excerpt, published_at, category
+        FROM blog_posts
+        WHERE status = 'published' AND category = %(category)s
+        ORDER BY published_at DESC LIMIT 20 OFFSET 0
+        """,
+        "SELECT category FROM blog_posts WHERE status = 'published' AND category IS NOT NULL LIMIT 1",
+    ),
+    PlanQuery(
+        'blog.by_slug',
+        'BlogService.get_post_by_slug',
+        "SELECT * FROM blog_posts WHERE slug = %(slug)s AND status = 'published'",
+        "SELECT slug FROM blog_posts WHERE status = 'published' LIMIT 1",
+    ),
+    PlanQuery(
+        'blog.sitemap_entries',
+        'BlogService.get_published_sitemap_entries',
+        "SELECT slug, GREATEST(updated_at, published_at) AS last_modified FROM blog_posts "
+        "WHERE status = 'published' ORDER BY published_at DESC",
+    ),
+]
+
+
+def _walk(node: Dict) -> Iterator[Dict]:
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _walk(child)
+
+
+def _relation_rows(cur, relations) -> Dict[str, float]:
+    if not relations:
+        return {}
+    cur.execute(
+        "SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'm', 'p') AND relname = ANY(%s)",
+        (sorted(relations),),
+    )
+    return {row['relname']: row['reltuples'] for row in cur.fetchall()}
+
+
+def check(conn, query: PlanQuery, min_rows: int) -> Dict:
+    """EXPLAIN one catalogue entry; returns its timing, buffers and flagged scans."""
+    result = {'name': query.name, 'source': query.source}
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        params = {}
+        if query.params_sql:
+            cur.execute(query.params_sql)
+            row = cur.fetchone()
+            if not row or any(value is None for value in row.values()):
+                result['skipped'] = 'no sample parameters in this database'
+                return result
+            params = dict(row)
+
+        cur.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + query.sql, params)
+        explained = cur.fetchone()['QUERY PLAN'][0]
+
+        plan = explained['Plan']
+        seq_scans = [node for node in _walk(plan) if node['Node Type'] == 'Seq Scan']
+        sizes = _relation_rows(cur, {node['Relation Name'] for node in seq_scans})
+
+    flagged = []
+    for node in seq_scans:
+        relation = node['Relation Name']
+        rows = sizes.get(relation, 0)
+        if relation not in query.allow_seq_scan and rows >= min_rows:
+            flagged.append({'relation': relation, 'table_rows': int(rows), 'filter': node.get('Filter')})
+
+    result.update({
+        'execution_ms': round(explained['Execution Time'], 3),
+        'planning_ms': round(explained['Planning Time'], 3),
+        'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+        'seq_scans': [node['Relation Name'] for node in seq_scans],
+        'flagged': flagged,
+    })
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.query_plans',
+        description='EXPLAIN (ANALYZE, BUFFERS) the hot queries and flag sequential scans.',
+    )
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'),
+                        help='seeded database to check (default: DATABASE_URL)')
+    parser.add_argument('--min-rows', type=int, default=10000,
+                        help='only flag sequential scans of tables at least this large')
+    parser.add_argument('--queries', nargs='+', metavar='PREFIX',
+                        help='only check entries whose name starts with one of these')
+    parser.add_argument('--output', help='also write the results here as JSON')
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        parser.error('no --database-url given and DATABASE_URL is not set')
+
+    queries = [q for q in CATALOGUE if not args.queries or any(q.name.startswith(p) for p in args.queries)]
+    conn = psycopg2.connect(args.database_url.replace('postgres://', 'postgresql://', 1))
+    conn.set_session(readonly=True)
+    results = []
+    try:
+        for query in queries:
+            try:
+                results.append(check(conn, query, args.min_rows))
+            except psycopg2.Error as e:
+                results.append({'name': query.name, 'source': query.source, 'error': str(e).strip()})
+            conn.rollback()
+    finally:
+        conn.close()
+
+    for r in results:
+        if 'error' in r:
+            status = f"ERROR  {r['error']}"
+        elif 'skipped' in r:
+            status = f"skip   {r['skipped']}"
+        elif r['flagged']:
+            status = 'SEQ    ' + ', '.join(f"{f['relation']} ({f['table_rows']} rows)" for f in r['flagged'])
+        else:
+            status = 'ok'
+        timing = f"{r['execution_ms']:>9.3f}ms  hit={r['shared_hit_blocks']:<6} read={r['shared_read_blocks']:<6}" \
+            if 'execution_ms' in r else ' ' * 36
+        print(f"{r['name']:<34} {timing} {status}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'min_rows': args.min_rows, 'results': results}, f, indent=2)
+            f.write('\n')
+
+    failed = [r for r in results if r.get('flagged') or 'error' in r]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""Benchmark runner: times each hot path at every scale and emits JSON results."""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple
+
+from . import fixtures
+
+RESULTS_SCHEMA = 1
+PLACEHOLDER_DATABASE_URL = 'postgresql://bench@localhost:1/bench'
+
+
+class Case(NamedTuple):
+    name: str
+    needs_db: bool
+    # scale -> (callable timed once per run, number of items it processes)
+    setup: Callable[[int], tuple]
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+def _odds_process_odds_data(scale):
+    from api.utils.odds_formatter import process_odds_data
+
+    scores, odds = fixtures.odds_payloads(scale)
+
+    def run():
+        for match in scores:
+            process_odds_data(match, odds, match['home_team'], match['away_team'])
+    return run, len(scores)
+
+
+def _odds_snapshot_markets(scale):
+    from api.utils.odds_snapshot import OddsSnapshot
+
+    scores, odds = fixtures.odds_payloads(scale)
+
+    def run():
+        snapshot = OddsSnapshot(scores, odds)
+        for match in scores:
+            snapshot.markets(match)
+    return run, len(scores)
+
+
+def _ssr_inject_meta(scale):
+    import app
+    from ssr_shell import ShellTemplate
+
+    shell = ShellTemplate(fixtures.index_html())
+    metas = fixtures.matchup_meta(scale)
+
+    def run():
+        for meta in metas:
+            app._inject_meta(shell, meta)
+    return run, len(metas)
+
+
+def _context_rows(scale):
+    return [
+        {
+            'game_id': r['game_id'], 'game_date': r['game_date'],
+            'home_team_name': r['home_team_name'], 'away_team_name': r['away_team_name'],
+            'hs': r['home_points'], 'aw': r['away_points'], 'tl': r['total'],
+            'hml': r['home_money_line'], 'aml': r['away_money_line'],
+        }
+        for r in fixtures.nba_history(scale)
+    ]
+
+
+def _context_build(scale):
+    from api.services.historical import trend_context_service
+
+    rows = _context_rows(scale)
+
+    def run():
+        trend_context_service._build_context(rows)
+    return run, len(rows)
+
+
+def _context_lookup(scale):
+    from api.services.historical import trend_context_service as tcs
+
+    tcs._context_cache['nba'] = tcs._build_context(_context_rows(scale))
+    games = fixtures.slate(scale)
+    lookups = [
+        (trend_type, length, mode)
+        for trend_type in tcs.TREND_TYPES
+        for length in range(3, 9)
+        for mode in ('home_h2h', 'gen_h2h', 'team')
+    ]
+
+    def run():
+        for home, _away in games:
+            for trend_type, length, mode in lookups:
+                tcs.get_streak_context('nba', trend_type, length, mode, today_ml=-150, today_team=home)
+    return run, len(games)
+
+
+def _context_refresh(scale):
+    from api.services.historical import trend_context_service as tcs
+
+    def run():
+        tcs._context_cache.pop('nba', None)
+        if tcs.refresh_sport_context('nba') is None:
+            raise RuntimeError('trend context failed to load from the bench database')
+    return run, len(fixtures.nba_history(scale))
+
+
+def _trends_nba(scale):
+    from api.services.historical.nba_trends_service import NBATrendsService
+
+    games = fixtures.trends_request_games(scale)
+
+    def run():
+        results, error = NBATrendsService.analyze_multiple_games_trends(games)
+        if error:
+            raise RuntimeError(error)
+    return run, len(games)
+
+
+CASES = [
+    Case('odds.process_odds_data', False, _odds_process_odds_data),
+    Case('odds.snapshot_markets', False, _odds_snapshot_markets),
+    Case('ssr.inject_meta', False, _ssr_inject_meta),
+    Case('context.build', False, _context_build),
+    Case('context.lookup', False, _context_lookup),
+    Case('context.refresh', True, _context_refresh),
+    Case('trends.nba', True, _trends_nba),
+]
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def _time(run: Callable[[], None], repeat: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Services and app import print progress; keep stdout for the JSON document."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'min_ms': round(ordered[0] * 1000, 3),
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def _git_revision() -> Dict[str, object]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True, text=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    cwd=root, capture_output=True, text=True).stdout.strip())
+        return {'commit': commit or None, 'dirty': dirty}
+    except OSError:
+        return {'commit': None, 'dirty': None}
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def compare(baseline: Dict, current: Dict) -> List[Dict]:
+    """Median change per (case, scale) present in both result documents."""
+    before = {(r['case'], r['scale']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        old = before.get((result['case'], result['scale']))
+        if not old or not old['median_ms']:
+            continue
+        rows.append({
+            'case': result['case'],
+            'scale': result['scale'],
+            'baseline_ms': old['median_ms'],
+            'current_ms': result['median_ms'],
+            'change_pct': round((result['median_ms'] - old['median_ms']) / old['median_ms'] * 100, 1),
+        })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Time the trends, trend-context, odds formatting and SSR hot paths.',
+    )
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10],
+                        help='slate/history multipliers (1 = a realistic NBA night)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case and scale')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed runs before timing')
+    parser.add_argument('--cases', nargs='+', metavar='PREFIX',
+                        help='only run cases whose name starts with one of these')
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='print median changes against an earlier results file')
+    args = parser.parse_args(argv)
+
+    # The services build their pools from DATABASE_URL at import time, so point
+    # it at the bench schema (or a placeholder) before importing any of them.
+    bench_url = os.getenv('BENCH_DATABASE_URL')
+    if bench_url and bench_url == os.getenv('DATABASE_URL'):
+        parser.error('BENCH_DATABASE_URL must not be the application database')
+    os.environ['DATABASE_URL'] = fixtures.bench_database_url(bench_url) if bench_url else PLACEHOLDER_DATABASE_URL
+    os.environ.setdefault('FLASK_ENV', 'development')  # keep the shared cache out of the timings
+    os.environ['TREND_CONTEXT_REFRESH_SECONDS'] = '0'
+
+    cases = [c for c in CASES if not args.cases or any(c.name.startswith(p) for p in args.cases)]
+    document = {
+        'schema': RESULTS_SCHEMA,
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': [],
+        'skipped': [],
+    }
+
+    for scale in args.scales:
+        seeded_rows = None
+        if bench_url and any(c.needs_db for c in cases):
+            _log(f'[bench] seeding {fixtures.BENCH_SCHEMA} at scale {scale}...')
+            seeded_rows = fixtures.seed_postgres(bench_url, scale)
+
+        for case in cases:
+            if case.needs_db and seeded_rows is None:
+                document['skipped'].append({'case': case.name, 'scale': scale, 'reason': 'BENCH_DATABASE_URL not set'})
+                continue
+            with _quiet():
+                run, items = case.setup(scale)
+                samples = _time(run, args.repeat, args.warmup)
+            result = {'case': case.name, 'scale': scale, 'items': items, 'runs': len(samples)}
+            result.update(_summarize(samples))
+            document['results'].append(result)
+            _log(f"[bench] {case.name:<24} x{scale:<3} items={items:<7} median={result['median_ms']:.3f}ms")
+
+    if args.compare:
+        with open(args.compare) as f:
+            document['comparison'] = compare(json.load(f), document)
+        for row in document['comparison']:
+            _log(f"[bench] {row['case']:<24} x{row['scale']:<3} "
+                 f"{row['baseline_ms']:.3f}ms -> {row['current_ms']:.3f}ms ({row['change_pct']:+.1f}%)")
+
+    payload = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+    return 0
@@ -1,17 +1,199 @@
 # cache.py - Shared cache instance
-from flask_caching import Cache
+from collections import OrderedDict
+import logging
 import os
+import pickle
+import threading
+import time
+import uuid
+
+from flask_caching import Cache
+from flask_caching.backends.base import BaseCache
+from flask_caching.backends.filesystemcache import FileSystemCache
+
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
 
 # Define cache instance
 cache = Cache()
 
+
+class TwoTierCache(BaseCache):
+    """Small in-process LRU (L1) in front of a cache shared by every worker (L2).
+
+    L2 is Redis when CACHE_REDIS_URL is set (and the redis client is installed),
+    otherwise a filesystem cache in CACHE_DIR that all workers on the host share.
+    Reads are served from L1 when possible; misses fall through to L2 and are
+    copied back into L1 for at most ``l1_ttl`` seconds.
+
+    Deletes and clears write a new generation token to L2. Every worker checks
+    that token at most once per ``sync_interval`` seconds and drops its whole L1
+    when it changes, so an invalidation in one worker reaches all of them.
+    """
+
+    GENERATION_KEY = '__two_tier_generation__'
+
+    def __init__(self, l2, default_timeout=300, l1_maxsize=512, l1_ttl=5, sync_interval=1.0):
+        super().__init__(default_timeout=default_timeout)
+        self._l2 = l2
+        self._l1 = OrderedDict()
+        self._l1_maxsize = l1_maxsize
+        self._l1_ttl = l1_ttl
+        self._sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._generation = self._l2_call('get', self.GENERATION_KEY)
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        l2 = None
+        if config.get('CACHE_REDIS_URL'):
+            try:
+                from flask_caching.backends.rediscache import RedisCache
+                l2 = RedisCache.factory(app, config, [], {'default_timeout': kwargs['default_timeout']})
+            except RuntimeError as e:
+                logger.warning("Redis L2 unavailable (%s), falling back to filesystem cache", e)
+        if l2 is None:
+            l2 = FileSystemCache(
+                config['CACHE_DIR'],
+                threshold=config['CACHE_THRESHOLD'],
+                default_timeout=kwargs['default_timeout'],
+            )
+        kwargs.update(
+            l1_maxsize=config.get('CACHE_L1_MAXSIZE', 512),
+            l1_ttl=config.get('CACHE_L1_TTL', 5),
+            sync_interval=config.get('CACHE_L1_SYNC_INTERVAL', 1.0),
+        )
+        return cls(l2, *args, **kwargs)
+
+    # -- L2 helpers ---------------------------------------------------------
+
+    def _l2_call(self, method, *args, **kwargs):
+        """Call the shared tier; an unreachable L2 degrades to a miss, not an error."""
+        try:
+            return getattr(self._l2, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning("L2 cache %s failed: %s", method, e)
+            return None
+
+    def _bump_generation(self):
+        token = uuid.uuid4().hex
+        self._l2_call('set', self.GENERATION_KEY, token, timeout=0)
+        with self._lock:
+            self._generation = token
+            self._last_sync = time.monotonic()
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._last_sync < self._sync_interval:
+            return
+        generation = self._l2_call('get', self.GENERATION_KEY)
+        with self._lock:
+            self._last_sync = now
+            if generation != self._generation:
+                self._l1.clear()
+                self._generation = generation
+
+    # -- L1 helpers ---------------------------------------------------------
+
+    def _l1_get(self, key):
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+        # Stored pickled (like SimpleCache) so each caller gets its own copy
+        return pickle.loads(payload)
+
+    def _l1_set(self, key, value, timeout):
+        timeout = self._normalize_timeout(timeout)
+        ttl = self._l1_ttl if timeout == 0 else min(timeout, self._l1_ttl)
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._l1[key] = (time.monotonic() + ttl, payload)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self._l1_maxsize:
+                self._l1.popitem(last=False)
+
+    def _l1_pop(self, key):
+        with self._lock:
+            self._l1.pop(key, None)
+
+    # -- cache API ----------------------------------------------------------
+
+    def get(self, key):
+        self._sync()
+        value = self._l1_get(key)
+        if value is not None:
+            record_cache(key, True)
+            return value
+        value = self._l2_call('get', key)
+        if value is not None:
+            self._l1_set(key, value, self.default_timeout)
+        record_cache(key, value is not None)
+        return value
+
+    def has(self, key):
+        self._sync()
+        if self._l1_get(key) is not None:
+            return True
+        return bool(self._l2_call('has', key))
+
+    def set(self, key, value, timeout=None):
+        result = self._l2_call('set', key, value, timeout=timeout)
+        self._l1_set(key, value, self.default_timeout if timeout is None else timeout)
+        return bool(result)
+
+    def add(self, key, value, timeout=None):
+        added = self._l2_call('add', key, value, timeout=timeout)
+        if added:
+            self._l1_set(key, value, self.default_timeout if timeout is None else timeout)
+        return bool(added)
+
+    def delete(self, key):
+        self._l1_pop(key)
+        deleted = self._l2_call('delete', key)
+        self._bump_generation()
+        return bool(deleted)
+
+    def delete_many(self, *keys):
+        for key in keys:
+            self._l1_pop(key)
+        deleted = self._l2_call('delete_many', *keys) or []
+        self._bump_generation()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        cleared = self._l2_call('clear')
+        self._bump_generation()
+        return bool(cleared)
+
+
 def init_cache(app):
     """Initialize cache with app"""
     if os.getenv('FLASK_ENV') == 'development':
         cache_config = {'CACHE_TYPE': 'null'}  # Disable caching in development
     else:
-        cache_config = {'CACHE_TYPE': 'SimpleCache'}  # Enable caching, let decorators set their own timeouts
-    
+        # Shared across gunicorn workers; let decorators set their own timeouts
+        cache_config = {
+            'CACHE_TYPE': 'cache.TwoTierCache',
+            'CACHE_REDIS_URL': os.getenv('REDIS_URL'),
+            'CACHE_DIR': os.getenv('CACHE_DIR', '/tmp/getstam-cache'),
+            'CACHE_THRESHOLD': int(os.getenv('CACHE_THRESHOLD', '5000')),
+            'CACHE_L1_MAXSIZE': int(os.getenv('CACHE_L1_MAXSIZE', '512')),
+            'CACHE_L1_TTL': int(os.getenv('CACHE_L1_TTL', '5')),
+        }
+
     cache.init_app(app, config=cache_config)
-    print(f"🔧 Cache initialized with config: {cache_config}")
+    logged_config = dict(cache_config)
+    if logged_config.get('CACHE_REDIS_URL'):
+        logged_config['CACHE_REDIS_URL'] = '***'  # may embed credentials
+    print(f"🔧 Cache initialized with config: {logged_config}")
     return cache
@@ -0,0 +1,348 @@
+# db.py - Shared database connection pool
+"""Process-wide pooled database access.
+
+Every service goes through this module instead of calling psycopg2.connect()
+or create_engine() itself, so each worker process keeps one bounded pool per
+database rather than paying a TCP + auth handshake per query.
+
+Pool sizing is configured from the environment:
+
+    DB_POOL_SIZE          persistent connections per process (default 5)
+    DB_POOL_MAX_OVERFLOW  extra connections allowed under burst (default 5)
+    DB_POOL_RECYCLE       seconds before a connection is replaced (default 900)
+    DB_POOL_TIMEOUT       seconds to wait for a free connection (default 10)
+    DB_EXPORT_POOL_SIZE   connections for streamed exports (default 2, no overflow)
+
+Streamed exports hold their connection until the client has read the whole
+response, so they check out of the separate 'export' pool; slow downloads
+then queue behind each other instead of starving ordinary requests.
+
+The registry is fork-safe: a child process (e.g. a gunicorn worker forked
+from a preloaded master) drops the inherited pools without closing the
+parent's sockets and lazily builds its own.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import psycopg2.extensions
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from metrics import observe_db_query
+
+load_dotenv()
+
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '5'))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '900'))
+POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '10'))
+EXPORT_POOL_SIZE = int(os.getenv('DB_EXPORT_POOL_SIZE', '2'))
+APPLICATION_NAME = os.getenv('DB_APPLICATION_NAME', 'getstam-api')
+
+_lock = threading.Lock()
+_engines: Dict[str, object] = {}
+_stats: Dict[str, '_PoolStats'] = {}
+_pid = os.getpid()
+
+# name -> (pool_size, max_overflow) for pools not sized like 'default'
+_POOL_SIZES = {'export': (EXPORT_POOL_SIZE, 0)}
+
+
+def _database_url() -> str:
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable not set")
+    return database_url.replace('postgres://', 'postgresql://', 1)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class _PoolStats:
+    """Checkout / wait / usage counters for one pool (guarded by its own lock)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.timeouts = 0
+            self.in_use = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.usage_seconds_total = 0.0
+            self.usage_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+
+    def record_checkin(self, held: Optional[float]):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            if held is not None:
+                self.usage_seconds_total += held
+                if held > self.usage_seconds_max:
+                    self.usage_seconds_max = held
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'in_use': self.in_use,
+                'wait_seconds_total': round(self.wait_seconds_total, 6),
+                'wait_seconds_max': round(self.wait_seconds_max, 6),
+                'usage_seconds_total': round(self.usage_seconds_total, 6),
+                'usage_seconds_max': round(self.usage_seconds_max, 6),
+            }
+
+
+class _InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait to get a connection.
+
+    A subclass is created per registry entry with ``stats`` bound as a class
+    attribute, so pools rebuilt by ``dispose()``/``recreate()`` keep reporting
+    into the same counters.
+    """
+
+    stats: _PoolStats = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return conn
+
+
+def _instrument(engine, stats: _PoolStats):
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_conn, record):
+        stats.record_connect()
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_conn, record, proxy):
+        record.info['checked_out_at'] = time.perf_counter()
+        stats.record_checkout()
+
+    @event.listens_for(engine, 'checkin')
+    def _on_checkin(dbapi_conn, record):
+        started = record.info.pop('checked_out_at', None)
+        stats.record_checkin(time.perf_counter() - started if started is not None else None)
+
+    # A connection runs one statement at a time, so a single start time per
+    # connection is enough; it is cleared on success and on error alike.
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started_at'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_started_at', None)
+        if started is not None:
+            observe_db_query(time.perf_counter() - started)
+
+    @event.listens_for(engine, 'handle_error')
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        started = conn.info.pop('query_started_at', None) if conn is not None else None
+        if started is not None:
+            observe_db_query(time.perf_counter() - started)
+
+
+_timed_cursor_classes: Dict[type, type] = {}
+
+
+def _timed_cursor_class(base: type) -> type:
+    """Subclass of a psycopg2 cursor class that reports execute() latency.
+
+    Raw connections bypass SQLAlchemy's execute events, so PooledConnection
+    hands out these instead to keep their queries in the metrics.
+    """
+    cls = _timed_cursor_classes.get(base)
+    if cls is None:
+        def execute(self, query, vars=None):
+            start = time.perf_counter()
+            try:
+                return base.execute(self, query, vars)
+            finally:
+                observe_db_query(time.perf_counter() - start)
+
+        def executemany(self, query, vars_list):
+            start = time.perf_counter()
+            try:
+                return base.executemany(self, query, vars_list)
+            finally:
+                observe_db_query(time.perf_counter() - start)
+
+        cls = type(f'Timed{base.__name__}', (base,), {'execute': execute, 'executemany': executemany})
+        _timed_cursor_classes[base] = cls
+    return cls
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+def _reset_after_fork():
+    """Forget pools inherited from the parent without closing its sockets."""
+    global _pid
+    _pid = os.getpid()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+    for stats in _stats.values():
+        stats.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_engine(name: str = 'default'):
+    """Return the process-wide SQLAlchemy engine for DATABASE_URL.
+
+    ``name`` selects a separate pool, sized from _POOL_SIZES (or like
+    'default' when it has no entry there).
+    """
+    if os.getpid() != _pid:
+        _reset_after_fork()
+
+    engine = _engines.get(name)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(name)
+        if engine is None:
+            stats = _stats.setdefault(name, _PoolStats())
+            pool_cls = type('InstrumentedQueuePool', (_InstrumentedQueuePool,), {'stats': stats})
+            pool_size, max_overflow = _POOL_SIZES.get(name, (POOL_SIZE, POOL_MAX_OVERFLOW))
+            engine = create_engine(
+                _database_url(),
+                poolclass=pool_cls,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=POOL_RECYCLE,
+                pool_timeout=POOL_TIMEOUT,
+                pool_pre_ping=True,
+                connect_args={
+                    'connect_timeout': 5,
+                    'application_name': APPLICATION_NAME,
+                },
+            )
+            _instrument(engine, stats)
+            _engines[name] = engine
+    return engine
+
+
+class PooledConnection:
+    """A pooled psycopg2 connection.
+
+    Behaves like a plain psycopg2 connection (``cursor()``, ``commit()``,
+    ``with conn:`` for a transaction block) except that ``close()`` hands the
+    connection back to the pool instead of closing the socket.
+    """
+
+    def __init__(self, proxied, cursor_factory=None):
+        self._proxied = proxied
+        self._cursor_factory = cursor_factory
+
+    def cursor(self, *args, **kwargs):
+        factory = (
+            kwargs.get('cursor_factory')
+            or self._cursor_factory
+            or self._proxied.cursor_factory
+            or psycopg2.extensions.cursor
+        )
+        kwargs['cursor_factory'] = _timed_cursor_class(factory)
+        return self._proxied.cursor(*args, **kwargs)
+
+    def close(self):
+        if self._proxied is not None:
+            self._proxied.close()
+            self._proxied = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Same semantics as psycopg2's connection context manager: end the
+        # transaction, keep the connection.
+        if exc_type is None:
+            self._proxied.commit()
+        else:
+            self._proxied.rollback()
+        return False
+
+    def __getattr__(self, item):
+        return getattr(self._proxied, item)
+
+
+def get_connection(cursor_factory=None, name: str = 'default') -> PooledConnection:
+    """Check a raw psycopg2 connection out of the shared pool.
+
+    Callers must ``close()`` it (usually in a ``finally``) to return it.
+    """
+    return PooledConnection(get_engine(name).raw_connection(), cursor_factory=cursor_factory)
+
+
+@contextmanager
+def connection(cursor_factory=None, name: str = 'default'):
+    """Checkout for the duration of a ``with`` block.
+
+    Commits on success, rolls back on error, and always returns the
+    connection to the pool.
+    """
+    conn = get_connection(cursor_factory=cursor_factory, name=name)
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    """Snapshot of every pool's size and checkout/wait/usage counters."""
+    out = {}
+    for name, engine in list(_engines.items()):
+        pool = engine.pool
+        snapshot = _stats[name].snapshot()
+        snapshot.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'idle': pool.checkedin(),
+        })
+        out[name] = snapshot
+    return out
@@ -0,0 +1,109 @@
+# import_checkpoints.py - Resume points for the historical backfills
+"""Record finished units of a backfill so a restarted range skips them.
+
+A unit is one (job, date, event) row in ``import_checkpoints``:
+
+    ('nba_odds', 2024-01-12, '<odds api event id>')   one event's props written
+    ('nba_actuals', 2024-01-12, '<espn game id>')     one game's actuals written
+    ('nba_odds', 2024-01-12, '')                      the whole date is done
+
+Jobs mark units on their own connection, inside the transaction that writes
+the unit's rows, so a checkpoint is committed exactly when its data is. On
+the next run, dates marked done are not fetched at all, and on a partly done
+date only the missing events are requested again.
+
+ImportProgress prints a progress / throughput / ETA line after each date.
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, List, Set
+
+from sqlalchemy import text
+
+# event_id of the row marking a whole date as done
+WHOLE_DATE = ''
+
+
+class Checkpoint:
+    """
+    A job's completed units between two dates, loaded once at start.
+
+    With ``resume=False`` nothing is loaded (every date is imported again)
+    but units are still recorded for the next run.
+    """
+
+    def __init__(self, conn, job: str, start_date: date, end_date: date, resume: bool = True):
+        self.conn = conn
+        self.job = job
+        self._done: Dict[date, Set[str]] = {}
+        if resume:
+            rows = conn.execute(text("""
+                SELECT unit_date, event_id FROM import_checkpoints
+                WHERE job = :job AND unit_date BETWEEN :start_date AND :end_date
+            """), {'job': job, 'start_date': start_date, 'end_date': end_date})
+            for unit_date, event_id in rows:
+                self._done.setdefault(unit_date, set()).add(event_id)
+
+    def date_done(self, unit_date: date) -> bool:
+        return WHOLE_DATE in self._done.get(unit_date, ())
+
+    def done_events(self, unit_date: date) -> FrozenSet[str]:
+        return frozenset(self._done.get(unit_date, ()))
+
+    def pending_dates(self, start_date: date, end_date: date) -> List[date]:
+        days = (end_date - start_date).days + 1
+        return [d for d in (start_date + timedelta(days=n) for n in range(days)) if not self.date_done(d)]
+
+    def mark(self, unit_date: date, event_id: str = WHOLE_DATE, records: int = 0) -> None:
+        """Record a unit as done, in the connection's current transaction."""
+        self.conn.execute(text("""
+            INSERT INTO import_checkpoints (job, unit_date, event_id, records, completed_at)
+            VALUES (:job, :unit_date, :event_id, :records, NOW())
+            ON CONFLICT (job, unit_date, event_id) DO UPDATE SET
+                records = EXCLUDED.records,
+                completed_at = EXCLUDED.completed_at
+        """), {'job': self.job, 'unit_date': unit_date, 'event_id': str(event_id), 'records': records})
+
+
+def _duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ImportProgress:
+    """Dates done, records written, throughput and ETA for one backfill run."""
+
+    def __init__(self, label: str, total_dates: int, skipped_dates: int = 0):
+        self.label = label
+        self.total = total_dates
+        self.skipped = skipped_dates
+        self.done = 0
+        self.failed = 0
+        self.records = 0
+        self.started = time.monotonic()
+
+    def update(self, unit_date: date, records: int, failed: bool = False) -> None:
+        self.done += 1
+        self.failed += failed
+        self.records += records
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        per_date = elapsed / self.done
+        print(
+            f"📈 {self.label} {unit_date}: {self.done}/{self.total} dates ({100 * self.done / max(self.total, 1):.0f}%)"
+            f" | {self.records} records | {60 / per_date:.1f} dates/min, {self.records / elapsed:.1f} records/s"
+            f" | elapsed {_duration(elapsed)}, ETA {_duration(per_date * (self.total - self.done))}"
+        )
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        parts = [f"{self.done} dates in {_duration(elapsed)}", f"{self.records} records"]
+        if self.failed:
+            parts.append(f"{self.failed} failed (will be retried on the next run)")
+        if self.skipped:
+            parts.append(f"{self.skipped} already complete, skipped")
+        return f"{self.label}: " + ", ".join(parts)
@@ -3,15 +3,19 @@
 import os
 import sys
 import requests
-import time
 from collections import defaultdict
 from datetime import datetime, date, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import Collection, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 import time as _time
 from unidecode import unidecode
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from import_checkpoints import Checkpoint, ImportProgress
+from rate_limit import ESPN, prefetch
+
 # Load environment variables
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
@@ -45,9 +49,8 @@ def get_mlb_games_for_date(target_date: date, retries=3, delay=2) -> List[Dict]:
 
     for i in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = ESPN.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
-            _time.sleep(0.2)
             data = response.json()
             if not data.get('events'):
                 print(f"  No games found for {target_date}")
@@ -117,9 +120,8 @@ def get_historical_game_boxscore(game_id: str, target_date: date, retries=3, del
 
     for i in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = ESPN.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
-            _time.sleep(0.2)
             data = response.json()
             if not data.get('boxscore'):
                 print(f"      No boxscore data available for game {game_id}")
@@ -532,13 +534,19 @@ def select_doubleheader_prop_record(conn, records: list, espn_game_index: int) -
     return sorted_records[espn_game_index]
 
 
-def process_game_reverse(conn, game_id: str, game_date: date, espn_game_datetime: Optional[datetime] = None, all_day_games: Optional[List[Dict]] = None) -> int:
+def process_game_reverse(conn, game_id: str, game_date: date, espn_game_datetime: Optional[datetime] = None, all_day_games: Optional[List[Dict]] = None,
+                         boxscore_data: Optional[Dict] = None, strict: bool = False) -> int:
     """
     Process a single MLB game using the reverse approach.
+
+    The boxscore is fetched from ESPN unless the caller already has it. With
+    strict, a failed player update is re-raised instead of rolling back the
+    connection's transaction and moving on.
     """
     print(f"\n  Processing game: {game_id}")
 
-    boxscore_data = get_historical_game_boxscore(game_id, game_date)
+    if boxscore_data is None:
+        boxscore_data = get_historical_game_boxscore(game_id, game_date)
 
     if not boxscore_data:
         return 0
@@ -878,6 +886,8 @@ def process_game_reverse(conn, game_id: str, game_date: date, espn_game_datetime
 
         except Exception as e:
             print(f"      ❌ Error updating {normalized_name}: {e}")
+            if strict:
+                raise
             conn.rollback()
             conn.begin()
             continue
@@ -886,42 +896,92 @@ def process_game_reverse(conn, game_id: str, game_date: date, espn_game_datetime
     return updated_count
 
 
-def import_historical_actuals_for_date_reverse(target_date: date, conn) -> int:
+def fetch_boxscores_for_date(target_date: date, skip_games: Collection[str] = ()) -> List[tuple]:
+    """
+    Fetch every MLB game on a date and its boxscore from ESPN (no database).
+
+    Returns (game_info, boxscore) per game in get_mlb_games_for_date order;
+    boxscore is None when unavailable or when the game is in skip_games
+    (already imported, see import_checkpoints.py). Skipped games are still
+    listed, since doubleheader matching needs the whole day.
+    """
+    all_day_games = get_mlb_games_for_date(target_date)
+    return [
+        (game_info, None if game_info['game_id'] in skip_games
+         else get_historical_game_boxscore(game_info['game_id'], target_date))
+        for game_info in all_day_games
+    ]
+
+
+def import_historical_actuals_for_date_reverse(target_date: date, conn, boxscores: Optional[List[tuple]] = None,
+                                               checkpoint: Optional[Checkpoint] = None) -> int:
     """
     Import historical MLB player actuals for a specific date using reverse approach.
+
+    boxscores is fetch_boxscores_for_date's output when the caller already
+    fetched the date; otherwise it is fetched here. With a checkpoint, games
+    it has are skipped, each processed game is marked, and the date once
+    every game on it was processed, in the date's transaction.
     """
     print(f"\n=== Importing Historical MLB Player Actuals (Reverse) for {target_date} ===")
 
-    all_day_games = get_mlb_games_for_date(target_date)
+    done_games = checkpoint.done_events(target_date) if checkpoint else frozenset()
+
+    if boxscores is None:
+        boxscores = fetch_boxscores_for_date(target_date, done_games)
 
-    if not all_day_games:
+    if not boxscores:
         print(f"No games found for {target_date}")
         return 0
 
+    all_day_games = [game_info for game_info, _ in boxscores]
     total_updated = 0
+    failed = 0
 
-    for i, game_info in enumerate(all_day_games, 1):
+    for i, (game_info, boxscore_data) in enumerate(boxscores, 1):
         game_id = game_info['game_id']
         game_datetime = game_info['game_datetime']
-        print(f"\n  Processing game {i}/{len(all_day_games)}: {game_id}")
+        if game_id in done_games:
+            continue
+
+        print(f"\n  Processing game {i}/{len(boxscores)}: {game_id}")
+
+        if not boxscore_data:
+            failed += 1
+            continue
 
         try:
-            updated = process_game_reverse(conn, game_id, target_date, game_datetime, all_day_games)
+            # savepoint — a failed game is rolled back alone and left unmarked
+            with conn.begin_nested():
+                updated = process_game_reverse(conn, game_id, target_date, game_datetime, all_day_games,
+                                               boxscore_data, strict=True)
+                if checkpoint:
+                    checkpoint.mark(target_date, game_id, updated)
             total_updated += updated
 
-            if i < len(all_day_games):
-                time.sleep(2)
-
         except Exception as e:
             print(f"    ❌ Error processing game {game_id}: {e}")
+            failed += 1
             continue
 
+    if checkpoint and not failed:
+        checkpoint.mark(target_date, records=total_updated)
+
     return total_updated
 
 
-def import_historical_actuals_date_range_reverse(start_date: date, end_date: date):
+def import_historical_actuals_date_range_reverse(start_date: date, end_date: date, workers: Optional[int] = None,
+                                                 resume: bool = True):
     """
     Import historical MLB player actual stats for a date range using reverse approach.
+
+    Up to ``workers`` dates (default HISTORICAL_IMPORT_WORKERS) of boxscores
+    are fetched ahead on a thread pool, paced only by the ESPN rate limiter,
+    while finished dates are written and committed here in order.
+
+    Progress is checkpointed per game and per date ('mlb_actuals' in
+    import_checkpoints); unless resume is False, a rerun skips dates and
+    games already imported.
     """
     print(f"=== Historical MLB Player Actuals Import (Reverse Approach) ===")
     print(f"Date range: {start_date} to {end_date}")
@@ -930,32 +990,40 @@ def import_historical_actuals_date_range_reverse(start_date: date, end_date: dat
     conn = engine.connect()
 
     try:
-        current_date = start_date
         total_updated = 0
+        checkpoint = Checkpoint(conn, 'mlb_actuals', start_date, end_date, resume)
+        dates = checkpoint.pending_dates(start_date, end_date)
+        conn.commit()
+
+        skipped = (end_date - start_date).days + 1 - len(dates)
+        if skipped:
+            print(f"Resuming: {skipped} date(s) already imported, {len(dates)} to go")
+        progress = ImportProgress('MLB actuals', len(dates), skipped)
 
-        while current_date <= end_date:
+        def fetch(target_date):
+            return fetch_boxscores_for_date(target_date, checkpoint.done_events(target_date))
+
+        for current_date, fetched in prefetch(fetch, dates, workers):
             try:
                 daily_updated = import_historical_actuals_for_date_reverse(
-                    current_date, conn
+                    current_date, conn, fetched.result(), checkpoint
                 )
 
                 total_updated += daily_updated
 
                 conn.commit()
                 print(f"✅ Committed {daily_updated} records for {current_date}")
+                progress.update(current_date, daily_updated)
 
             except Exception as e:
                 print(f"❌ Error processing {current_date}: {e}")
                 conn.rollback()
-
-            current_date += timedelta(days=1)
-
-            if current_date <= end_date:
-                time.sleep(3)
+                progress.update(current_date, 0, failed=True)
 
         print(f"\n🎉 Historical MLB actuals import complete!")
         print(f"Total prop records updated: {total_updated}")
         print(f"Date range: {start_date} to {end_date}")
+        print(progress.summary())
 
     except Exception as e:
         print(f"❌ Fatal error during historical import: {e}")
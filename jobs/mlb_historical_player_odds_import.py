@@ -6,19 +6,28 @@ import requests
 import time
 import pytz
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional
+from typing import Collection, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from import_checkpoints import Checkpoint, ImportProgress
+from player_props_import import merge_prop_rows, resolve_players, upsert_props
+from rate_limit import ODDS_API, prefetch
+
 # Load environment variables
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
 ODDS_API_KEY = os.getenv("ODDS_API_KEY")
 
 
-def get_historical_mlb_events(target_date: date, retries=3, delay=2) -> List[str]:
+def get_historical_mlb_events(target_date: date, retries=3, delay=2, raise_on_error: bool = False) -> List[str]:
     """
     Get all MLB event IDs for a specific historical date.
+
+    With raise_on_error, a failed fetch raises instead of returning an empty
+    list (which would look like a day off).
     """
     print(f"Fetching MLB events for {target_date}...")
 
@@ -36,7 +45,7 @@ def get_historical_mlb_events(target_date: date, retries=3, delay=2) -> List[str
 
     for i in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = ODDS_API.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
 
             events_data = response.json()
@@ -47,6 +56,8 @@ def get_historical_mlb_events(target_date: date, retries=3, delay=2) -> List[str
                 events = events_data
             else:
                 print(f"  Unexpected API response format: {type(events_data)}")
+                if raise_on_error:
+                    raise ValueError(f"Unexpected events response format for {target_date}")
                 return []
 
             print(f"  Found {len(events)} MLB events for {target_date}")
@@ -58,23 +69,31 @@ def get_historical_mlb_events(target_date: date, retries=3, delay=2) -> List[str
                 time.sleep(delay * (i + 1))
             else:
                 print(f"  Failed to fetch events for {target_date}")
+                if raise_on_error:
+                    raise
                 return []
 
     return []
 
 
-def get_historical_player_odds(event_id: str, target_date: date, retries=3, delay=2) -> Optional[Dict]:
+def get_historical_player_odds(event_id: str, target_date: date, retries=3, delay=2,
+                               commence_time: Optional[str] = None) -> Optional[Dict]:
     """
     Get historical player prop odds for a specific MLB event.
+
+    commence_time is looked up from the date's events (one more request)
+    when the caller does not already have it. Returns None when no odds are
+    available (422 / no bookmaker data); raises the last request error when
+    a query time ran out of retries and no other time had odds.
     """
     print(f"    Fetching player odds for event {event_id}...")
 
-    commence_time = None
-    today_events = get_historical_mlb_events(target_date)
-    for event in today_events:
-        if event.get('id') == event_id:
-            commence_time = event.get('commence_time')
-            break
+    if not commence_time:
+        today_events = get_historical_mlb_events(target_date)
+        for event in today_events:
+            if event.get('id') == event_id:
+                commence_time = event.get('commence_time')
+                break
     if not commence_time:
         print(f"      Could not find commence_time for event {event_id}, using fallback time.")
         date_str = target_date.strftime('%Y-%m-%d')
@@ -91,6 +110,7 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebSever/537.36"
     }
+    last_error = None
     for odds_query_time in times_to_try:
         params = {
             'apiKey': ODDS_API_KEY,
@@ -102,7 +122,7 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
         }
         for i in range(retries):
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = ODDS_API.get(url, headers=headers, params=params, timeout=30)
                 if response.status_code == 422:
                     print(f"      No player odds available for event {event_id} at {odds_query_time}")
                     break
@@ -123,6 +143,10 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
                     time.sleep(delay * (i + 1))
                 else:
                     print(f"      Failed to get odds for event {event_id} at {odds_query_time}")
+                    last_error = e
+    # "No odds" is only trusted when every query time got an answer
+    if last_error is not None:
+        raise last_error
     return None
 
 
@@ -289,71 +313,6 @@ def resolve_team_id_from_odds_api(conn, odds_team_name: str) -> Optional[int]:
         return None
 
 
-def resolve_player_simple(conn, player_name: str, game_date: date) -> Optional[int]:
-    """
-    Player resolver that checks aliases first, then creates new players if needed.
-    Raises on error so the caller's savepoint can roll back cleanly.
-    """
-    normalized = normalize_name_simple(player_name)
-
-    # Step 1: Check aliases first
-    alias_result = conn.execute(text("""
-        SELECT player_id FROM mlb_player_aliases
-        WHERE normalized_name = :name
-        ORDER BY created_at DESC
-        LIMIT 1
-    """), {'name': normalized}).fetchone()
-
-    if alias_result:
-        print(f"    ✓ Found via alias: {player_name} -> player_id {alias_result[0]}")
-        return alias_result[0]
-
-    # Step 2: Check mlb_players table by normalized name
-    player_result = conn.execute(text("""
-        SELECT id FROM mlb_players WHERE normalized_name = :name
-    """), {'name': normalized}).fetchone()
-
-    if player_result:
-        conn.execute(text("""
-            INSERT INTO mlb_player_aliases (player_id, source, source_name, normalized_name, created_at)
-            VALUES (:player_id, 'odds_api', :source_name, :normalized_name, NOW())
-            ON CONFLICT (source, normalized_name) DO NOTHING
-        """), {
-            'player_id': player_result[0],
-            'source_name': player_name,
-            'normalized_name': normalized
-        })
-        print(f"    ✓ Found existing player and added alias: {player_name} -> player_id {player_result[0]}")
-        return player_result[0]
-
-    # Step 3: Create new player
-    new_player_result = conn.execute(text("""
-        INSERT INTO mlb_players (player_name, normalized_name, first_seen_date, last_seen_date, created_at, updated_at)
-        VALUES (:player_name, :normalized_name, :first_seen_date, :last_seen_date, NOW(), NOW())
-        RETURNING id
-    """), {
-        'player_name': player_name,
-        'normalized_name': normalized,
-        'first_seen_date': game_date,
-        'last_seen_date': game_date
-    })
-
-    player_id = new_player_result.fetchone()[0]
-
-    conn.execute(text("""
-        INSERT INTO mlb_player_aliases (player_id, source, source_name, normalized_name, created_at)
-        VALUES (:player_id, 'odds_api', :source_name, :normalized_name, NOW())
-        ON CONFLICT (source, normalized_name) DO NOTHING
-    """), {
-        'player_id': player_id,
-        'source_name': player_name,
-        'normalized_name': normalized
-    })
-
-    print(f"    ➕ Created new player: {player_name} (ID: {player_id})")
-    return player_id
-
-
 def decimal_to_american(decimal_odds: float) -> int:
     """Convert decimal odds to American format."""
     if decimal_odds >= 2.0:
@@ -362,142 +321,123 @@ def decimal_to_american(decimal_odds: float) -> int:
         return int(-100 / (decimal_odds - 1))
 
 
+# market_key -> (line_col, over_col, under_col), per props table
+BATTER_STAT_COLUMNS = {
+    'batter_hits':        ('odds_batter_hits', 'odds_batter_hits_over_price', 'odds_batter_hits_under_price'),
+    'batter_home_runs':   ('odds_batter_home_runs', 'odds_batter_home_runs_over_price', 'odds_batter_home_runs_under_price'),
+    'batter_rbis':        ('odds_batter_rbi', 'odds_batter_rbi_over_price', 'odds_batter_rbi_under_price'),
+    'batter_runs_scored': ('odds_batter_runs_scored', 'odds_batter_runs_scored_over_price', 'odds_batter_runs_scored_under_price'),
+    'batter_total_bases': ('odds_batter_total_bases', 'odds_batter_total_bases_over_price', 'odds_batter_total_bases_under_price'),
+}
+PITCHER_STAT_COLUMNS = {
+    'pitcher_strikeouts':   ('odds_pitcher_strikeouts', 'odds_pitcher_strikeouts_over_price', 'odds_pitcher_strikeouts_under_price'),
+    'pitcher_earned_runs':  ('odds_pitcher_earned_runs', 'odds_pitcher_earned_runs_over_price', 'odds_pitcher_earned_runs_under_price'),
+    'pitcher_hits_allowed': ('odds_pitcher_hits_allowed', 'odds_pitcher_hits_allowed_over_price', 'odds_pitcher_hits_allowed_under_price'),
+    'pitcher_walks':        ('odds_pitcher_walks', 'odds_pitcher_walks_over_price', 'odds_pitcher_walks_under_price'),
+}
+PROPS_TABLES = (
+    ('mlb_batter_props', BATTER_STAT_COLUMNS),
+    ('mlb_pitcher_props', PITCHER_STAT_COLUMNS),
+)
+
+
+def build_prop_rows(props_data: List[Dict], stat_columns: Dict, player_ids: Dict[str, int],
+                    team_ids: Dict[str, Optional[int]]) -> List[Dict]:
+    """
+    One row per (player, event) for a props table, carrying the columns of
+    every market in `stat_columns` the player has props for.
+    """
+    keyed_rows = []
+    for prop in props_data:
+        if prop['market_key'] not in stat_columns:
+            continue
+        player_id = player_ids.get(normalize_name_simple(prop['player_name']))
+        if not player_id:
+            print(f"    Skipping {prop['player_name']} - could not resolve")
+            continue
+
+        line_col, over_col, under_col = stat_columns[prop['market_key']]
+        over_price_american = int(prop['over_price']) if prop['over_price'] is not None else None
+        under_price_american = int(prop['under_price']) if prop['under_price'] is not None else None
+
+        keyed_rows.append(((player_id, prop['event_id']), {
+            'player_id': player_id,
+            'odds_event_id': prop['event_id'],
+            'game_date': prop['game_date'],
+            'bookmaker': prop['bookmaker'],
+            'odds_source': 'odds_api',
+            'odds_home_team': prop['home_team'],
+            'odds_away_team': prop['away_team'],
+            'odds_home_team_id': team_ids.get(prop['home_team']),
+            'odds_away_team_id': team_ids.get(prop['away_team']),
+            line_col: prop['line'],
+            over_col: over_price_american,
+            under_col: under_price_american,
+        }))
+    return merge_prop_rows(keyed_rows)
+
+
 def insert_historical_props_to_db(conn, props_data: List[Dict]) -> tuple:
     """
     Insert historical MLB player props to database.
-    Returns (inserted_count, player_errors) where player_errors is a list of (player_name, error_str).
+
+    Players and teams for the whole batch are resolved up front, then each
+    props table gets a single INSERT ... ON CONFLICT (player_id, odds_event_id)
+    DO UPDATE. Returns (inserted_count, player_errors) where player_errors is a
+    list of (player_name, error_str); a failed batch reports every prop in it.
     """
-    inserted_count = 0
-    player_errors = []
+    known_markets = {**BATTER_STAT_COLUMNS, **PITCHER_STAT_COLUMNS}
+    props_data = [prop for prop in props_data if prop['market_key'] in known_markets]
+    if not props_data:
+        return 0, []
 
-    batter_stat_columns = {
-        'batter_hits':        ('odds_batter_hits', 'odds_batter_hits_over_price', 'odds_batter_hits_under_price'),
-        'batter_home_runs':   ('odds_batter_home_runs', 'odds_batter_home_runs_over_price', 'odds_batter_home_runs_under_price'),
-        'batter_rbis':        ('odds_batter_rbi', 'odds_batter_rbi_over_price', 'odds_batter_rbi_under_price'),
-        'batter_runs_scored': ('odds_batter_runs_scored', 'odds_batter_runs_scored_over_price', 'odds_batter_runs_scored_under_price'),
-        'batter_total_bases': ('odds_batter_total_bases', 'odds_batter_total_bases_over_price', 'odds_batter_total_bases_under_price'),
-    }
-    pitcher_stat_columns = {
-        'pitcher_strikeouts':   ('odds_pitcher_strikeouts', 'odds_pitcher_strikeouts_over_price', 'odds_pitcher_strikeouts_under_price'),
-        'pitcher_earned_runs':  ('odds_pitcher_earned_runs', 'odds_pitcher_earned_runs_over_price', 'odds_pitcher_earned_runs_under_price'),
-        'pitcher_hits_allowed': ('odds_pitcher_hits_allowed', 'odds_pitcher_hits_allowed_over_price', 'odds_pitcher_hits_allowed_under_price'),
-        'pitcher_walks':        ('odds_pitcher_walks', 'odds_pitcher_walks_over_price', 'odds_pitcher_walks_under_price'),
-    }
+    # Resolve team IDs (once per team, not per prop)
+    team_names = {prop['home_team'] for prop in props_data} | {prop['away_team'] for prop in props_data}
+    team_ids = {name: resolve_team_id_from_odds_api(conn, name) for name in team_names}
 
+    names = {}
     for prop in props_data:
-        market_key = prop['market_key']
-        if market_key in batter_stat_columns:
-            table_name = 'mlb_batter_props'
-            line_col, over_col, under_col = batter_stat_columns[market_key]
-        elif market_key in pitcher_stat_columns:
-            table_name = 'mlb_pitcher_props'
-            line_col, over_col, under_col = pitcher_stat_columns[market_key]
-        else:
-            continue
+        names.setdefault(normalize_name_simple(prop['player_name']), (prop['player_name'], prop['game_date']))
+    markets = {prop['market_key'] for prop in props_data}
 
-        try:
-            with conn.begin_nested():  # savepoint — rolls back only this prop on failure
-                player_id = resolve_player_simple(conn, prop['player_name'], prop['game_date'])
-
-                if not player_id:
-                    print(f"    Skipping {prop['player_name']} - could not resolve")
-                    continue
-
-                home_team_id = resolve_team_id_from_odds_api(conn, prop['home_team'])
-                away_team_id = resolve_team_id_from_odds_api(conn, prop['away_team'])
-
-                over_price_american = int(prop['over_price']) if prop['over_price'] is not None else None
-                under_price_american = int(prop['under_price']) if prop['under_price'] is not None else None
-
-                existing = conn.execute(text(f"""
-                    SELECT id FROM {table_name}
-                    WHERE player_id = :player_id AND odds_event_id = :odds_event_id
-                """), {
-                    'player_id': player_id,
-                    'odds_event_id': prop['event_id']
-                }).fetchone()
-
-                if existing:
-                    update_sql = f"""
-                        UPDATE {table_name}
-                        SET {line_col} = :line,
-                            {over_col} = :over_price,
-                            {under_col} = :under_price,
-                            normalized_name = (SELECT normalized_name FROM mlb_players WHERE id = :player_id),
-                            odds_home_team = :odds_home_team,
-                            odds_away_team = :odds_away_team,
-                            odds_home_team_id = :odds_home_team_id,
-                            odds_away_team_id = :odds_away_team_id,
-                            updated_at = NOW()
-                        WHERE id = :record_id
-                    """
-
-                    conn.execute(text(update_sql), {
-                        'line': prop['line'],
-                        'over_price': over_price_american,
-                        'under_price': under_price_american,
-                        'player_id': player_id,
-                        'odds_home_team': prop['home_team'],
-                        'odds_away_team': prop['away_team'],
-                        'odds_home_team_id': home_team_id,
-                        'odds_away_team_id': away_team_id,
-                        'record_id': existing[0]
-                    })
-                else:
-                    insert_sql = f"""
-                        INSERT INTO {table_name} (
-                            player_id, normalized_name, odds_event_id, game_date, bookmaker, odds_source,
-                            odds_home_team, odds_away_team, odds_home_team_id, odds_away_team_id,
-                            did_not_play,
-                            {line_col}, {over_col}, {under_col}
-                        ) VALUES (
-                            :player_id,
-                            (SELECT normalized_name FROM mlb_players WHERE id = :player_id),
-                            :odds_event_id, :game_date, :bookmaker, :odds_source,
-                            :odds_home_team, :odds_away_team, :odds_home_team_id, :odds_away_team_id,
-                            FALSE,
-                            :line, :over_price, :under_price
-                        )
-                    """
-
-                    conn.execute(text(insert_sql), {
-                        'player_id': player_id,
-                        'odds_event_id': prop['event_id'],
-                        'game_date': prop['game_date'],
-                        'bookmaker': prop['bookmaker'],
-                        'odds_source': 'odds_api',
-                        'odds_home_team': prop['home_team'],
-                        'odds_away_team': prop['away_team'],
-                        'odds_home_team_id': home_team_id,
-                        'odds_away_team_id': away_team_id,
-                        'line': prop['line'],
-                        'over_price': over_price_american,
-                        'under_price': under_price_american
-                    })
-
-                    inserted_count += 1
-
-        except Exception as e:
-            player_name = prop.get('player_name', 'unknown')
-            error_str = str(e).splitlines()[0]  # first line only — keeps output readable
-            print(f"    ❌ Error processing {player_name}: {error_str}")
-            player_errors.append((player_name, error_str))
-            continue
+    inserted_count = 0
+    try:
+        with conn.begin_nested():  # savepoint — a failed batch leaves the rest of the day intact
+            player_ids = resolve_players(conn, 'mlb_players', 'mlb_player_aliases', names)
+            for table_name, stat_columns in PROPS_TABLES:
+                rows = build_prop_rows(props_data, stat_columns, player_ids, team_ids)
+                stat_groups = [stat_columns[m] for m in sorted(markets & set(stat_columns))]
+                inserted, updated = upsert_props(
+                    conn, table_name, 'mlb_players', rows, stat_groups,
+                    insert_only={'did_not_play': False},
+                )
+                if rows:
+                    print(f"    Upserted {len(rows)} {table_name} rows ({inserted} new, {updated} updated)")
+                inserted_count += inserted
+    except Exception as e:
+        error_str = str(e).splitlines()[0]  # first line only — keeps output readable
+        print(f"    ❌ Error writing {len(props_data)} player props: {error_str}")
+        return 0, [(prop['player_name'], error_str) for prop in props_data]
 
-    return inserted_count, player_errors
+    return inserted_count, []
 
 
-def import_historical_player_odds_for_date(target_date: date, conn) -> int:
+def fetch_historical_player_props_for_date(target_date: date, skip_events: Collection[str] = ()) -> Tuple[List[tuple], List[str]]:
     """
-    Import all historical MLB player odds for a specific date.
+    Fetch and parse the player props of every MLB event on a date (no database).
+
+    Returns ((event_id, props) for each event on the target date (ET) with
+    player odds, IDs of events whose odds fetch failed), leaving out
+    skip_events (already imported, see import_checkpoints.py). Events with no
+    odds available (422 / no bookmaker data) are in neither list.
     """
-    print(f"\n=== Importing Historical MLB Player Odds for {target_date} ===")
+    print(f"\n=== Fetching Historical MLB Player Odds for {target_date} ===")
 
-    events = get_historical_mlb_events(target_date)
+    events = get_historical_mlb_events(target_date, raise_on_error=True)
 
     if not events:
         print(f"No events found for {target_date}")
-        return 0
+        return [], []
 
     eastern = pytz.timezone('US/Eastern')
     filtered_events = []
@@ -516,21 +456,20 @@ def import_historical_player_odds_for_date(target_date: date, conn) -> int:
 
     if not filtered_events:
         print(f"  No events match target date {target_date} after timezone conversion")
-        return 0
+        return [], []
 
-    total_props_imported = 0
+    event_props = []
+    failed_events = []
 
-    for i, event in enumerate(filtered_events, 1):
+    for event in filtered_events:
         event_id = event.get('id')
         commence_time = event.get('commence_time')
 
-        if not event_id or not commence_time:
+        if not event_id or not commence_time or event_id in skip_events:
             continue
 
-        print(f"\n  Processing event {i}/{len(filtered_events)}: {event_id}")
-
         try:
-            odds_data = get_historical_player_odds(event_id, target_date)
+            odds_data = get_historical_player_odds(event_id, target_date, commence_time=commence_time)
 
             if not odds_data:
                 continue
@@ -541,8 +480,44 @@ def import_historical_player_odds_for_date(target_date: date, conn) -> int:
                 print(f"    No player props found for event {event_id}")
                 continue
 
-            print(f"    Found {len(props_data)} player props")
+            event_props.append((event_id, props_data))
+
+        except Exception as e:
+            print(f"    Error fetching event {event_id}: {e}")
+            failed_events.append(event_id)
+
+    if failed_events:
+        print(f"  ⚠️  {len(failed_events)} event(s) failed to fetch, {target_date} stays open for a rerun")
+
+    return event_props, failed_events
+
 
+def import_historical_player_odds_for_date(target_date: date, conn, event_props: Optional[List[tuple]] = None,
+                                           checkpoint: Optional[Checkpoint] = None,
+                                           failed_events: Collection[str] = ()) -> int:
+    """
+    Import all historical MLB player odds for a specific date.
+
+    event_props is fetch_historical_player_props_for_date's output when the
+    caller already fetched the date (with its failed_events); otherwise it is
+    fetched here. With a checkpoint, each written event is marked, and the
+    date once every event on it was fetched and written, in the date's
+    transaction.
+    """
+    if event_props is None:
+        skip_events = checkpoint.done_events(target_date) if checkpoint else ()
+        event_props, failed_events = fetch_historical_player_props_for_date(target_date, skip_events)
+
+    print(f"\n=== Importing Historical MLB Player Odds for {target_date} ===")
+
+    total_props_imported = 0
+    failed = 0
+
+    for i, (event_id, props_data) in enumerate(event_props, 1):
+        print(f"\n  Processing event {i}/{len(event_props)}: {event_id}")
+        print(f"    Found {len(props_data)} player props")
+
+        try:
             inserted, errors = insert_historical_props_to_db(conn, props_data)
 
             total_props_imported += inserted
@@ -555,20 +530,33 @@ def import_historical_player_odds_for_date(target_date: date, conn) -> int:
                 print(f"    ⚠️  {len(errors)} player prop(s) skipped due to errors:")
                 for name, err in unique_errors.items():
                     print(f"       • {name}: {err}")
-
-            if i < len(filtered_events):
-                time.sleep(3)
+                failed += 1
+            elif checkpoint:
+                checkpoint.mark(target_date, event_id, inserted)
 
         except Exception as e:
             print(f"    Error processing event {event_id}: {e}")
+            failed += 1
             continue
 
+    if checkpoint and not failed and not failed_events:
+        checkpoint.mark(target_date, records=total_props_imported)
+
     return total_props_imported
 
 
-def import_historical_odds_date_range(start_date: date, end_date: date):
+def import_historical_odds_date_range(start_date: date, end_date: date, workers: Optional[int] = None,
+                                      resume: bool = True):
     """
     Import historical MLB player odds for a date range.
+
+    Up to ``workers`` dates (default HISTORICAL_IMPORT_WORKERS) are fetched
+    ahead on a thread pool, paced only by the Odds API rate limiter, while
+    finished dates are written and committed here in order.
+
+    Progress is checkpointed per event and per date ('mlb_odds' in
+    import_checkpoints); unless resume is False, a rerun skips dates and
+    events already imported.
     """
     print(f"=== Historical MLB Player Odds Import ===")
     print(f"Date range: {start_date} to {end_date}")
@@ -577,32 +565,41 @@ def import_historical_odds_date_range(start_date: date, end_date: date):
     conn = engine.connect()
 
     try:
-        current_date = start_date
         total_imported = 0
+        checkpoint = Checkpoint(conn, 'mlb_odds', start_date, end_date, resume)
+        dates = checkpoint.pending_dates(start_date, end_date)
+        conn.commit()
 
-        while current_date <= end_date:
+        skipped = (end_date - start_date).days + 1 - len(dates)
+        if skipped:
+            print(f"Resuming: {skipped} date(s) already imported, {len(dates)} to go")
+        progress = ImportProgress('MLB odds', len(dates), skipped)
+
+        def fetch(target_date):
+            return fetch_historical_player_props_for_date(target_date, checkpoint.done_events(target_date))
+
+        for current_date, fetched in prefetch(fetch, dates, workers):
             try:
+                event_props, failed_events = fetched.result()
                 daily_imported = import_historical_player_odds_for_date(
-                    current_date, conn
+                    current_date, conn, event_props, checkpoint, failed_events
                 )
 
                 total_imported += daily_imported
 
                 conn.commit()
                 print(f"✅ Committed {daily_imported} records for {current_date}")
+                progress.update(current_date, daily_imported, failed=bool(failed_events))
 
             except Exception as e:
                 print(f"❌ Error processing {current_date}: {e}")
                 conn.rollback()
-
-            current_date += timedelta(days=1)
-
-            if current_date <= end_date:
-                time.sleep(5)
+                progress.update(current_date, 0, failed=True)
 
         print(f"\n🎉 Historical MLB import complete!")
         print(f"Total player prop records imported: {total_imported}")
         print(f"Date range: {start_date} to {end_date}")
+        print(progress.summary())
 
     except Exception as e:
         print(f"❌ Fatal error during historical import: {e}")
@@ -24,6 +24,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import create_engine, text
 
+from team_game_log import sync_team_game_log
+
 
 def convert_start_time_to_time(start_time):
     """Convert SDQL start_time to SQL TIME format"""
@@ -294,6 +296,11 @@ def seed_recent_games(date=None):
                     print(f"Database insert failed after 3 attempts, skipping game: {e}")
                     continue  # Skip this game and continue with next
 
+    # Keep the team-perspective log in step with the games just written
+    since = datetime.strptime(date, '%Y-%m-%d').date() if date else None
+    synced = sync_team_game_log(conn, 'mlb', since=since)
+    print(f"team_game_log rows synced: {synced}")
+
     # Commit the transaction
     conn.commit()
     print(f"Transaction committed successfully. New games: {new_games_count}")
@@ -21,6 +21,8 @@ if not ODDS_API_KEY:
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import create_engine, text
+
+from team_game_log import sync_team_game_log
 import importlib.util
 
 shared_utils_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared_utils.py')
@@ -291,6 +293,10 @@ def seed_mlb_games(start_date, end_date):
             })
             new_games_count += 1
 
+        # Keep the team-perspective log in step with the games just written
+        synced = sync_team_game_log(conn, 'mlb', since=datetime.strptime(start_date, '%Y-%m-%d').date())
+        print(f"team_game_log rows synced: {synced}")
+
         conn.commit()
         print(f"\nDone. Inserted {new_games_count} game(s). Skipped {len(skipped)}.")
         if skipped:
@@ -11,6 +11,12 @@ Usage:
     
     # Import a date range
     python3 nba_historical_import_orchestrator_reverse.py 2023-06-01 2023-06-30
+
+    # Fetch up to 8 dates ahead (default: HISTORICAL_IMPORT_WORKERS, 4)
+    python3 nba_historical_import_orchestrator_reverse.py 2023-06-01 2023-06-30 --workers 8
+
+    # Re-import dates and events completed by earlier runs (see import_checkpoints.py)
+    python3 nba_historical_import_orchestrator_reverse.py 2023-06-01 2023-06-30 --no-resume
     
     # Import with different format
     python3 nba_historical_import_orchestrator_reverse.py 20230612
@@ -19,6 +25,7 @@ Usage:
 import sys
 import os
 from datetime import date, datetime
+from typing import Optional
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
@@ -28,6 +35,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import the historical import functions
 from jobs.nba_historical_player_odds_import import import_historical_odds_date_range
 from jobs.nba_historical_player_actuals_import_reverse import import_historical_actuals_date_range_reverse
+from rate_limit import DEFAULT_WORKERS
 
 # Load environment variables
 load_dotenv()
@@ -68,6 +76,39 @@ def parse_date(date_str: str) -> date:
     raise ValueError(f"Could not parse date '{date_str}'. Supported formats: YYYY-MM-DD, YYYYMMDD, MM/DD/YYYY")
 
 
+def pop_workers_option(args: list) -> Optional[int]:
+    """
+    Remove ``--workers N`` from ``args`` and return N (None when absent).
+
+    N dates are fetched concurrently; the Odds API and ESPN rate limiters
+    (rate_limit.py) keep the combined request rate within their limits.
+    """
+    if '--workers' not in args:
+        return None
+    i = args.index('--workers')
+    try:
+        workers = int(args[i + 1])
+    except (IndexError, ValueError):
+        raise ValueError("--workers takes a positive number, e.g. --workers 8")
+    if workers < 1:
+        raise ValueError("--workers takes a positive number, e.g. --workers 8")
+    del args[i:i + 2]
+    return workers
+
+
+def pop_no_resume_option(args: list) -> bool:
+    """
+    Remove ``--no-resume`` from ``args``; returns whether to resume.
+
+    By default both imports skip the dates and events import_checkpoints
+    records as done, so an interrupted backfill picks up where it stopped.
+    """
+    if '--no-resume' not in args:
+        return True
+    args.remove('--no-resume')
+    return False
+
+
 def main():
     """
     Main orchestrator function.
@@ -78,7 +119,15 @@ def main():
     print("=" * 80)
     
     # Parse command line arguments
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    try:
+        workers = pop_workers_option(args)
+        resume = pop_no_resume_option(args)
+    except ValueError as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    
+    if not args:
         print("\n❌ Error: No date provided")
         print("\nUsage:")
         print("  Single date:   python3 nba_historical_import_orchestrator_reverse.py 2023-06-12")
@@ -87,11 +136,11 @@ def main():
         sys.exit(1)
     
     try:
-        start_date = parse_date(sys.argv[1])
+        start_date = parse_date(args[0])
         
         # Check if end date was provided
-        if len(sys.argv) >= 3:
-            end_date = parse_date(sys.argv[2])
+        if len(args) >= 2:
+            end_date = parse_date(args[1])
         else:
             end_date = start_date
         
@@ -114,6 +163,9 @@ def main():
         print("\n⚡ Performance Improvement:")
         print("  - Reverse approach queries database once per game instead of per player")
         print("  - Uses in-memory dictionary lookups for faster matching")
+        print(f"  - Fetches {workers or DEFAULT_WORKERS} dates at a time, paced by the Odds API / ESPN rate limiters")
+        print("  - " + ("Resumes from import_checkpoints, skipping dates and events already imported" if resume
+                        else "Ignores import_checkpoints and re-imports every date (--no-resume)"))
 
         
         print("\n" + "=" * 80)
@@ -121,7 +173,7 @@ def main():
         print("=" * 80)
         
         try:
-            import_historical_odds_date_range(start_date, end_date)
+            import_historical_odds_date_range(start_date, end_date, workers, resume)
             print("\n✅ Historical odds import completed successfully")
         except Exception as e:
             print(f"\n❌ Error during odds import: {e}")
@@ -132,7 +184,7 @@ def main():
         print("=" * 80)
         
         try:
-            import_historical_actuals_date_range_reverse(start_date, end_date)
+            import_historical_actuals_date_range_reverse(start_date, end_date, workers, resume)
             print("\n✅ Historical actuals import completed successfully")
         except Exception as e:
             print(f"\n❌ Error during actuals import: {e}")
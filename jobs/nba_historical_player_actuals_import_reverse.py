@@ -3,13 +3,17 @@
 import os
 import sys
 import requests
-import time
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional
+from typing import Collection, List, Dict, Optional
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 import time as _time
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from import_checkpoints import Checkpoint, ImportProgress
+from rate_limit import ESPN, prefetch
+
 # Load environment variables
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
@@ -44,10 +48,8 @@ def get_nba_games_for_date(target_date: date, retries=3, delay=2) -> List[str]:
     
     for i in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = ESPN.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
-            # Polite spacing
-            _time.sleep(0.2)
             data = response.json()
             if not data.get('events'):
                 print(f"  No games found for {target_date}")
@@ -96,10 +98,8 @@ def get_historical_game_boxscore(game_id: str, target_date: date, retries=3, del
     
     for i in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = ESPN.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
-            # Polite spacing
-            _time.sleep(0.2)
             data = response.json()
             if not data.get('boxscore'):
                 print(f"      No boxscore data available for game {game_id}")
@@ -412,7 +412,8 @@ def update_game_props_with_actuals(conn, game_id: str, game_date: date, player_s
     pass
 
 
-def process_game_reverse(conn, game_id: str, game_date: date) -> int:
+def process_game_reverse(conn, game_id: str, game_date: date, boxscore_data: Optional[Dict] = None,
+                         strict: bool = False) -> int:
     """
     Process a single game using the reverse approach.
     
@@ -420,6 +421,9 @@ def process_game_reverse(conn, game_id: str, game_date: date) -> int:
         conn: Database connection
         game_id: ESPN game ID
         game_date: Date of the game
+        boxscore_data: The game's boxscore if already fetched
+        strict: Re-raise a failed player update instead of rolling back the
+            connection's transaction and moving on
         
     Returns:
         Number of records updated
@@ -427,7 +431,8 @@ def process_game_reverse(conn, game_id: str, game_date: date) -> int:
     print(f"\n  Processing game: {game_id}")
     
     # Step 1: Get boxscore from ESPN
-    boxscore_data = get_historical_game_boxscore(game_id, game_date)
+    if boxscore_data is None:
+        boxscore_data = get_historical_game_boxscore(game_id, game_date)
     
     if not boxscore_data:
         return 0
@@ -727,6 +732,8 @@ def process_game_reverse(conn, game_id: str, game_date: date) -> int:
             
         except Exception as e:
             print(f"      ❌ Error updating {normalized_name}: {e}")
+            if strict:
+                raise
             conn.rollback()
             conn.begin()
             continue
@@ -735,54 +742,103 @@ def process_game_reverse(conn, game_id: str, game_date: date) -> int:
     return updated_count
 
 
-def import_historical_actuals_for_date_reverse(target_date: date, conn) -> int:
+def fetch_boxscores_for_date(target_date: date, skip_games: Collection[str] = ()) -> List[tuple]:
+    """
+    Fetch the boxscore of every NBA game on a date from ESPN (no database).
+    
+    Args:
+        target_date: Date to fetch
+        skip_games: Game IDs already imported (see import_checkpoints.py);
+            listed without fetching their boxscore
+    
+    Returns:
+        (game_id, boxscore) for each game; boxscore is None when unavailable
+    """
+    game_ids = get_nba_games_for_date(target_date)
+    return [
+        (game_id, None if game_id in skip_games else get_historical_game_boxscore(game_id, target_date))
+        for game_id in game_ids
+    ]
+
+
+def import_historical_actuals_for_date_reverse(target_date: date, conn, boxscores: Optional[List[tuple]] = None,
+                                               checkpoint: Optional[Checkpoint] = None) -> int:
     """
     Import historical player actuals for a specific date using reverse approach.
     
     Args:
         target_date: Date to import
         conn: Database connection
+        boxscores: Output of fetch_boxscores_for_date, when it was already
+            fetched (e.g. ahead of time by the date range)
+        checkpoint: Skips games it has, marks each processed game, and the
+            date once every game on it was processed, in the date's transaction
         
     Returns:
         Number of player prop records updated
     """
     print(f"\n=== Importing Historical Player Actuals (Reverse) for {target_date} ===")
     
-    # Step 1: Get all games for the date
-    game_ids = get_nba_games_for_date(target_date)
+    done_games = checkpoint.done_events(target_date) if checkpoint else frozenset()
+    
+    # Step 1: Get all games (and their boxscores) for the date
+    if boxscores is None:
+        boxscores = fetch_boxscores_for_date(target_date, done_games)
     
-    if not game_ids:
+    if not boxscores:
         print(f"No games found for {target_date}")
         return 0
     
     # Step 2: Process each game
     total_updated = 0
+    failed = 0
     
-    for i, game_id in enumerate(game_ids, 1):
-        print(f"\n  Processing game {i}/{len(game_ids)}: {game_id}")
+    for i, (game_id, boxscore_data) in enumerate(boxscores, 1):
+        if game_id in done_games:
+            continue
+        
+        print(f"\n  Processing game {i}/{len(boxscores)}: {game_id}")
+        
+        if not boxscore_data:
+            failed += 1
+            continue
         
         try:
-            updated = process_game_reverse(conn, game_id, target_date)
+            # savepoint — a failed game is rolled back alone and left unmarked
+            with conn.begin_nested():
+                updated = process_game_reverse(conn, game_id, target_date, boxscore_data, strict=True)
+                if checkpoint:
+                    checkpoint.mark(target_date, game_id, updated)
             total_updated += updated
-            
-            # Rate limiting
-            if i < len(game_ids):
-                time.sleep(2)
                 
         except Exception as e:
             print(f"    ❌ Error processing game {game_id}: {e}")
+            failed += 1
             continue
     
+    if checkpoint and not failed:
+        checkpoint.mark(target_date, records=total_updated)
+    
     return total_updated
 
 
-def import_historical_actuals_date_range_reverse(start_date: date, end_date: date):
+def import_historical_actuals_date_range_reverse(start_date: date, end_date: date, workers: Optional[int] = None,
+                                                 resume: bool = True):
     """
     Import historical player actual stats for a date range using reverse approach.
     
+    Up to ``workers`` dates (default HISTORICAL_IMPORT_WORKERS) of boxscores
+    are fetched ahead on a thread pool, paced only by the ESPN rate limiter,
+    while finished dates are written and committed here in order.
+    
+    Progress is checkpointed per game and per date ('nba_actuals' in
+    import_checkpoints); a rerun skips dates and games already imported.
+    
     Args:
         start_date: Start date (inclusive) 
         end_date: End date (inclusive)
+        workers: Dates fetched concurrently
+        resume: Skip units checkpointed by earlier runs (False re-imports them)
     """
     print(f"=== Historical NBA Player Actuals Import (Reverse Approach) ===")
     print(f"Date range: {start_date} to {end_date}")
@@ -792,13 +848,23 @@ def import_historical_actuals_date_range_reverse(start_date: date, end_date: dat
     conn = engine.connect()
     
     try:
-        current_date = start_date
         total_updated = 0
+        checkpoint = Checkpoint(conn, 'nba_actuals', start_date, end_date, resume)
+        dates = checkpoint.pending_dates(start_date, end_date)
+        conn.commit()
+        
+        skipped = (end_date - start_date).days + 1 - len(dates)
+        if skipped:
+            print(f"Resuming: {skipped} date(s) already imported, {len(dates)} to go")
+        progress = ImportProgress('NBA actuals', len(dates), skipped)
         
-        while current_date <= end_date:
+        def fetch(target_date):
+            return fetch_boxscores_for_date(target_date, checkpoint.done_events(target_date))
+        
+        for current_date, fetched in prefetch(fetch, dates, workers):
             try:
                 daily_updated = import_historical_actuals_for_date_reverse(
-                    current_date, conn
+                    current_date, conn, fetched.result(), checkpoint
                 )
                 
                 total_updated += daily_updated
@@ -806,21 +872,17 @@ def import_historical_actuals_date_range_reverse(start_date: date, end_date: dat
                 # Commit daily progress
                 conn.commit()
                 print(f"✅ Committed {daily_updated} records for {current_date}")
+                progress.update(current_date, daily_updated)
                 
             except Exception as e:
                 print(f"❌ Error processing {current_date}: {e}")
                 conn.rollback()
-            
-            # Move to next date
-            current_date += timedelta(days=1)
-            
-            # Rate limiting between dates
-            if current_date <= end_date:
-                time.sleep(3)
+                progress.update(current_date, 0, failed=True)
         
         print(f"\n🎉 Historical actuals import complete!")
         print(f"Total prop records updated: {total_updated}")
         print(f"Date range: {start_date} to {end_date}")
+        print(progress.summary())
         
     except Exception as e:
         print(f"❌ Fatal error during historical import: {e}")
@@ -6,17 +6,23 @@ import requests
 import time
 import pytz
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional
+from typing import Collection, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from import_checkpoints import Checkpoint, ImportProgress
+from player_props_import import merge_prop_rows, resolve_players, upsert_props
+from rate_limit import ODDS_API, prefetch
+
 # Load environment variables
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
 ODDS_API_KEY = os.getenv("ODDS_API_KEY")
 
 
-def get_historical_nba_events(target_date: date, retries=3, delay=2) -> List[str]:
+def get_historical_nba_events(target_date: date, retries=3, delay=2, raise_on_error: bool = False) -> List[str]:
     """
     Get all NBA event IDs for a specific historical date.
     
@@ -24,6 +30,8 @@ def get_historical_nba_events(target_date: date, retries=3, delay=2) -> List[str
         target_date: Date to fetch events for
         retries: Number of retry attempts
         delay: Delay between retries
+        raise_on_error: Raise when the events list can't be fetched instead
+            of returning an empty list (which would look like a day off)
         
     Returns:
         List of event IDs for that date
@@ -45,7 +53,7 @@ def get_historical_nba_events(target_date: date, retries=3, delay=2) -> List[str
     
     for i in range(retries):
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = ODDS_API.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
             
             events_data = response.json()
@@ -56,6 +64,8 @@ def get_historical_nba_events(target_date: date, retries=3, delay=2) -> List[str
                 events = events_data
             else:
                 print(f"  Unexpected API response format: {type(events_data)}")
+                if raise_on_error:
+                    raise ValueError(f"Unexpected events response format for {target_date}")
                 return []
             
             # Return full event data (with commence_time) for timezone conversion
@@ -68,12 +78,15 @@ def get_historical_nba_events(target_date: date, retries=3, delay=2) -> List[str
                 time.sleep(delay * (i + 1))  # Exponential backoff
             else:
                 print(f"  Failed to fetch events for {target_date}")
+                if raise_on_error:
+                    raise
                 return []
     
     return []
 
 
-def get_historical_player_odds(event_id: str, target_date: date, retries=3, delay=2) -> Optional[Dict]:
+def get_historical_player_odds(event_id: str, target_date: date, retries=3, delay=2,
+                               commence_time: Optional[str] = None) -> Optional[Dict]:
     """
     Get historical player prop odds for a specific event.
     
@@ -82,19 +95,23 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
         target_date: Date of the event
         retries: Number of retry attempts
         delay: Delay between retries
+        commence_time: Event start from the events list; looked up (one more
+            events request) when not given
         
     Returns:
-        Player odds data or None if failed/unavailable
+        Player odds data, or None if no odds are available (422 / no
+        bookmaker data). Raises the last request error when a query time
+        ran out of retries and no other time had odds.
     """
     print(f"    Fetching player odds for event {event_id}...")
     
     # Enhanced: Try multiple times (5 min before, exact, 1 min after commence_time)
-    commence_time = None
-    today_events = get_historical_nba_events(target_date)
-    for event in today_events:
-        if event.get('id') == event_id:
-            commence_time = event.get('commence_time')
-            break
+    if not commence_time:
+        today_events = get_historical_nba_events(target_date)
+        for event in today_events:
+            if event.get('id') == event_id:
+                commence_time = event.get('commence_time')
+                break
     if not commence_time:
         print(f"      Could not find commence_time for event {event_id}, using fallback time.")
         date_str = target_date.strftime('%Y-%m-%d')
@@ -110,6 +127,7 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebSever/537.36"
     }
+    last_error = None
     for odds_query_time in times_to_try:
         params = {
             'apiKey': ODDS_API_KEY,
@@ -121,7 +139,7 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
         }
         for i in range(retries):
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = ODDS_API.get(url, headers=headers, params=params, timeout=30)
                 if response.status_code == 422:
                     print(f"      No player odds available for event {event_id} at {odds_query_time}")
                     break
@@ -142,6 +160,10 @@ def get_historical_player_odds(event_id: str, target_date: date, retries=3, dela
                     time.sleep(delay * (i + 1))
                 else:
                     print(f"      Failed to get odds for event {event_id} at {odds_query_time}")
+                    last_error = e
+    # "No odds" is only trusted when every query time got an answer
+    if last_error is not None:
+        raise last_error
     return None
 
 
@@ -268,186 +290,78 @@ def resolve_team_id_from_odds_api(conn, odds_team_name: str) -> Optional[int]:
         return None
 
 
-def resolve_player_simple(conn, player_name: str, game_date: date) -> Optional[int]:
+# Map stat types to columns
+STAT_COLUMNS = {
+    'points': ('odds_player_points', 'odds_player_points_over_price', 'odds_player_points_under_price'),
+    'rebounds': ('odds_player_rebounds', 'odds_player_rebounds_over_price', 'odds_player_rebounds_under_price'),
+    'assists': ('odds_player_assists', 'odds_player_assists_over_price', 'odds_player_assists_under_price'),
+    'threes': ('odds_player_threes', 'odds_player_threes_over_price', 'odds_player_threes_under_price')
+}
+
+
+def build_prop_rows(props_data: List[Dict], player_ids: Dict[str, int], team_ids: Dict[str, Optional[int]]) -> List[Dict]:
     """
-    Player resolver that checks aliases first, then creates new players if needed.
+    One nba_player_props row per (player, event), carrying the columns of
+    every stat type the player has props for.
     """
-    normalized = normalize_name_simple(player_name)
-    
-    try:
-        # Step 1: Check aliases first (most reliable for name variations)
-        alias_result = conn.execute(text("""
-            SELECT player_id FROM nba_player_aliases 
-            WHERE normalized_name = :name
-            ORDER BY created_at DESC
-            LIMIT 1
-        """), {'name': normalized}).fetchone()
-        
-        if alias_result:
-            print(f"    ✓ Found via alias: {player_name} -> player_id {alias_result[0]}")
-            return alias_result[0]
-        
-        # Step 2: Check nba_players table by normalized name
-        player_result = conn.execute(text("""
-            SELECT id FROM nba_players WHERE normalized_name = :name
-        """), {'name': normalized}).fetchone()
-        
-        if player_result:
-            # Found existing player - add this name as an alias for future lookups
-            conn.execute(text("""
-                INSERT INTO nba_player_aliases (player_id, source, source_name, normalized_name, created_at)
-                VALUES (:player_id, 'odds_api', :source_name, :normalized_name, NOW())
-                ON CONFLICT (source, normalized_name) DO NOTHING
-            """), {
-                'player_id': player_result[0],
-                'source_name': player_name,
-                'normalized_name': normalized
-            })
-            print(f"    ✓ Found existing player and added alias: {player_name} -> player_id {player_result[0]}")
-            return player_result[0]
-        
-        # Step 3: Create new player (no existing match found)
-        new_player_result = conn.execute(text("""
-            INSERT INTO nba_players (player_name, normalized_name, first_seen_date, last_seen_date, created_at, updated_at)
-            VALUES (:player_name, :normalized_name, :first_seen_date, :last_seen_date, NOW(), NOW())
-            RETURNING id
-        """), {
-            'player_name': player_name,
-            'normalized_name': normalized,
-            'first_seen_date': game_date,
-            'last_seen_date': game_date
-        })
-        
-        player_id = new_player_result.fetchone()[0]
-        
-        # Create alias for the new player
-        conn.execute(text("""
-            INSERT INTO nba_player_aliases (player_id, source, source_name, normalized_name, created_at)
-            VALUES (:player_id, 'odds_api', :source_name, :normalized_name, NOW())
-            ON CONFLICT (source, normalized_name) DO NOTHING
-        """), {
+    keyed_rows = []
+    for prop in props_data:
+        player_id = player_ids.get(normalize_name_simple(prop['player_name']))
+        if not player_id:
+            print(f"    Skipping {prop['player_name']} - could not resolve")
+            continue
+
+        line_col, over_col, under_col = STAT_COLUMNS[prop['stat_type']]
+
+        # Convert decimal odds to American format
+        over_price_american = decimal_to_american(prop['over_price']) if prop['over_price'] else None
+        under_price_american = decimal_to_american(prop['under_price']) if prop['under_price'] else None
+
+        keyed_rows.append(((player_id, prop['event_id']), {
             'player_id': player_id,
-            'source_name': player_name,
-            'normalized_name': normalized
-        })
-        
-        print(f"    ➕ Created new player: {player_name} (ID: {player_id})")
-        return player_id
-        
-    except Exception as e:
-        print(f"    ❌ Error resolving player {player_name}: {e}")
-        return None
+            'odds_event_id': prop['event_id'],
+            'game_date': prop['game_date'],
+            'bookmaker': prop['bookmaker'],
+            'odds_source': 'odds_api',
+            'odds_home_team': prop['home_team'],
+            'odds_away_team': prop['away_team'],
+            'odds_home_team_id': team_ids.get(prop['home_team']),
+            'odds_away_team_id': team_ids.get(prop['away_team']),
+            line_col: prop['line'],
+            over_col: over_price_american,
+            under_col: under_price_american,
+        }))
+    return merge_prop_rows(keyed_rows)
 
 
 def insert_historical_props_to_db(conn, props_data: List[Dict]) -> int:
     """
     Insert historical player props to database.
+
+    Players and teams for the whole batch are resolved up front, then every
+    prop is written with a single INSERT ... ON CONFLICT (player_id,
+    odds_event_id) DO UPDATE. Returns the number of new nba_player_props rows;
+    a failed write is rolled back to its savepoint and re-raised.
     """
-    inserted_count = 0
-    
+    props_data = [prop for prop in props_data if prop['stat_type'] in STAT_COLUMNS]
+    if not props_data:
+        return 0
+
+    # Resolve team IDs (once per team, not per prop)
+    team_names = {prop['home_team'] for prop in props_data} | {prop['away_team'] for prop in props_data}
+    team_ids = {name: resolve_team_id_from_odds_api(conn, name) for name in team_names}
+
+    names = {}
     for prop in props_data:
-        try:
-            # Resolve player
-            player_id = resolve_player_simple(conn, prop['player_name'], prop['game_date'])
-            
-            if not player_id:
-                print(f"    Skipping {prop['player_name']} - could not resolve")
-                continue
-            
-            # Resolve team IDs
-            home_team_id = resolve_team_id_from_odds_api(conn, prop['home_team'])
-            away_team_id = resolve_team_id_from_odds_api(conn, prop['away_team'])
-            
-            # Map stat types to columns
-            stat_columns = {
-                'points': ('odds_player_points', 'odds_player_points_over_price', 'odds_player_points_under_price'),
-                'rebounds': ('odds_player_rebounds', 'odds_player_rebounds_over_price', 'odds_player_rebounds_under_price'),
-                'assists': ('odds_player_assists', 'odds_player_assists_over_price', 'odds_player_assists_under_price'),
-                'threes': ('odds_player_threes', 'odds_player_threes_over_price', 'odds_player_threes_under_price')
-            }
-            
-            if prop['stat_type'] not in stat_columns:
-                continue
-            
-            line_col, over_col, under_col = stat_columns[prop['stat_type']]
-            
-            # Convert decimal odds to American format
-            over_price_american = decimal_to_american(prop['over_price']) if prop['over_price'] else None
-            under_price_american = decimal_to_american(prop['under_price']) if prop['under_price'] else None
-            
-            # Check if record exists
-            existing = conn.execute(text("""
-                SELECT id FROM nba_player_props 
-                WHERE player_id = :player_id AND odds_event_id = :odds_event_id
-            """), {
-                'player_id': player_id,
-                'odds_event_id': prop['event_id']
-            }).fetchone()
-            
-            if existing:
-                # Update existing record
-                update_sql = f"""
-                    UPDATE nba_player_props 
-                    SET {line_col} = :line,
-                        {over_col} = :over_price,
-                        {under_col} = :under_price,
-                        normalized_name = (SELECT normalized_name FROM nba_players WHERE id = :player_id),
-                        odds_home_team = :odds_home_team,
-                        odds_away_team = :odds_away_team,
-                        odds_home_team_id = :odds_home_team_id,
-                        odds_away_team_id = :odds_away_team_id,
-                        updated_at = NOW()
-                    WHERE id = :record_id
-                """
-                
-                conn.execute(text(update_sql), {
-                    'line': prop['line'],
-                    'over_price': over_price_american,
-                    'under_price': under_price_american,
-                    'player_id': player_id,
-                    'odds_home_team': prop['home_team'],
-                    'odds_away_team': prop['away_team'],
-                    'odds_home_team_id': home_team_id,
-                    'odds_away_team_id': away_team_id,
-                    'record_id': existing[0]
-                })
-            else:
-                # Insert new record
-                insert_sql = f"""
-                    INSERT INTO nba_player_props (
-                        player_id, normalized_name, odds_event_id, game_date, bookmaker, odds_source,
-                        odds_home_team, odds_away_team, odds_home_team_id, odds_away_team_id,
-                        {line_col}, {over_col}, {under_col}
-                    ) VALUES (
-                        :player_id, 
-                        (SELECT normalized_name FROM nba_players WHERE id = :player_id),
-                        :odds_event_id, :game_date, :bookmaker, :odds_source,
-                        :odds_home_team, :odds_away_team, :odds_home_team_id, :odds_away_team_id,
-                        :line, :over_price, :under_price
-                    )
-                """
-                
-                conn.execute(text(insert_sql), {
-                    'player_id': player_id,
-                    'odds_event_id': prop['event_id'],
-                    'game_date': prop['game_date'],
-                    'bookmaker': prop['bookmaker'],
-                    'odds_source': 'odds_api',
-                    'odds_home_team': prop['home_team'],
-                    'odds_away_team': prop['away_team'],
-                    'odds_home_team_id': home_team_id,
-                    'odds_away_team_id': away_team_id,
-                    'line': prop['line'],
-                    'over_price': over_price_american,
-                    'under_price': under_price_american
-                })
-                
-                inserted_count += 1
-                
-        except Exception as e:
-            print(f"    Error processing {prop.get('player_name', 'unknown')}: {e}")
-            continue
-    
+        names.setdefault(normalize_name_simple(prop['player_name']), (prop['player_name'], prop['game_date']))
+    stat_groups = [STAT_COLUMNS[stat] for stat in sorted({prop['stat_type'] for prop in props_data})]
+
+    with conn.begin_nested():  # savepoint — a failed batch leaves the rest of the day intact
+        player_ids = resolve_players(conn, 'nba_players', 'nba_player_aliases', names)
+        rows = build_prop_rows(props_data, player_ids, team_ids)
+        inserted_count, updated_count = upsert_props(conn, 'nba_player_props', 'nba_players', rows, stat_groups)
+
+    print(f"    Upserted {len(rows)} player rows ({inserted_count} new, {updated_count} updated)")
     return inserted_count
 
 
@@ -461,25 +375,27 @@ def decimal_to_american(decimal_odds: float) -> int:
         return int(-100 / (decimal_odds - 1))
 
 
-def import_historical_player_odds_for_date(target_date: date, conn) -> int:
+def fetch_historical_player_props_for_date(target_date: date, skip_events: Collection[str] = ()) -> Tuple[List[tuple], List[str]]:
     """
-    Import all historical player odds for a specific date.
-    
+    Fetch and parse the player props of every event on a date (no database).
+
     Args:
-        target_date: Date to import
-        conn: Database connection
-        
+        target_date: Date to fetch
+        skip_events: Event IDs already imported (see import_checkpoints.py)
+
     Returns:
-        Number of player prop records imported
+        ((event_id, props) for each event on the target date (ET) with player
+        odds, IDs of events whose odds fetch failed); events with no odds
+        available (422 / no bookmaker data) are in neither list
     """
-    print(f"\n=== Importing Historical Player Odds for {target_date} ===")
+    print(f"\n=== Fetching Historical Player Odds for {target_date} ===")
     
     # Step 1: Get all events for the date (now returns full event objects)
-    events = get_historical_nba_events(target_date)
+    events = get_historical_nba_events(target_date, raise_on_error=True)
     
     if not events:
         print(f"No events found for {target_date}")
-        return 0
+        return [], []
     
     # Step 2: Filter events to only include games on the target date (in ET)
     eastern = pytz.timezone('US/Eastern')
@@ -501,23 +417,21 @@ def import_historical_player_odds_for_date(target_date: date, conn) -> int:
     
     if not filtered_events:
         print(f"  No events match target date {target_date} after timezone conversion")
-        return 0
+        return [], []
     
-    # Step 3: Process each filtered event
-    total_props_imported = 0
+    # Step 3: Fetch each filtered event's player odds (paced by the ODDS_API bucket)
+    event_props = []
+    failed_events = []
     
-    for i, event in enumerate(filtered_events, 1):
+    for event in filtered_events:
         event_id = event.get('id')
         commence_time = event.get('commence_time')
         
-        if not event_id or not commence_time:
+        if not event_id or not commence_time or event_id in skip_events:
             continue
-            
-        print(f"\n  Processing event {i}/{len(filtered_events)}: {event_id}")
         
         try:
-            # Get player odds for this event
-            odds_data = get_historical_player_odds(event_id, target_date)
+            odds_data = get_historical_player_odds(event_id, target_date, commence_time=commence_time)
             
             if not odds_data:
                 continue
@@ -529,31 +443,82 @@ def import_historical_player_odds_for_date(target_date: date, conn) -> int:
                 print(f"    No player props found for event {event_id}")
                 continue
             
-            print(f"    Found {len(props_data)} player props")
-            
-            # Insert to database
+            event_props.append((event_id, props_data))
+                
+        except Exception as e:
+            print(f"    Error fetching event {event_id}: {e}")
+            failed_events.append(event_id)
+    
+    if failed_events:
+        print(f"  ⚠️  {len(failed_events)} event(s) failed to fetch, {target_date} stays open for a rerun")
+
+    return event_props, failed_events
+
+
+def import_historical_player_odds_for_date(target_date: date, conn, event_props: Optional[List[tuple]] = None,
+                                           checkpoint: Optional[Checkpoint] = None,
+                                           failed_events: Collection[str] = ()) -> int:
+    """
+    Import all historical player odds for a specific date.
+    
+    Args:
+        target_date: Date to import
+        conn: Database connection
+        event_props: Output of fetch_historical_player_props_for_date, when
+            it was already fetched (e.g. ahead of time by the date range)
+        checkpoint: Marks each written event, and the date once every
+            event on it was fetched and written, in the date's transaction
+        failed_events: Events the fetch step could not get odds for; while
+            any remain the date is left open for the next run
+        
+    Returns:
+        Number of player prop records imported
+    """
+    if event_props is None:
+        skip_events = checkpoint.done_events(target_date) if checkpoint else ()
+        event_props, failed_events = fetch_historical_player_props_for_date(target_date, skip_events)
+    
+    print(f"\n=== Importing Historical Player Odds for {target_date} ===")
+    total_props_imported = 0
+    failed = 0
+    
+    for i, (event_id, props_data) in enumerate(event_props, 1):
+        print(f"\n  Processing event {i}/{len(event_props)}: {event_id}")
+        print(f"    Found {len(props_data)} player props")
+        
+        try:
             inserted = insert_historical_props_to_db(conn, props_data)
-            
             total_props_imported += inserted
-            
-            # Rate limiting - be very nice to historical API
-            if i < len(filtered_events):
-                time.sleep(3)  # 3 seconds between events
-                
+            if checkpoint:
+                checkpoint.mark(target_date, event_id, inserted)
         except Exception as e:
             print(f"    Error processing event {event_id}: {e}")
+            failed += 1
             continue
     
+    if checkpoint and not failed and not failed_events:
+        checkpoint.mark(target_date, records=total_props_imported)
+    
     return total_props_imported
 
 
-def import_historical_odds_date_range(start_date: date, end_date: date):
+def import_historical_odds_date_range(start_date: date, end_date: date, workers: Optional[int] = None,
+                                      resume: bool = True):
     """
     Import historical player odds for a date range.
     
+    Up to ``workers`` dates (default HISTORICAL_IMPORT_WORKERS) are fetched
+    ahead on a thread pool, paced only by the Odds API rate limiter, while
+    finished dates are written and committed here in order.
+    
+    Progress is checkpointed per event and per date ('nba_odds' in
+    import_checkpoints); a rerun skips dates and events already imported.
+    
     Args:
         start_date: Start date (inclusive)
         end_date: End date (inclusive)
+        workers: Dates fetched concurrently
+        resume: Skip units checkpointed by earlier runs (False re-imports them)
     """
     print(f"=== Historical NBA Player Odds Import ===")
     print(f"Date range: {start_date} to {end_date}")
@@ -563,35 +528,42 @@ def import_historical_odds_date_range(start_date: date, end_date: date):
     conn = engine.connect()
     
     try:
-        current_date = start_date
         total_imported = 0
+        checkpoint = Checkpoint(conn, 'nba_odds', start_date, end_date, resume)
+        dates = checkpoint.pending_dates(start_date, end_date)
+        conn.commit()
+        
+        skipped = (end_date - start_date).days + 1 - len(dates)
+        if skipped:
+            print(f"Resuming: {skipped} date(s) already imported, {len(dates)} to go")
+        progress = ImportProgress('NBA odds', len(dates), skipped)
+        
+        def fetch(target_date):
+            return fetch_historical_player_props_for_date(target_date, checkpoint.done_events(target_date))
         
-        while current_date <= end_date:
+        for current_date, fetched in prefetch(fetch, dates, workers):
             try:
+                event_props, failed_events = fetched.result()
                 daily_imported = import_historical_player_odds_for_date(
-                    current_date, conn
+                    current_date, conn, event_props, checkpoint, failed_events
                 )
                 
                 total_imported += daily_imported
                 
-                # Commit daily progress
+                # Commit daily progress (and its checkpoints)
                 conn.commit()
                 print(f"✅ Committed {daily_imported} records for {current_date}")
+                progress.update(current_date, daily_imported, failed=bool(failed_events))
                 
             except Exception as e:
                 print(f"❌ Error processing {current_date}: {e}")
                 conn.rollback()
-            
-            # Move to next date
-            current_date += timedelta(days=1)
-            
-            # Rate limiting between dates
-            if current_date <= end_date:
-                time.sleep(5)  # 5 seconds between dates
+                progress.update(current_date, 0, failed=True)
         
         print(f"\n🎉 Historical import complete!")
         print(f"Total player prop records imported: {total_imported}")
         print(f"Date range: {start_date} to {end_date}")
+        print(progress.summary())
         
     except Exception as e:
         print(f"❌ Fatal error during historical import: {e}")
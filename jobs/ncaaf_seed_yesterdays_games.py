@@ -6,8 +6,13 @@ from dotenv import load_dotenv
 import requests
 import json
 import os
+import sys
 import time
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from team_game_log import sync_team_game_log
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -233,6 +238,10 @@ def seed_yesterdays_games():
                     print(f"Database insert failed after 3 attempts, skipping game: {e}")
                     continue  # Skip this game and continue with next
 
+    # Keep the team-perspective log in step with the games just written
+    synced = sync_team_game_log(conn, 'ncaaf')
+    print(f"team_game_log rows synced: {synced}")
+
     # Commit the transaction
     conn.commit()
     print("Transaction committed successfully.")
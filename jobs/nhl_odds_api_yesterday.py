@@ -24,6 +24,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 from sqlalchemy import create_engine, text
+
+from team_game_log import sync_team_game_log
 # Import convert_team_name from shared_utils
 import importlib.util
 shared_utils_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared_utils.py')
@@ -264,6 +266,11 @@ def seed_yesterdays_nhl_games():
                     'reason': reason
                 })
                 continue
+
+        # Keep the team-perspective log in step with the games just written
+        synced = sync_team_game_log(conn, 'nhl')
+        print(f"team_game_log rows synced: {synced}")
+
         conn.commit()
         print(f"\nSuccessfully seeded {new_games_count} NHL games from yesterday")
         print("\n[DEBUG] Inserted games:")
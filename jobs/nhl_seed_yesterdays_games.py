@@ -6,8 +6,13 @@ from dotenv import load_dotenv
 import requests
 import json
 import os
+import sys
 import time
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from team_game_log import sync_team_game_log
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -154,6 +159,10 @@ def seed_yesterdays_nhl_games():
             print(f"Database insert failed: {e}")
             continue
 
+    # Keep the team-perspective log in step with the games just written
+    synced = sync_team_game_log(conn, 'nhl')
+    print(f"team_game_log rows synced: {synced}")
+
     conn.commit()
     print("Transaction committed successfully.")
     conn.close()
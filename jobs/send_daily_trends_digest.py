@@ -9,7 +9,9 @@ import sys
 import base64
 import binascii
 import json
+import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pytz
 
@@ -19,43 +21,43 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
-from api.external_requests.odds_api import get_odds_data
+from api.external_requests.odds_api import get_odds_snapshot
 from shared_utils import convert_team_name
 from api.services.historical.mlb_trends_service import MLBTrendsService
 from api.services.historical.nhl_trends_service import NHLTrendsService
 from api.services.historical.nba_trends_service import NBATrendsService
 from api.services.historical.mlb_player_trends_service import MLBPlayerTrendsService
 from api.services.blog_service import BlogService
-from api.services.email_service import EmailService
+from api.services.email_service import EmailService, BREVO_MAX_BATCH_RECIPIENTS
 from api.services.historical.trend_context_service import get_streak_context
 
 eastern_tz = pytz.timezone('US/Eastern')
 
 SITE_BASE_URL = os.getenv("SITE_BASE_URL", "https://www.getstam.com")
 
+# Email fan-out: recipients per Brevo request, requests in flight, and how many
+# times a batch Brevo did not accept goes back on the retry queue.
+EMAIL_BATCH_SIZE = min(int(os.getenv("DIGEST_EMAIL_BATCH_SIZE", "1000")), BREVO_MAX_BATCH_RECIPIENTS)
+EMAIL_SEND_WORKERS = int(os.getenv("DIGEST_EMAIL_WORKERS", "4"))
+EMAIL_SEND_RETRIES = int(os.getenv("DIGEST_EMAIL_RETRIES", "3"))
+
+# Brevo template-language placeholder filled per recipient from message version params
+UNSUBSCRIBE_URL_PARAM = "{{ params.unsubscribe_url }}"
+
 SPORTS_CONFIG = [
-    {"sport": "mlb", "sport_key": "baseball_mlb", "display": "MLB", "trends_cls": MLBTrendsService, "min_trend_length": 5},
+    {"sport": "mlb", "sport_key": "baseball_mlb", "display": "MLB", "trends_cls": MLBTrendsService, "min_trend_length": 5,
+     "player_trends_cls": MLBPlayerTrendsService},
     {"sport": "nhl", "sport_key": "icehockey_nhl", "display": "NHL", "trends_cls": NHLTrendsService, "min_trend_length": 3},
     {"sport": "nba", "sport_key": "basketball_nba", "display": "NBA", "trends_cls": NBATrendsService, "min_trend_length": 3},
 ]
 
 
-def _extract_ml(odds_game: dict, home_full: str) -> tuple:
+def _extract_ml(snapshot, game: dict) -> tuple:
     """
-    Pull (home_ml, away_ml) from an Odds API game dict.
+    Pull (home_ml, away_ml) for an Odds API game from the sport's OddsSnapshot.
     Returns (None, None) if h2h market isn't available.
     """
-    for bookmaker in odds_game.get('bookmakers', []):
-        for market in bookmaker.get('markets', []):
-            if market.get('key') == 'h2h':
-                home_ml = away_ml = None
-                for outcome in market.get('outcomes', []):
-                    if outcome.get('name') == home_full:
-                        home_ml = outcome.get('price')
-                    else:
-                        away_ml = outcome.get('price')
-                return home_ml, away_ml
-    return None, None
+    return snapshot.moneylines(game.get("id"))
 
 
 def _encode_game_id(hex_id):
@@ -76,21 +78,11 @@ def _build_matchup_slug(away_full, home_full, date_str):
     return f"{_slug(away_full)}-vs-{_slug(home_full)}-{date_str}"
 
 
-def _get_todays_games_from_scores(scores):
-    """Filter Odds API scores list to games starting today ET."""
-    today_et = datetime.now(eastern_tz).date()
-    games = []
-    for game in (scores or []):
-        commence_time = game.get("commence_time")
-        if not commence_time:
-            continue
-        try:
-            dt = datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
-            if dt.astimezone(eastern_tz).date() == today_et:
-                games.append(game)
-        except Exception:
-            continue
-    return games
+def _get_todays_games(snapshot):
+    """Odds API games (scores entries) starting today ET."""
+    if snapshot is None:
+        return []
+    return snapshot.games_on(datetime.now(eastern_tz).date())
 
 
 def _check_existing_post(slug):
@@ -227,11 +219,26 @@ def _build_markdown(today_str, sport_results, player_streaks_by_team=None):
     return "\n".join(lines)
 
 
-def _build_html_email(today_str, highest_trend, highest_team, sport_results, post_slug, recipient_email=""):
-    """Build inline-styled HTML for the email digest."""
-    blog_url = f"{SITE_BASE_URL}/blog/{post_slug}?ref=email"
+def _unsubscribe_url(recipient_email):
     encoded_email = base64.urlsafe_b64encode(recipient_email.encode()).rstrip(b"=").decode("ascii")
-    unsubscribe_url = f"{SITE_BASE_URL}/api/unsubscribe?e={urllib.parse.quote(encoded_email)}"
+    return f"{SITE_BASE_URL}/api/unsubscribe?e={urllib.parse.quote(encoded_email)}"
+
+
+def _personalize_html(html, recipient_email):
+    """Fill the per-recipient placeholders locally (for one-off sends outside a batch)."""
+    return html.replace(UNSUBSCRIBE_URL_PARAM, _unsubscribe_url(recipient_email))
+
+
+def _build_html_email(today_str, highest_trend, highest_team, sport_results, post_slug):
+    """
+    Build inline-styled HTML for the email digest.
+
+    Rendered once for every subscriber: the unsubscribe link is left as the
+    UNSUBSCRIBE_URL_PARAM placeholder, which Brevo fills from each message
+    version's params (or _personalize_html fills for a single send).
+    """
+    blog_url = f"{SITE_BASE_URL}/blog/{post_slug}?ref=email"
+    unsubscribe_url = UNSUBSCRIBE_URL_PARAM
 
     sports_with_trends = [display for display, _sk, entries in sport_results if entries]
     sports_line = ", ".join(sports_with_trends) if sports_with_trends else "MLB, NHL, NBA"
@@ -293,154 +300,231 @@ def _build_html_email(today_str, highest_trend, highest_team, sport_results, pos
 </html>"""
 
 
+def _games_for_trends(snapshot, today_games_raw, sport):
+    """Convert Odds API games to the short-DB-name game dicts the trends services take."""
+    games_for_trends = []
+    for g in today_games_raw:
+        home_full = g.get("home_team", "")
+        away_full = g.get("away_team", "")
+        home_short = convert_team_name(home_full)
+        away_short = convert_team_name(away_full)
+        home_ml, away_ml = _extract_ml(snapshot, g)
+        commence_time = g.get("commence_time") or ""
+        # ET calendar date, not the UTC one commence_time is stored in — a naive
+        # split("T")[0] puts night games (common past ~8pm ET) on the wrong day.
+        game_date_et = ""
+        if commence_time:
+            try:
+                game_date_et = str(
+                    datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
+                    .astimezone(eastern_tz).date()
+                )
+            except Exception:
+                game_date_et = commence_time.split("T")[0]
+        games_for_trends.append({
+            "home_team_name": home_short,
+            "away_team_name": away_short,
+            "home_team_full": home_full,
+            "away_team_full": away_full,
+            "game_date": game_date_et,
+            "game_id": _encode_game_id(g.get("id", "")),
+            "sport": sport,
+            "home_ml": home_ml,
+            "away_ml": away_ml,
+        })
+    return games_for_trends
+
+
+def _flatten_trends(display, games_with_trends):
+    """Every trend of a sport as {label, trend, sport}, for highest-trend selection."""
+    flat = []
+    for entry in games_with_trends:
+        game = entry["game"]
+        home = game.get("home_team_name", "")
+        away = game.get("away_team_name", "")
+        for trend in entry.get("homeTeamTrends", []):
+            flat.append({"label": home, "trend": trend, "sport": display})
+        for trend in entry.get("awayTeamTrends", []):
+            flat.append({"label": away, "trend": trend, "sport": display})
+        for trend in entry.get("homeTeamHomeTrends", []):
+            flat.append({"label": f"{home} (at home)", "trend": trend, "sport": display})
+        for trend in entry.get("awayTeamAwayTrends", []):
+            flat.append({"label": f"{away} (away)", "trend": trend, "sport": display})
+        for trend in entry.get("headToHeadTrends", []):
+            flat.append({"label": f"{home} vs {away}", "trend": trend, "sport": display})
+        for trend in entry.get("homeAtHomeH2HTrends", []):
+            flat.append({"label": f"{home} vs {away} (home)", "trend": trend, "sport": display})
+    return flat
+
+
+def _get_player_streaks(cfg, team_names):
+    """Batter streaks for today's teams, re-keyed to short DB names."""
+    raw_streaks_by_team = cfg["player_trends_cls"]().get_batter_streaks(
+        team_names=team_names, min_streak=5
+    )
+    # player_team_name in batter_props uses Odds API full names; re-key to short
+    # DB names so games (which use short names) can look streaks up per-team.
+    return {
+        convert_team_name(full_name): streaks
+        for full_name, streaks in raw_streaks_by_team.items()
+    }
+
+
+def _analyze_sport(cfg, pool):
+    """
+    Fetch one sport's snapshot and run its stages off it.
+
+    The player streaks stage (MLB) only needs today's team names, so it is
+    submitted to ``pool`` as soon as the snapshot is in and runs alongside the
+    trends analysis. Returns (games_with_trends, player_streaks_future); either
+    may be empty/None.
+    """
+    sport = cfg["sport"]
+    display = cfg["display"]
+    started = time.monotonic()
+
+    snapshot = get_odds_snapshot(sport, None)
+    if snapshot is None or not snapshot.scores:
+        print(f"[digest] {display}: no scores data, skipping")
+        return [], None
+
+    today_games_raw = _get_todays_games(snapshot)
+    if not today_games_raw:
+        print(f"[digest] {display}: no games today, skipping")
+        return [], None
+
+    print(f"[digest] {display}: {len(today_games_raw)} games today")
+
+    streaks_future = None
+    if cfg.get("player_trends_cls"):
+        team_names = [name for g in today_games_raw for name in (g.get("home_team", ""), g.get("away_team", "")) if name]
+        if team_names:
+            streaks_future = pool.submit(_get_player_streaks, cfg, team_names)
+
+    results, err = cfg["trends_cls"].analyze_multiple_games_trends(
+        _games_for_trends(snapshot, today_games_raw, sport), limit=20, min_trend_length=cfg["min_trend_length"]
+    )
+    if err:
+        print(f"[digest] {display} trends error: {err}")
+        return [], streaks_future
+
+    # Filter to games with trends
+    games_with_trends = [r for r in (results or []) if r.get("hasTrends")]
+    if not games_with_trends:
+        print(f"[digest] {display}: no qualifying trends found")
+    else:
+        print(f"[digest] {display}: {len(games_with_trends)} games with trends ({time.monotonic() - started:.1f}s)")
+    return games_with_trends, streaks_future
+
+
+def _send_batch(number, batch, subject, html):
+    """Send one batch; returns (ok, err, retryable, seconds)."""
+    started = time.monotonic()
+    recipients = [(email, {"unsubscribe_url": _unsubscribe_url(email)}) for email in batch]
+    ok, err, retryable = EmailService.send_digest_batch(recipients, subject, html)
+    return ok, err, retryable, time.monotonic() - started
+
+
+def _send_digest(subscribers, subject, html):
+    """
+    Fan the rendered digest out to every subscriber in Brevo batches.
+
+    Up to EMAIL_SEND_WORKERS batches are in flight at once. Batches Brevo
+    provably did not accept (see EmailService.send_digest_batch) go on a retry
+    queue and are resent, with exponential backoff between rounds, up to
+    EMAIL_SEND_RETRIES more times. Any other failure (timeout, 5xx) may have
+    been delivered, so it is logged and never resent.
+    """
+    batches = [subscribers[i:i + EMAIL_BATCH_SIZE] for i in range(0, len(subscribers), EMAIL_BATCH_SIZE)]
+    print(f"[digest] Sending to {len(subscribers)} subscribers in {len(batches)} batches of up to {EMAIL_BATCH_SIZE}")
+
+    started = time.monotonic()
+    sent_count = 0
+    unconfirmed = []  # failed in a way that may still have been delivered
+    queue = list(enumerate(batches, 1))
+    for attempt in range(EMAIL_SEND_RETRIES + 1):
+        if attempt:
+            delay = 2 ** attempt
+            print(f"[digest] Retrying {len(queue)} failed batches in {delay}s (attempt {attempt + 1})")
+            time.sleep(delay)
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, EMAIL_SEND_WORKERS), thread_name_prefix="digest-send") as pool:
+            futures = [(number, batch, pool.submit(_send_batch, number, batch, subject, html)) for number, batch in queue]
+            for number, batch, future in futures:
+                ok, err, retryable, seconds = future.result()
+                if ok:
+                    sent_count += len(batch)
+                    print(f"[digest] Batch {number}/{len(batches)}: {len(batch)} sent in {seconds:.1f}s "
+                          f"({len(batch) / max(seconds, 1e-6):.0f}/s)")
+                elif retryable:
+                    print(f"[digest] Batch {number}/{len(batches)} not accepted: {err}")
+                    failed.append((number, batch))
+                else:
+                    print(f"[digest] Batch {number}/{len(batches)} send error, not resending "
+                          f"(may have been delivered): {err}")
+                    unconfirmed.append((number, batch))
+        queue = failed
+        if not queue:
+            break
+
+    error_count = sum(len(batch) for _number, batch in queue)
+    unconfirmed_count = sum(len(batch) for _number, batch in unconfirmed)
+    for number, batch in queue:
+        print(f"[digest] Gave up on batch {number} ({len(batch)} recipients, first {batch[0]})")
+    for number, batch in unconfirmed:
+        print(f"[digest] Batch {number} unconfirmed ({len(batch)} recipients, first {batch[0]})")
+    elapsed = time.monotonic() - started
+    print(f"[digest] Done. Sent: {sent_count}, Errors: {error_count}, Unconfirmed: {unconfirmed_count} "
+          f"in {elapsed:.1f}s ({sent_count / max(elapsed, 1e-6):.0f} emails/s)")
+
+
 def run():
     today_et = datetime.now(eastern_tz).date()
     today_str = str(today_et)
     post_slug = f"daily-trends-{today_str}"
+    started = time.monotonic()
 
     print(f"[digest] Starting daily trends digest for {today_str}")
 
-    # --- Step 1: Collect trends for each sport ---
+    # --- Step 1: Collect trends (and MLB player streaks) for every sport at once ---
     all_trends_flat = []   # list of {team, trend, sport_display}
     sport_results = []     # list of (sport_display, sport_key, game_trends_list)
+    player_streaks_by_team = {}
 
-    for cfg in SPORTS_CONFIG:
-        sport = cfg["sport"]
-        sport_key = cfg["sport_key"]
-        display = cfg["display"]
-
-        try:
-            scores, odds_data = get_odds_data(sport, None)
-            if not scores:
-                print(f"[digest] {display}: no scores data, skipping")
-                continue
-
-            today_games_raw = _get_todays_games_from_scores(scores)
-            if not today_games_raw:
-                print(f"[digest] {display}: no games today, skipping")
+    # One worker per sport plus one per player-streaks stage, so nothing queues
+    # behind another sport and the step takes as long as the slowest sport.
+    workers = len(SPORTS_CONFIG) + sum(1 for c in SPORTS_CONFIG if c.get("player_trends_cls"))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="digest") as pool:
+        futures = [(cfg, pool.submit(_analyze_sport, cfg, pool)) for cfg in SPORTS_CONFIG]
+
+        # Results are gathered in SPORTS_CONFIG order so the post keeps its layout.
+        for cfg, future in futures:
+            display = cfg["display"]
+            try:
+                games_with_trends, streaks_future = future.result()
+            except Exception as e:
+                print(f"[digest] {display} error (non-fatal): {e}")
                 continue
 
-            print(f"[digest] {display}: {len(today_games_raw)} games today")
-
-            # Build a lookup from game ID → odds game dict for ML extraction
-            odds_by_id = {g['id']: g for g in (odds_data or []) if g.get('id')}
-
-            # Convert full team names → short DB names for trends service
-            games_for_trends = []
-            for g in today_games_raw:
-                home_full = g.get("home_team", "")
-                away_full = g.get("away_team", "")
-                home_short = convert_team_name(home_full)
-                away_short = convert_team_name(away_full)
-                odds_game = odds_by_id.get(g.get("id", ""))
-                home_ml, away_ml = _extract_ml(odds_game, home_full) if odds_game else (None, None)
-                commence_time = g.get("commence_time") or ""
-                # ET calendar date, not the UTC one commence_time is stored in — a naive
-                # split("T")[0] puts night games (common past ~8pm ET) on the wrong day.
-                game_date_et = ""
-                if commence_time:
-                    try:
-                        game_date_et = str(
-                            datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
-                            .astimezone(eastern_tz).date()
-                        )
-                    except Exception:
-                        game_date_et = commence_time.split("T")[0]
-                games_for_trends.append({
-                    "home_team_name": home_short,
-                    "away_team_name": away_short,
-                    "home_team_full": home_full,
-                    "away_team_full": away_full,
-                    "game_date": game_date_et,
-                    "game_id": _encode_game_id(g.get("id", "")),
-                    "sport": sport,
-                    "home_ml": home_ml,
-                    "away_ml": away_ml,
-                })
-
-            trends_cls = cfg["trends_cls"]
-            results, err = trends_cls.analyze_multiple_games_trends(
-                games_for_trends, limit=20, min_trend_length=cfg["min_trend_length"]
-            )
-            if err:
-                print(f"[digest] {display} trends error: {err}")
-                continue
+            if games_with_trends:
+                sport_results.append((display, cfg["sport"], games_with_trends))
+                all_trends_flat.extend(_flatten_trends(display, games_with_trends))
 
-            # Filter to games with trends
-            games_with_trends = [r for r in (results or []) if r.get("hasTrends")]
-            if not games_with_trends:
-                print(f"[digest] {display}: no qualifying trends found")
-                continue
+            if streaks_future is not None:
+                try:
+                    player_streaks_by_team = streaks_future.result()
+                    total_streaks = sum(len(v) for v in player_streaks_by_team.values())
+                    print(f"[digest] {display} player streaks: {total_streaks} streaks across {len(player_streaks_by_team)} teams")
+                except Exception as e:
+                    print(f"[digest] {display} player streaks error (non-fatal): {e}")
 
-            print(f"[digest] {display}: {len(games_with_trends)} games with trends")
-            sport_results.append((display, sport, games_with_trends))
-
-            # Flatten all trends for highest-trend selection
-            for entry in games_with_trends:
-                game = entry["game"]
-                home = game.get("home_team_name", "")
-                away = game.get("away_team_name", "")
-                for trend in entry.get("homeTeamTrends", []):
-                    all_trends_flat.append({"label": home, "trend": trend, "sport": display})
-                for trend in entry.get("awayTeamTrends", []):
-                    all_trends_flat.append({"label": away, "trend": trend, "sport": display})
-                for trend in entry.get("homeTeamHomeTrends", []):
-                    all_trends_flat.append({"label": f"{home} (at home)", "trend": trend, "sport": display})
-                for trend in entry.get("awayTeamAwayTrends", []):
-                    all_trends_flat.append({"label": f"{away} (away)", "trend": trend, "sport": display})
-                for trend in entry.get("headToHeadTrends", []):
-                    all_trends_flat.append({"label": f"{home} vs {away}", "trend": trend, "sport": display})
-                for trend in entry.get("homeAtHomeH2HTrends", []):
-                    all_trends_flat.append({"label": f"{home} vs {away} (home)", "trend": trend, "sport": display})
-
-        except Exception as e:
-            print(f"[digest] {display} error (non-fatal): {e}")
-            continue
+    print(f"[digest] Analysis finished in {time.monotonic() - started:.1f}s")
 
     if not all_trends_flat:
         print("[digest] No trends found across any sport. Exiting without creating post or sending email.")
         return
 
-    # --- Step 1b: Fetch MLB player streaks ---
-    player_streaks_by_team = {}
-    # Collect all MLB team names from today's games
-    all_mlb_team_names = []
-    for display, sport_key_lower, game_trends_list in sport_results:
-        if sport_key_lower == "mlb":
-            for entry in game_trends_list:
-                game = entry["game"]
-                # game dict has short names (DB names); we need Odds API full names
-                # player_team_name in batter_props uses Odds API full names, so
-                # we re-collect them from the raw scores processed earlier.
-                pass  # handled below using stored full names
-
-    # Re-collect Odds API full team names for MLB
-    try:
-        mlb_cfg = next((c for c in SPORTS_CONFIG if c["sport"] == "mlb"), None)
-        if mlb_cfg:
-            mlb_scores, _ = get_odds_data(mlb_cfg["sport"], None)
-            mlb_today = _get_todays_games_from_scores(mlb_scores or [])
-            all_mlb_team_names = []
-            for g in mlb_today:
-                all_mlb_team_names.append(g.get("home_team", ""))
-                all_mlb_team_names.append(g.get("away_team", ""))
-            all_mlb_team_names = [t for t in all_mlb_team_names if t]
-
-        if all_mlb_team_names:
-            raw_streaks_by_team = MLBPlayerTrendsService().get_batter_streaks(
-                team_names=all_mlb_team_names, min_streak=5
-            )
-            # Re-key from Odds API full team names to short DB names so games
-            # (which use short names) can look streaks up per-team.
-            player_streaks_by_team = {
-                convert_team_name(full_name): streaks
-                for full_name, streaks in raw_streaks_by_team.items()
-            }
-            total_streaks = sum(len(v) for v in player_streaks_by_team.values())
-            print(f"[digest] MLB player streaks: {total_streaks} streaks across {len(player_streaks_by_team)} teams")
-    except Exception as e:
-        print(f"[digest] MLB player streaks error (non-fatal): {e}")
-
     # --- Step 2: Find highest trend ---
     best_entry = max(all_trends_flat, key=lambda x: x["trend"]["count"])
     highest_trend = best_entry["trend"]
@@ -489,19 +573,8 @@ def run():
         print("[digest] No subscribers found. Skipping email send.")
         return
 
-    print(f"[digest] Sending to {len(subscribers)} subscribers individually")
-    sent_count = 0
-    error_count = 0
-    for email in subscribers:
-        html = _build_html_email(today_str, highest_trend, highest_team, sport_results, post_slug, email)
-        ok, err = EmailService.send_digest_to_one(email, subject, html)
-        if ok:
-            sent_count += 1
-        else:
-            print(f"[digest] Send error for {email}: {err}")
-            error_count += 1
-
-    print(f"[digest] Done. Sent: {sent_count}, Errors: {error_count}")
+    html = _build_html_email(today_str, highest_trend, highest_team, sport_results, post_slug)
+    _send_digest(subscribers, subject, html)
 
 
 if __name__ == "__main__":
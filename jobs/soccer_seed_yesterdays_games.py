@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Seed yesterday's completed soccer games for every league in one run.
+
+Each league is an entry in LEAGUES. All leagues' scores and historical odds
+are fetched concurrently over the shared, rate-limited Odds API session
+(rate_limit.ODDS_API); the games are then written with one INSERT per
+games table and team_game_log is synced once per table.
+
+Usage:
+    python3 jobs/soccer_seed_yesterdays_games.py              # every league
+    python3 jobs/soccer_seed_yesterdays_games.py epl ucl      # just these
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL").replace("postgres://", "postgresql://")
+ODDS_API_KEY = os.getenv("ODDS_API_KEY")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from rate_limit import ODDS_API
+from team_game_log import sync_team_game_log
+
+# Games table per team_game_log sport, and the teams.sport its teams are stored under
+TABLES = {
+    'soccer':      {'table': 'soccer_games',               'team_sport': 'SOCCER'},
+    'intl_soccer': {'table': 'international_soccer_games', 'team_sport': 'INTL_SOCCER'},
+}
+
+# sport_key:         Odds API sport key
+# league:            value stored in the games table's league column
+# sport:             key into TABLES (and the team_game_log sport synced afterwards)
+# add_missing_teams: insert teams the database doesn't know yet instead of skipping the game
+# date_tz:           timezone game_date / start_time are stored in
+# yesterday_only:    keep only games that started yesterday (UTC); otherwise every
+#                    completed game in the scores window (the insert skips existing ones)
+LEAGUES: Dict[str, Dict] = {
+    'epl':        {'sport_key': 'soccer_epl',                 'league': 'EPL',        'sport': 'soccer',      'add_missing_teams': False, 'date_tz': 'UTC',              'yesterday_only': True},
+    'la_liga':    {'sport_key': 'soccer_spain_la_liga',       'league': 'LA LIGA',    'sport': 'soccer',      'add_missing_teams': False, 'date_tz': 'UTC',              'yesterday_only': True},
+    'bundesliga': {'sport_key': 'soccer_germany_bundesliga',  'league': 'BUNDESLIGA', 'sport': 'soccer',      'add_missing_teams': False, 'date_tz': 'UTC',              'yesterday_only': True},
+    'serie_a':    {'sport_key': 'soccer_italy_serie_a',       'league': 'SERIE A',    'sport': 'soccer',      'add_missing_teams': True,  'date_tz': 'UTC',              'yesterday_only': True},
+    'ligue_one':  {'sport_key': 'soccer_france_ligue_one',    'league': 'LIGUE 1',    'sport': 'soccer',      'add_missing_teams': True,  'date_tz': 'UTC',              'yesterday_only': True},
+    'ucl':        {'sport_key': 'soccer_uefa_champs_league',  'league': 'UCL',        'sport': 'soccer',      'add_missing_teams': False, 'date_tz': 'UTC',              'yesterday_only': True},
+    'intl':       {'sport_key': 'soccer_fifa_world_cup',      'league': 'INTL',       'sport': 'intl_soccer', 'add_missing_teams': True,  'date_tz': 'America/New_York', 'yesterday_only': False},
+}
+
+ODDS_COLUMNS = (
+    'home_money_line', 'draw_money_line', 'away_money_line',
+    'home_spread', 'away_spread',
+    'total_over_point', 'total_over_price', 'total_under_point', 'total_under_price',
+)
+GAME_COLUMNS = (
+    'odds_id', 'league', 'game_date', 'home_team_id', 'away_team_id',
+    'home_team_name', 'away_team_name', 'home_goals', 'away_goals', 'total_goals',
+    *ODDS_COLUMNS,
+    'start_time',
+)
+
+
+# ---------------------------------------------------------------------------
+# Odds API
+# ---------------------------------------------------------------------------
+
+def _get_json(url: str, params: Dict, what: str, retries=3, delay=1):
+    for attempt in range(retries):
+        try:
+            response = ODDS_API.get(url, params={'apiKey': ODDS_API_KEY, **params}, timeout=15)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching {what} (attempt {attempt + 1}/{retries}): {e}")
+            if attempt < retries - 1:
+                time.sleep(delay)
+    raise RuntimeError(f"Failed to fetch {what} after {retries} attempts")
+
+
+def get_completed_games(key: str) -> List[Dict]:
+    """Completed games of a league from the last 3 days of scores (yesterday's only, per LEAGUES)."""
+    league = LEAGUES[key]
+    games = _get_json(
+        f"https://api.the-odds-api.com/v4/sports/{league['sport_key']}/scores/",
+        {'daysFrom': 3},
+        f"{league['league']} scores",
+    )
+    completed = [g for g in games if g.get('completed') and g.get('scores')]
+    if league['yesterday_only']:
+        yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime('%Y-%m-%d')
+        completed = [g for g in completed if g['commence_time'][:10] == yesterday]
+    return completed
+
+
+def get_historical_odds(key: str, date_str: str) -> List[Dict]:
+    """Bovada odds snapshot of a league at midnight UTC on date_str; [] when unavailable."""
+    league = LEAGUES[key]
+    try:
+        data = _get_json(
+            f"https://api.the-odds-api.com/v4/historical/sports/{league['sport_key']}/odds",
+            {
+                'regions': 'us,uk,eu',
+                'bookmakers': 'bovada',
+                'markets': 'h2h,spreads,totals',
+                'oddsFormat': 'american',
+                'date': f"{date_str}T00:00:00Z",
+            },
+            f"{league['league']} odds for {date_str}",
+        )
+    except RuntimeError as e:
+        print(e)
+        return []
+    return data.get('data', []) if isinstance(data, dict) else []
+
+
+def parse_odds(odds_game: Dict) -> Dict:
+    """Extract money lines, spreads, and totals from a Bovada odds record."""
+    info = dict.fromkeys(ODDS_COLUMNS)
+
+    bookmakers = odds_game.get('bookmakers') or []
+    bovada = next((b for b in bookmakers if b['key'] == 'bovada'), None)
+    if not bovada:
+        return info
+
+    home_team = odds_game['home_team']
+    away_team = odds_game['away_team']
+
+    for market in bovada.get('markets', []):
+        key = market['key']
+        outcomes = market.get('outcomes', [])
+
+        if key == 'h2h':
+            for o in outcomes:
+                if o['name'] == home_team:
+                    info['home_money_line'] = o['price']
+                elif o['name'] == away_team:
+                    info['away_money_line'] = o['price']
+                elif o['name'] == 'Draw':
+                    info['draw_money_line'] = o['price']
+
+        elif key == 'spreads':
+            for o in outcomes:
+                if o['name'] == home_team:
+                    info['home_spread'] = o['point']
+                elif o['name'] == away_team:
+                    info['away_spread'] = o['point']
+
+        elif key == 'totals':
+            for o in outcomes:
+                if o['name'] == 'Over':
+                    info['total_over_point'] = o['point']
+                    info['total_over_price'] = o['price']
+                elif o['name'] == 'Under':
+                    info['total_under_point'] = o['point']
+                    info['total_under_price'] = o['price']
+
+    return info
+
+
+def fetch_league(key: str) -> Tuple[List[Dict], Dict[Tuple[str, str], Dict]]:
+    """
+    A league's completed games plus an odds index keyed by (home, away) in
+    both orders, built from the odds snapshot of every date the games started on.
+    """
+    games = get_completed_games(key)
+    odds_index = {}
+    for date_str in sorted({g['commence_time'][:10] for g in games}):
+        for odds_game in get_historical_odds(key, date_str):
+            home, away = odds_game['home_team'], odds_game['away_team']
+            odds_index[(home, away)] = odds_game
+            odds_index[(away, home)] = odds_game
+    print(f"{LEAGUES[key]['league']}: {len(games)} completed games, odds for {len(odds_index) // 2}")
+    return games, odds_index
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+def load_team_ids(conn, names_by_sport: Dict[str, set]) -> Dict[Tuple[str, str], int]:
+    """(teams.sport, team_name) -> team_id, inserting the given names that are missing."""
+    team_ids = {
+        (row['sport'], row['team_name']): row['team_id']
+        for row in conn.execute(
+            text("SELECT team_id, team_name, sport FROM teams WHERE sport IN ('SOCCER', 'INTL_SOCCER')")
+        ).mappings()
+    }
+    for team_sport, names in names_by_sport.items():
+        missing = sorted(name for name in names if (team_sport, name) not in team_ids)
+        if not missing:
+            continue
+        rows = conn.execute(text("""
+            INSERT INTO teams (team_name, sport)
+            SELECT name, :sport FROM unnest(CAST(:names AS text[])) AS name
+            ON CONFLICT (team_name, sport) DO UPDATE SET team_name = EXCLUDED.team_name
+            RETURNING team_id, team_name
+        """), {'sport': team_sport, 'names': missing}).mappings()
+        for row in rows:
+            team_ids[(team_sport, row['team_name'])] = row['team_id']
+            print(f"  Auto-inserted new {team_sport} team: {row['team_name']} (id {row['team_id']})")
+    return team_ids
+
+
+def build_game_row(key: str, game: Dict, odds_index: Dict, team_ids: Dict) -> Optional[Dict]:
+    """The games-table row for one completed game, or None when it can't be stored."""
+    league = LEAGUES[key]
+    team_sport = TABLES[league['sport']]['team_sport']
+    home, away = game['home_team'], game['away_team']
+
+    home_team_id = team_ids.get((team_sport, home))
+    away_team_id = team_ids.get((team_sport, away))
+    if home_team_id is None or away_team_id is None:
+        print(f"Skipping {home} vs {away} - missing team IDs. Home: {home_team_id}, Away: {away_team_id}")
+        return None
+
+    scores = {score['name']: score['score'] for score in game['scores']}
+    if scores.get(home) is None or scores.get(away) is None:
+        print(f"Skipping {home} vs {away} - could not find scores for both teams")
+        return None
+    home_goals, away_goals = int(scores[home]), int(scores[away])
+
+    commence_time = datetime.fromisoformat(game['commence_time'].replace('Z', '+00:00'))
+    commence_time = commence_time.astimezone(ZoneInfo(league['date_tz']))
+
+    odds_game = odds_index.get((home, away))
+    if odds_game is None:
+        print(f"No odds data found for matchup: {home} vs {away}")
+    odds = parse_odds(odds_game) if odds_game else dict.fromkeys(ODDS_COLUMNS)
+    # Whole-number floats (e.g. a 150.0 price) as ints, so they load into integer columns
+    odds = {c: int(v) if isinstance(v, float) and v.is_integer() else v for c, v in odds.items()}
+
+    return {
+        'odds_id': game['id'],
+        'league': league['league'],
+        'game_date': commence_time.date().isoformat(),
+        'home_team_id': home_team_id,
+        'away_team_id': away_team_id,
+        'home_team_name': home,
+        'away_team_name': away,
+        'home_goals': home_goals,
+        'away_goals': away_goals,
+        'total_goals': home_goals + away_goals,
+        **odds,
+        'start_time': commence_time.time().isoformat(),
+    }
+
+
+def insert_games(conn, table: str, rows: List[Dict]) -> List[str]:
+    """
+    Insert every row in one statement, skipping games already stored (same
+    odds_id, or same date and teams). Returns the inserted games' odds_ids.
+
+    The rows are passed as one JSON array and typed by the table's own row
+    type through json_populate_recordset.
+    """
+    if not rows:
+        return []
+    columns = ', '.join(GAME_COLUMNS)
+    result = conn.execute(text(f"""
+        INSERT INTO {table} ({columns})
+        SELECT {', '.join(f'v.{c}' for c in GAME_COLUMNS)}
+        FROM json_populate_recordset(NULL::{table}, CAST(:rows AS json)) AS v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table} g
+            WHERE g.odds_id = v.odds_id
+               OR (g.game_date = v.game_date
+                   AND g.home_team_name = v.home_team_name
+                   AND g.away_team_name = v.away_team_name)
+        )
+        RETURNING odds_id
+    """), {'rows': json.dumps(rows)})
+    return [row[0] for row in result]
+
+
+def seed_yesterdays_soccer_games(league_keys: Optional[List[str]] = None):
+    """Fetch every league concurrently, then store each games table's new games in one insert."""
+    league_keys = league_keys or list(LEAGUES)
+    started = time.monotonic()
+    print(f"Starting soccer game seeding for: {', '.join(league_keys)}")
+
+    with ThreadPoolExecutor(max_workers=len(league_keys), thread_name_prefix='soccer') as pool:
+        futures = {key: pool.submit(fetch_league, key) for key in league_keys}
+    fetched = {}
+    for key, future in futures.items():
+        try:
+            fetched[key] = future.result()
+        except Exception as e:
+            print(f"Error fetching {LEAGUES[key]['league']}: {e}")
+    print(f"Fetched {len(fetched)}/{len(league_keys)} leagues in {time.monotonic() - started:.1f}s")
+
+    if not any(games for games, _ in fetched.values()):
+        print("No completed soccer games found for yesterday")
+        return
+
+    engine = create_engine(DATABASE_URL)
+    conn = engine.connect()
+
+    try:
+        new_team_names = {}
+        for key, (games, _) in fetched.items():
+            if LEAGUES[key]['add_missing_teams']:
+                names = new_team_names.setdefault(TABLES[LEAGUES[key]['sport']]['team_sport'], set())
+                for game in games:
+                    names.update((game['home_team'], game['away_team']))
+        team_ids = load_team_ids(conn, new_team_names)
+
+        rows_by_sport = {}
+        for key, (games, odds_index) in fetched.items():
+            for game in games:
+                row = build_game_row(key, game, odds_index, team_ids)
+                if row:
+                    rows_by_sport.setdefault(LEAGUES[key]['sport'], []).append(row)
+
+        for sport, rows in rows_by_sport.items():
+            table = TABLES[sport]['table']
+            try:
+                with conn.begin_nested():  # savepoint — one table failing keeps the other's games
+                    inserted = insert_games(conn, table, rows)
+                    # Keep the team-perspective log in step with the games just written
+                    synced = sync_team_game_log(conn, sport)
+            except Exception as e:
+                print(f"Error inserting {table} games: {e}")
+                continue
+            print(f"{table}: inserted {len(inserted)} of {len(rows)} games "
+                  f"({len(rows) - len(inserted)} already stored), team_game_log rows synced: {synced}")
+
+        conn.commit()
+        print(f"\nSoccer seeding finished in {time.monotonic() - started:.1f}s")
+
+    except Exception as e:
+        print(f"Error during seeding: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    unknown = [key for key in sys.argv[1:] if key not in LEAGUES]
+    if unknown:
+        print(f"Unknown league(s): {', '.join(unknown)}. Choose from: {', '.join(LEAGUES)}")
+        sys.exit(1)
+    seed_yesterdays_soccer_games(sys.argv[1:] or None)
@@ -25,11 +25,12 @@ from send_daily_trends_digest import (
     SITE_BASE_URL,
     _encode_game_id,
     _extract_ml,
-    _get_todays_games_from_scores,
+    _get_todays_games,
     _build_markdown,
     _build_html_email,
+    _personalize_html,
 )
-from api.external_requests.odds_api import get_odds_data
+from api.external_requests.odds_api import get_odds_snapshot
 from shared_utils import convert_team_name
 from api.services.historical.mlb_trends_service import MLBTrendsService
 from api.services.historical.nhl_trends_service import NHLTrendsService
@@ -54,28 +55,25 @@ def main():
         display = cfg["display"]
 
         try:
-            scores, odds_data = get_odds_data(sport, None)
-            if not scores:
+            snapshot = get_odds_snapshot(sport, None)
+            if snapshot is None or not snapshot.scores:
                 print(f"[test] {display}: no scores, skipping")
                 continue
 
-            today_games_raw = _get_todays_games_from_scores(scores)
+            today_games_raw = _get_todays_games(snapshot)
             if not today_games_raw:
                 print(f"[test] {display}: no games today, skipping")
                 continue
 
             print(f"[test] {display}: {len(today_games_raw)} games today")
 
-            odds_by_id = {g['id']: g for g in (odds_data or []) if g.get('id')}
-
             games_for_trends = []
             for g in today_games_raw:
                 home_full = g.get("home_team", "")
                 away_full = g.get("away_team", "")
                 home_short = convert_team_name(home_full)
                 away_short = convert_team_name(away_full)
-                odds_game = odds_by_id.get(g.get("id", ""))
-                home_ml, away_ml = _extract_ml(odds_game, home_full) if odds_game else (None, None)
+                home_ml, away_ml = _extract_ml(snapshot, g)
                 games_for_trends.append({
                     "home_team_name": home_short,
                     "away_team_name": away_short,
@@ -155,9 +153,9 @@ def main():
 
     print(f"[test] Sending to {len(subscribers)} subscriber(s): {subscribers}")
     sent, errors = 0, 0
+    html = _build_html_email(today_str, highest_trend, highest_team, sport_results, post_slug)
     for email in subscribers:
-        html = _build_html_email(today_str, highest_trend, highest_team, sport_results, post_slug, email)
-        ok, send_err = EmailService.send_digest_to_one(email, subject, html)
+        ok, send_err = EmailService.send_digest_to_one(email, subject, _personalize_html(html, email))
         if ok:
             sent += 1
             print(f"[test] Sent to {email}")
@@ -0,0 +1,284 @@
+# metrics.py - In-process latency metrics
+"""Request, database, outbound HTTP and cache metrics for the API.
+
+Everything is recorded in plain in-process counters (a bisect plus a locked
+increment per observation), so it is cheap enough to leave on in production.
+``render()`` serializes the lot in the Prometheus text exposition format;
+app.py serves it on the password-protected /internal/metrics endpoint.
+
+    http_request_duration_seconds        per blueprint / endpoint / method / status
+    db_query_duration_seconds            per route that issued the query
+    db_pool_*                            db.pool_stats() for every pool
+    external_http_request_duration_seconds  per target (odds_api, espn, rotowire, ...)
+    cache_requests_total                 hit / miss per cache key prefix
+
+Counters are per process: each gunicorn worker reports its own, and they
+reset when a forked child starts.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+from urllib.parse import urlsplit
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Outbound hosts worth their own label; everything else is reported as 'other'
+HTTP_TARGETS = (
+    ('the-odds-api.com', 'odds_api'),
+    ('espn.com', 'espn'),
+    ('rotowire.com', 'rotowire'),
+    ('sportsdatabase.com', 'sdql'),
+    ('googleapis.com', 'youtube'),
+    ('brevo.com', 'brevo'),
+)
+
+# Distinct cache key prefixes tracked before new ones are folded into 'other'
+MAX_CACHE_PREFIXES = 200
+
+# Route label for DB queries issued outside a request (jobs, background refreshes)
+_current_route = contextvars.ContextVar('metrics_route', default='background')
+
+
+class _Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, counts, total, count in sorted(series):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket{_format_labels(self.label_names + ("le",), labels + (le,))} {cumulative}'
+            yield f'{self.name}_sum{base} {total:.6f}'
+            yield f'{self.name}_count{base} {count}'
+
+
+class _Counter:
+    """Monotonic counter keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], max_series: int = None):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], int] = {}
+
+    def inc(self, labels: Tuple[str, ...], amount: int = 1, overflow: Tuple[str, ...] = None):
+        """Add ``amount``; once max_series is reached, new series count under ``overflow``."""
+        with self._lock:
+            if labels not in self._values and overflow and self.max_series and len(self._values) >= self.max_series:
+                labels = overflow
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        for labels, value in values:
+            yield f'{self.name}{_format_labels(self.label_names, labels)} {value}'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + '}'
+
+
+REQUEST_LATENCY = _Histogram(
+    'http_request_duration_seconds', 'Flask request latency.',
+    ('blueprint', 'endpoint', 'method', 'status'),
+)
+DB_QUERY_LATENCY = _Histogram(
+    'db_query_duration_seconds', 'Database statement latency, by the route that issued it.',
+    ('route',),
+)
+EXTERNAL_HTTP_LATENCY = _Histogram(
+    'external_http_request_duration_seconds', 'Outbound HTTP call latency.',
+    ('target', 'status'),
+)
+CACHE_REQUESTS = _Counter(
+    'cache_requests_total', 'Shared cache lookups by key prefix.',
+    ('prefix', 'result'),
+    max_series=MAX_CACHE_PREFIXES * 2,
+)
+
+_ALL = (REQUEST_LATENCY, DB_QUERY_LATENCY, EXTERNAL_HTTP_LATENCY, CACHE_REQUESTS)
+
+
+def _reset_after_fork():
+    for metric in _ALL:
+        metric.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+def observe_db_query(seconds: float):
+    DB_QUERY_LATENCY.observe((_current_route.get(),), seconds)
+
+
+def http_target(url: str) -> str:
+    host = (urlsplit(url).hostname or '').lower()
+    for suffix, target in HTTP_TARGETS:
+        if host == suffix or host.endswith('.' + suffix):
+            return target
+    return 'other'
+
+
+def observe_http(url: str, status, seconds: float):
+    EXTERNAL_HTTP_LATENCY.observe((http_target(url), str(status)), seconds)
+
+
+def cache_key_prefix(key: str) -> str:
+    """Low-cardinality label for a cache key.
+
+    View caches ('view//api/games/nba?...') keep their first two path
+    segments; other keys ('nba_trends:1a2b', 'blog_post_<slug>') drop their
+    trailing variable part.
+    """
+    key = str(key)
+    if key.startswith('view/'):
+        path = key[len('view/'):].split('?', 1)[0]
+        return 'view:' + '/'.join(path.split('/')[:3])
+    if ':' in key:
+        return key.split(':', 1)[0]
+    return key.rsplit('_', 1)[0]
+
+
+def record_cache(key: str, hit: bool):
+    result = 'hit' if hit else 'miss'
+    CACHE_REQUESTS.inc((cache_key_prefix(key), result), overflow=('other', result))
+
+
+# ---------------------------------------------------------------------------
+# Wiring
+# ---------------------------------------------------------------------------
+
+def instrument_requests():
+    """Time every call made through the ``requests`` library (idempotent)."""
+    import requests
+
+    send = requests.Session.send
+    if getattr(send, '_metrics_wrapped', False):
+        return
+
+    def timed_send(self, prepared, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = send(self, prepared, **kwargs)
+        except Exception:
+            observe_http(prepared.url, 'error', time.perf_counter() - start)
+            raise
+        observe_http(prepared.url, response.status_code, time.perf_counter() - start)
+        return response
+
+    timed_send._metrics_wrapped = True
+    requests.Session.send = timed_send
+
+
+def init_metrics(app):
+    """Record per-route latency for ``app`` and time outbound HTTP calls."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+        g._metrics_token = _current_route.set(request.endpoint or 'unmatched')
+
+    def _record(status):
+        start = g.pop('_metrics_start', None)
+        if start is None:
+            return
+        REQUEST_LATENCY.observe(
+            (request.blueprint or 'app', request.endpoint or 'unmatched', request.method, str(status)),
+            time.perf_counter() - start,
+        )
+
+    @app.after_request
+    def _record_request(response):
+        _record(response.status_code)
+        return response
+
+    @app.teardown_request
+    def _finish_request(exc):
+        # Only still pending when an unhandled exception skipped after_request
+        _record(500)
+        token = g.pop('_metrics_token', None)
+        if token is not None:
+            _current_route.reset(token)
+
+    instrument_requests()
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+def _pool_lines():
+    from db import pool_stats
+
+    stats = pool_stats()
+    gauges = ('size', 'checked_out', 'overflow', 'idle', 'in_use')
+    counters = ('connects', 'checkouts', 'timeouts', 'wait_seconds_total', 'usage_seconds_total')
+    for field in gauges + counters + ('wait_seconds_max', 'usage_seconds_max'):
+        counter = field in counters
+        name = f'db_pool_{field}' + ('_total' if counter and not field.endswith('_total') else '')
+        yield f'# TYPE {name} {"counter" if counter else "gauge"}'
+        for pool, snapshot in sorted(stats.items()):
+            yield f'{name}{_format_labels(("pool",), (pool,))} {snapshot[field]}'
+
+
+def render() -> str:
+    """Every metric in Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in _ALL:
+        lines.extend(metric.render())
+    lines.extend(_pool_lines())
+    return '\n'.join(lines) + '\n'
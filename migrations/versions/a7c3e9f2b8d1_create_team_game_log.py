@@ -0,0 +1,63 @@
+"""create team_game_log
+
+Team-perspective copy of every *_games table (one row per team per game),
+backfilled here and kept current by the seed jobs via team_game_log.py.
+Also merges the blog-category and international-soccer heads.
+
+Revision ID: a7c3e9f2b8d1
+Revises: 5c9d3e2f1a0b, d1e2f3a4b5c6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from team_game_log import SOURCES, rebuild_team_game_log
+
+revision: str = 'a7c3e9f2b8d1'
+down_revision: Union[str, Sequence[str], None] = ('5c9d3e2f1a0b', 'd1e2f3a4b5c6')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'team_game_log',
+        sa.Column('sport', sa.String(length=20), nullable=False),
+        sa.Column('game_id', sa.Integer(), nullable=False),
+        sa.Column('side', sa.String(length=4), nullable=False),
+        sa.Column('game_date', sa.Date(), nullable=False),
+        sa.Column('start_time', sa.Time(), nullable=True),
+        sa.Column('league', sa.String(length=100), nullable=True),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('team_name', sa.String(length=100), nullable=False),
+        sa.Column('opponent_id', sa.Integer(), nullable=False),
+        sa.Column('opponent_name', sa.String(length=100), nullable=False),
+        sa.Column('scored', sa.Integer(), nullable=True),
+        sa.Column('allowed', sa.Integer(), nullable=True),
+        sa.Column('line', sa.Float(), nullable=True),
+        sa.Column('total', sa.Float(), nullable=True),
+        sa.Column('money_line', sa.Float(), nullable=True),
+        sa.Column('opponent_money_line', sa.Float(), nullable=True),
+        sa.Column('draw_money_line', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('sport', 'game_id', 'side'),
+        sa.CheckConstraint("side IN ('home', 'away')", name='ck_team_game_log_side'),
+    )
+
+    bind = op.get_bind()
+    for sport in SOURCES:
+        rebuild_team_game_log(bind, sport)
+
+    # Built after the backfill so the bulk insert doesn't maintain them row by row
+    op.create_index('ix_team_game_log_team_id_date', 'team_game_log',
+                    ['sport', 'team_id', sa.text('game_date DESC')])
+    op.create_index('ix_team_game_log_team_name_date', 'team_game_log',
+                    ['sport', 'team_name', sa.text('game_date DESC')])
+    op.execute('ANALYZE team_game_log')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_team_game_log_team_name_date', table_name='team_game_log')
+    op.drop_index('ix_team_game_log_team_id_date', table_name='team_game_log')
+    op.drop_table('team_game_log')
@@ -0,0 +1,48 @@
+"""add unordered team-pair indexes to the games tables
+
+Head-to-head lookups match a matchup at either venue through
+(LEAST(home_team_id, away_team_id), GREATEST(home_team_id, away_team_id)),
+newest first; these expression indexes serve that as a single range scan.
+
+Revision ID: b8d4f0a3c9e2
+Revises: a7c3e9f2b8d1
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'b8d4f0a3c9e2'
+down_revision: Union[str, None] = 'a7c3e9f2b8d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GAMES_TABLES = (
+    'mlb_games',
+    'nba_games_1',
+    'nfl_games',
+    'ncaaf_games',
+    'ncaab_games',
+    'nhl_games',
+    'soccer_games',
+    'international_soccer_games',
+)
+
+
+def upgrade() -> None:
+    for table in GAMES_TABLES:
+        op.create_index(
+            f'ix_{table}_team_pair',
+            table,
+            [
+                sa.text('LEAST(home_team_id, away_team_id)'),
+                sa.text('GREATEST(home_team_id, away_team_id)'),
+                sa.text('game_date DESC'),
+            ],
+        )
+
+
+def downgrade() -> None:
+    for table in GAMES_TABLES:
+        op.drop_index(f'ix_{table}_team_pair', table_name=table)
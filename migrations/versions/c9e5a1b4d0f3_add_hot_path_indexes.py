@@ -0,0 +1,65 @@
+"""add covering and partial indexes for hot read paths
+
+- nba_player_props (player_id, game_date DESC, id DESC): the exact order of
+  get_last_n_player_props and its ROW_NUMBER() batch twin, so the top N per
+  player is read straight off the index. Supersedes the (player_id,
+  game_date) index, which is its prefix.
+- mlb_batter_props (game_date, player_id) INCLUDE (player_team_name)
+  WHERE did_not_play IS NOT TRUE: MLBPlayerTrendsService's 45-day window
+  and team filter without touching rows for players who sat.
+- blog_posts (published_at DESC) INCLUDE (slug) WHERE status = 'published':
+  the blog index and the sitemap slug list (index-only for the latter);
+  (category, published_at DESC) WHERE status = 'published' for the
+  category pages.
+
+mlb_games.odds_event_id and blog_posts.slug are already unique, so their
+lookups are covered by the constraint indexes.
+
+Revision ID: c9e5a1b4d0f3
+Revises: b8d4f0a3c9e2
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'c9e5a1b4d0f3'
+down_revision: Union[str, None] = 'b8d4f0a3c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_player_props_player_date_id', 'nba_player_props',
+        ['player_id', sa.text('game_date DESC'), sa.text('id DESC')],
+    )
+    op.drop_index('ix_player_props_player_game_date', table_name='nba_player_props')
+
+    op.create_index(
+        'ix_mlb_batter_props_played_game_date', 'mlb_batter_props',
+        ['game_date', 'player_id'],
+        postgresql_include=['player_team_name'],
+        postgresql_where=sa.text('did_not_play IS NOT TRUE'),
+    )
+
+    op.create_index(
+        'idx_blog_posts_published', 'blog_posts',
+        [sa.text('published_at DESC')],
+        postgresql_include=['slug'],
+        postgresql_where=sa.text("status = 'published'"),
+    )
+    op.create_index(
+        'idx_blog_posts_published_category', 'blog_posts',
+        ['category', sa.text('published_at DESC')],
+        postgresql_where=sa.text("status = 'published'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_blog_posts_published_category', table_name='blog_posts')
+    op.drop_index('idx_blog_posts_published', table_name='blog_posts')
+    op.drop_index('ix_mlb_batter_props_played_game_date', table_name='mlb_batter_props')
+    op.create_index('ix_player_props_player_game_date', 'nba_player_props', ['player_id', 'game_date'])
+    op.drop_index('ix_player_props_player_date_id', table_name='nba_player_props')
@@ -0,0 +1,44 @@
+"""add (game_date, game_id) keyset indexes to the games tables
+
+The historical games endpoints page newest-first on (game_date, game_id)
+with a row comparison against the previous page's last game; this index
+lets every page, however deep, start with a single index seek.
+
+Revision ID: d0f6a2c5e1b4
+Revises: c9e5a1b4d0f3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'd0f6a2c5e1b4'
+down_revision: Union[str, None] = 'c9e5a1b4d0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GAMES_TABLES = (
+    'mlb_games',
+    'nba_games_1',
+    'nfl_games',
+    'ncaaf_games',
+    'ncaab_games',
+    'nhl_games',
+    'soccer_games',
+    'international_soccer_games',
+)
+
+
+def upgrade() -> None:
+    for table in GAMES_TABLES:
+        op.create_index(
+            f'ix_{table}_date_id',
+            table,
+            [sa.text('game_date DESC'), sa.text('game_id DESC')],
+        )
+
+
+def downgrade() -> None:
+    for table in GAMES_TABLES:
+        op.drop_index(f'ix_{table}_date_id', table_name=table)
@@ -0,0 +1,36 @@
+"""create import_checkpoints
+
+Completed units of the historical backfills, one row per (job, date, event),
+so a crashed or interrupted range resumes where it stopped; see
+import_checkpoints.py.
+
+Revision ID: e1a7b3d6f2c5
+Revises: d0f6a2c5e1b4
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'e1a7b3d6f2c5'
+down_revision: Union[str, None] = 'd0f6a2c5e1b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'import_checkpoints',
+        sa.Column('job', sa.String(length=50), nullable=False),
+        sa.Column('unit_date', sa.Date(), nullable=False),
+        # '' marks the whole date as done
+        sa.Column('event_id', sa.String(length=100), nullable=False, server_default=''),
+        sa.Column('records', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('job', 'unit_date', 'event_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('import_checkpoints')
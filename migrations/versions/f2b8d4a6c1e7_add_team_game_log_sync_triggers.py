@@ -0,0 +1,37 @@
+"""add team_game_log sync triggers
+
+Keeps team_game_log in sync with every *_games table from the database, so
+games seeded by data migrations and one-off scripts (which never called
+sync_team_game_log) reach the trends too; see team_game_log.py. Rebuilds the
+log once to pick up anything written that way since it was created.
+
+Revision ID: f2b8d4a6c1e7
+Revises: e1a7b3d6f2c5
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+from team_game_log import SOURCES, drop_sync_trigger_statements, rebuild_team_game_log, sync_trigger_statements
+
+revision: str = 'f2b8d4a6c1e7'
+down_revision: Union[str, None] = 'e1a7b3d6f2c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for sport in SOURCES:
+        for statement in sync_trigger_statements(sport):
+            op.execute(statement)
+
+    bind = op.get_bind()
+    for sport in SOURCES:
+        rebuild_team_game_log(bind, sport)
+
+
+def downgrade() -> None:
+    for sport in SOURCES:
+        for statement in drop_sync_trigger_statements(sport):
+            op.execute(statement)
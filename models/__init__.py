@@ -12,5 +12,6 @@ from .mlb_pitcher_prop import MLBPitcherProp
 from .mlb_game import MLBGame
 from .team import Team
 from .blog_post import BlogPost
+from .team_game_log import TeamGameLog
 
-__all__ = ['NBA_Game', 'NBAPlayer', 'NBAPlayerAlias', 'NBAPlayerNameMismatch', 'NBAPlayerProp', 'MLBPlayer', 'MLBPlayerAlias', 'MLBPlayerNameMismatch', 'MLBBatterProp', 'MLBPitcherProp', 'MLBGame', 'Team', 'BlogPost']
\ No newline at end of file
+__all__ = ['NBA_Game', 'NBAPlayer', 'NBAPlayerAlias', 'NBAPlayerNameMismatch', 'NBAPlayerProp', 'MLBPlayer', 'MLBPlayerAlias', 'MLBPlayerNameMismatch', 'MLBBatterProp', 'MLBPitcherProp', 'MLBGame', 'Team', 'BlogPost', 'TeamGameLog']
\ No newline at end of file
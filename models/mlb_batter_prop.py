@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Numeric, Boolean, Date, DateTime, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from .base import Base
 
 
@@ -63,4 +63,7 @@ class MLBBatterProp(Base):
         UniqueConstraint('player_id', 'odds_event_id', name='uq_mlb_batter_props_player_odds_event'),
         Index('idx_mlb_batter_props_game_date_normalized_name', 'game_date', 'normalized_name'),
         Index('ix_mlb_batter_props_player_game_date', 'player_id', 'game_date'),
+        Index('ix_mlb_batter_props_played_game_date', 'game_date', 'player_id',
+              postgresql_include=['player_team_name'],
+              postgresql_where=text('did_not_play IS NOT TRUE')),
     )
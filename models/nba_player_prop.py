@@ -59,5 +59,5 @@ class NBAPlayerProp(Base):
     __table_args__ = (
         UniqueConstraint('player_id', 'odds_event_id', name='uq_player_props_player_odds_event'),
         Index('idx_nba_player_props_game_date_normalized_name', 'game_date', 'normalized_name'),
-        Index('ix_player_props_player_game_date', 'player_id', 'game_date'),
+        Index('ix_player_props_player_date_id', 'player_id', game_date.desc(), id.desc()),
     )
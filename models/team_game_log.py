@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Time, Index, PrimaryKeyConstraint, CheckConstraint
+from .base import Base
+
+
+class TeamGameLog(Base):
+    __tablename__ = 'team_game_log'
+
+    sport = Column(String(20), nullable=False)
+    game_id = Column(Integer, nullable=False)
+    side = Column(String(4), nullable=False)  # 'home' or 'away'
+    game_date = Column(Date, nullable=False)
+    start_time = Column(Time)
+    league = Column(String(100))
+    team_id = Column(Integer, nullable=False)
+    team_name = Column(String(100), nullable=False)
+    opponent_id = Column(Integer, nullable=False)
+    opponent_name = Column(String(100), nullable=False)
+    scored = Column(Integer)
+    allowed = Column(Integer)
+    line = Column(Float)
+    total = Column(Float)
+    money_line = Column(Float)
+    opponent_money_line = Column(Float)
+    draw_money_line = Column(Float)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('sport', 'game_id', 'side'),
+        CheckConstraint("side IN ('home', 'away')", name='ck_team_game_log_side'),
+        Index('ix_team_game_log_team_id_date', 'sport', 'team_id', game_date.desc()),
+        Index('ix_team_game_log_team_name_date', 'sport', 'team_name', game_date.desc()),
+    )
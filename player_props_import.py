@@ -0,0 +1,191 @@
+# player_props_import.py - Batched writes for the historical player odds imports
+"""Resolve and write one event's player props in a handful of statements.
+
+The historical odds imports (jobs/nba_historical_player_odds_import.py and
+jobs/mlb_historical_player_odds_import.py) receive a few hundred props per
+event. Instead of resolving and writing them one at a time, they:
+
+    resolve_players(...)   every player name in the event, three queries total
+                           (aliases, then players, then one insert for new ones)
+    upsert_props(...)      every prop row for one props table in a single
+                           INSERT ... ON CONFLICT (player_id, odds_event_id)
+                           DO UPDATE through execute_values
+
+Both take the job's SQLAlchemy connection and run on its DBAPI connection, so
+they share the job's transaction (and any savepoint around the event).
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+# Columns written for every prop row besides its stat columns
+PROP_COLUMNS = (
+    'player_id', 'normalized_name', 'odds_event_id', 'game_date', 'bookmaker', 'odds_source',
+    'odds_home_team', 'odds_away_team', 'odds_home_team_id', 'odds_away_team_id',
+)
+# Refreshed from the incoming row when a prop already exists
+REFRESHED_COLUMNS = (
+    'normalized_name', 'odds_home_team', 'odds_away_team', 'odds_home_team_id', 'odds_away_team_id',
+)
+
+
+def _cursor(conn):
+    """DBAPI cursor on a SQLAlchemy connection's underlying psycopg2 connection."""
+    return conn.connection.cursor()
+
+
+def resolve_players(
+    conn,
+    players_table: str,
+    aliases_table: str,
+    names: Dict[str, Tuple[str, date]],
+) -> Dict[str, int]:
+    """
+    Map normalized player names to player ids, creating players as needed.
+
+    ``names`` maps each normalized name to (name as the Odds API spells it,
+    game date). Same rules as resolving one name at a time: the newest alias
+    wins, then a player with that normalized name (recording an odds_api
+    alias for it), otherwise a new player plus its alias.
+    """
+    if not names:
+        return {}
+    cur = _cursor(conn)
+    try:
+        wanted = list(names)
+        cur.execute(f"""
+            SELECT DISTINCT ON (normalized_name) normalized_name, player_id
+            FROM {aliases_table}
+            WHERE normalized_name = ANY(%s)
+            ORDER BY normalized_name, created_at DESC
+        """, (wanted,))
+        resolved = dict(cur.fetchall())
+        by_alias = len(resolved)
+
+        missing = [n for n in wanted if n not in resolved]
+        found_by_name = {}
+        if missing:
+            cur.execute(f"""
+                SELECT DISTINCT ON (normalized_name) normalized_name, id
+                FROM {players_table}
+                WHERE normalized_name = ANY(%s)
+                ORDER BY normalized_name, id
+            """, (missing,))
+            found_by_name = dict(cur.fetchall())
+            resolved.update(found_by_name)
+
+        new_names = [n for n in wanted if n not in resolved]
+        if new_names:
+            created = execute_values(
+                cur,
+                f"""
+                INSERT INTO {players_table} (player_name, normalized_name, first_seen_date, last_seen_date, created_at, updated_at)
+                VALUES %s
+                RETURNING normalized_name, id
+                """,
+                [(names[n][0], n, names[n][1], names[n][1]) for n in new_names],
+                template='(%s, %s, %s, %s, NOW(), NOW())',
+                fetch=True,
+            )
+            for normalized, player_id in created:
+                resolved[normalized] = player_id
+                print(f"    ➕ Created new player: {names[normalized][0]} (ID: {player_id})")
+
+        new_aliases = [n for n in wanted if n in found_by_name or n in new_names]
+        if new_aliases:
+            execute_values(
+                cur,
+                f"""
+                INSERT INTO {aliases_table} (player_id, source, source_name, normalized_name, created_at)
+                VALUES %s
+                ON CONFLICT (source, normalized_name) DO NOTHING
+                """,
+                [(resolved[n], names[n][0], n) for n in new_aliases],
+                template="(%s, 'odds_api', %s, %s, NOW())",
+            )
+    finally:
+        cur.close()
+
+    print(f"    Players: {by_alias} by alias, {len(found_by_name)} by name, {len(new_names)} new")
+    return resolved
+
+
+def upsert_props(
+    conn,
+    table: str,
+    players_table: str,
+    rows: List[Dict],
+    stat_groups: Sequence[Tuple[str, str, str]],
+    insert_only: Optional[Dict[str, object]] = None,
+) -> Tuple[int, int]:
+    """
+    Write ``rows`` into ``table`` with one INSERT ... ON CONFLICT DO UPDATE.
+
+    Each row has the PROP_COLUMNS (normalized_name is filled in from
+    ``players_table``) plus the (line, over, under) columns of the stat groups
+    it carries; rows must be unique on (player_id, odds_event_id). On conflict
+    a stat group is only overwritten when the row carries its line, so props
+    for other markets already on the row are kept. ``insert_only`` columns are
+    set on new rows only. Returns (inserted, updated).
+    """
+    if not rows:
+        return 0, 0
+    insert_only = insert_only or {}
+    stat_columns = [c for group in stat_groups for c in group]
+
+    cur = _cursor(conn)
+    try:
+        cur.execute(
+            f"SELECT id, normalized_name FROM {players_table} WHERE id = ANY(%s)",
+            (list({row['player_id'] for row in rows}),),
+        )
+        normalized_names = dict(cur.fetchall())
+
+        columns = [*PROP_COLUMNS, *insert_only, *stat_columns]
+        updates = [f'{c} = EXCLUDED.{c}' for c in REFRESHED_COLUMNS]
+        for line_col, *price_cols in stat_groups:
+            for c in (line_col, *price_cols):
+                updates.append(f'{c} = CASE WHEN EXCLUDED.{line_col} IS NOT NULL THEN EXCLUDED.{c} ELSE t.{c} END')
+        updates.append('updated_at = NOW()')
+
+        values = []
+        for row in rows:
+            row = {**row, 'normalized_name': normalized_names.get(row['player_id']), **insert_only}
+            values.append(tuple(row.get(c) for c in columns))
+
+        results = execute_values(
+            cur,
+            f"""
+            INSERT INTO {table} AS t ({', '.join(columns)})
+            VALUES %s
+            ON CONFLICT (player_id, odds_event_id) DO UPDATE SET
+                {', '.join(updates)}
+            RETURNING (xmax = 0) AS inserted
+            """,
+            values,
+            page_size=1000,
+            fetch=True,
+        )
+    finally:
+        cur.close()
+
+    inserted = sum(1 for (was_inserted,) in results if was_inserted)
+    return inserted, len(results) - inserted
+
+
+def merge_prop_rows(props: Iterable[Tuple[Tuple, Dict]]) -> List[Dict]:
+    """
+    Fold (key, row) pairs into one row per key, later stat columns winning.
+
+    An event lists each market separately, but a player has a single row per
+    event, and ON CONFLICT cannot touch the same row twice in one statement.
+    """
+    merged: Dict[Tuple, Dict] = {}
+    for key, row in props:
+        if key in merged:
+            merged[key].update(row)
+        else:
+            merged[key] = dict(row)
+    return list(merged.values())
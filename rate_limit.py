@@ -0,0 +1,172 @@
+# rate_limit.py - Paced HTTP for the historical backfill jobs
+"""Token-bucket rate limiting and a bounded fetch pool for the import jobs.
+
+The historical imports used to pace themselves with fixed sleeps (3s between
+events, 5s between dates, 0.2s after every ESPN call). Instead, every request
+to an upstream API now goes through that API's shared client:
+
+    ODDS_API.get(url, ...)   the-odds-api.com   (ODDS_API_RATE / ODDS_API_BURST)
+    ESPN.get(url, ...)       site.api.espn.com  (ESPN_RATE / ESPN_BURST)
+
+Each client holds a token bucket that every thread draws from, so requests
+go out as fast as the configured rate allows no matter how many workers are
+fetching. A 429 halves the rate and pauses the whole bucket (for Retry-After
+when the API sends one); successful responses then walk the rate back up to
+the configured ceiling.
+
+prefetch() runs the per-date fetch of a backfill on a bounded thread pool
+while the caller writes finished dates on its own connection, in order.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Dates fetched ahead of the writer by the backfills (--workers overrides it)
+DEFAULT_WORKERS = int(os.getenv('HISTORICAL_IMPORT_WORKERS', '4'))
+
+_END = object()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with multiplicative backoff.
+
+    ``rate`` tokens per second are added up to ``burst``; acquire() blocks
+    until one is available. backoff() halves the current rate (down to
+    ``min_rate``) and holds every caller until the pause has passed;
+    recover() adds back a tenth of the ceiling per call.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + pause)
+            self._tokens = 0
+            self._updated = now
+
+    def recover(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get('Retry-After')
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to the bucket's own pause
+
+
+class RateLimitedClient:
+    """
+    requests.Session shared by every worker, paced by one TokenBucket.
+
+    get() takes the same arguments as requests.get. A 429 backs the bucket
+    off and the request is retried, up to ``max_retries`` times; after that
+    the 429 response is returned for the caller's raise_for_status().
+    """
+
+    def __init__(self, name: str, rate: float, burst: Optional[float] = None, max_retries: int = 5):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            response = self.session.get(url, **kwargs)
+            if response.status_code != 429:
+                self.bucket.recover()
+                return response
+            if attempt < self.max_retries:
+                retry_after = _retry_after(response)
+                self.bucket.backoff(retry_after)
+                print(f"      ⏳ {self.name} rate limited (429), now {self.bucket.rate:.2f} req/s"
+                      + (f", retrying after {retry_after:g}s" if retry_after is not None else ""))
+        return response
+
+
+ODDS_API = RateLimitedClient(
+    'odds_api',
+    rate=float(os.getenv('ODDS_API_RATE', '5')),
+    burst=float(os.getenv('ODDS_API_BURST', '5')),
+)
+ESPN = RateLimitedClient(
+    'espn',
+    rate=float(os.getenv('ESPN_RATE', '10')),
+    burst=float(os.getenv('ESPN_BURST', '10')),
+)
+
+
+def prefetch(fn: Callable[[T], R], items: Iterable[T], workers: Optional[int] = None) -> Iterator[Tuple[T, 'Future[R]']]:
+    """
+    Run ``fn`` over ``items`` on a pool of ``workers`` threads, yielding
+    (item, future) in input order.
+
+    At most ``workers`` items are in flight, so a long range is not fetched
+    far ahead of the consumer; future.result() re-raises fn's exception.
+    """
+    workers = max(1, workers or DEFAULT_WORKERS)
+    items = iter(items)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+    try:
+        pending = deque()
+        for item in items:
+            pending.append((item, pool.submit(fn, item)))
+            if len(pending) >= workers:
+                break
+        while pending:
+            item, future = pending.popleft()
+            nxt = next(items, _END)
+            if nxt is not _END:
+                pending.append((nxt, pool.submit(fn, nxt)))
+            yield item, future
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
@@ -0,0 +1,290 @@
+# sitemaps.py - Background-built, pre-gzipped sitemap files
+"""Build the sitemap off the request path and serve it from cache.
+
+/sitemap.xml is a sitemap index pointing at one file per section:
+
+    /sitemap-pages.xml      home, daily sport and trends pages, static pages
+    /sitemap-teams.xml      every team page
+    /sitemap-matchups.xml   today's and tomorrow's game-details pages (Odds API)
+    /sitemap-blog.xml       published blog posts, lastmod from the post itself
+
+The first sitemap request a worker serves starts its builder thread, which
+wakes up once a minute and, when the stored files are older than
+SITEMAP_REFRESH_SECONDS, takes a lock in the shared cache so only one worker
+rebuilds them. A section whose source fails (Odds API, database) keeps its
+previous build instead of being published empty. The files are stored gzipped in the
+shared cache (and in-process, for when caching is disabled), so a crawler hit
+costs a cache read and no Odds API credits or database queries. Only a cold
+cache (first deploy, /clear-cache) builds inline on the request.
+"""
+
+import gzip
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pytz
+
+from cache import cache
+from api.utils.team_slugs import team_slug, SPORT_TEAMS
+from api.external_requests.odds_api import get_odds_snapshot
+
+logger = logging.getLogger(__name__)
+
+SITE_URL = 'https://www.getstam.com'
+SECTIONS = ('pages', 'teams', 'matchups', 'blog')
+INDEX = 'index'
+
+SITEMAP_REFRESH_SECONDS = int(os.getenv('SITEMAP_REFRESH_SECONDS', '3600'))
+_CHECK_INTERVAL = 60
+_CACHE_KEY = 'sitemap:files'
+_LOCK_KEY = 'sitemap:build_lock'
+# Released when the build finishes; the timeout only covers a worker dying mid-build
+_LOCK_TIMEOUT = 600
+
+eastern_tz = pytz.timezone('US/Eastern')
+
+_DAILY_SPORTS = [
+    ('nba', '0.9'), ('mlb', '0.9'), ('nfl', '0.9'), ('nhl', '0.9'),
+    ('ncaaf', '0.8'), ('ncaab', '0.8'), ('epl', '0.8'), ('laliga', '0.8'),
+    ('bundesliga', '0.8'), ('ligue1', '0.8'), ('seriea', '0.8'),
+]
+_DAILY_TRENDS = [
+    ('nba', '0.8'), ('mlb', '0.8'), ('nfl', '0.8'), ('nhl', '0.8'),
+    ('ncaaf', '0.7'), ('ncaab', '0.7'), ('epl', '0.7'), ('laliga', '0.7'),
+    ('bundesliga', '0.7'), ('ligue1', '0.7'), ('seriea', '0.7'),
+]
+# (path, changefreq, priority, lastmod); None lastmod means the build date
+_STATIC_PAGES = [
+    ('/',               'daily',   '1.0', None),
+    ('/about-us',       'monthly', '0.5', '2025-01-01'),
+    ('/betting-guide',  'monthly', '0.6', '2025-01-01'),
+    ('/contact-us',     'monthly', '0.4', '2025-01-01'),
+    ('/privacy-policy', 'yearly',  '0.3', '2025-01-01'),
+    ('/blog',           'weekly',  '0.7', None),
+]
+_TEAM_PAGE_PRIORITY = {'nba': '0.7', 'nfl': '0.7', 'mlb': '0.7', 'nhl': '0.7', 'ncaaf': '0.6', 'ncaab': '0.6'}
+_MATCHUP_SPORT_KEYS = {
+    'nba': 'basketball_nba', 'nfl': 'americanfootball_nfl', 'mlb': 'baseball_mlb',
+    'nhl': 'icehockey_nhl', 'ncaaf': 'americanfootball_ncaaf', 'ncaab': 'basketball_ncaab',
+}
+
+# (path, lastmod 'YYYY-MM-DD', changefreq, priority)
+Entry = Tuple[str, str, str, str]
+
+
+class SitemapFiles(NamedTuple):
+    built_at: float               # time.time() of the build
+    files: Dict[str, bytes]       # INDEX / section -> gzipped XML
+    lastmods: Dict[str, str]      # section -> its lastmod in the index
+
+
+class SectionUnavailable(Exception):
+    """A section's source failed; ``entries`` holds whatever was collected."""
+
+    def __init__(self, message: str, entries: List['Entry']):
+        super().__init__(message)
+        self.entries = entries
+
+
+_latest: Optional[SitemapFiles] = None
+_build_lock = threading.Lock()
+_start_lock = threading.Lock()
+_builder_started = False
+
+
+# -- sections -----------------------------------------------------------------
+
+def _page_entries(today: str) -> List[Entry]:
+    entries = [(f'/{sport}', today, 'daily', priority) for sport, priority in _DAILY_SPORTS]
+    entries += [(f'/{sport}/trends', today, 'daily', priority) for sport, priority in _DAILY_TRENDS]
+    entries += [(path, lastmod or today, changefreq, priority) for path, changefreq, priority, lastmod in _STATIC_PAGES]
+    return entries
+
+
+def _team_entries(today: str) -> List[Entry]:
+    return [
+        (f'/team/{sport}/{team_slug(team)}', today, 'weekly', _TEAM_PAGE_PRIORITY.get(sport, '0.6'))
+        for sport, teams in SPORT_TEAMS.items()
+        for team in teams
+    ]
+
+
+def _matchup_entries(today: str) -> List[Entry]:
+    """Today + tomorrow only, for the 6 sports with team-slug infrastructure.
+
+    Doubleheader "-2" URLs are intentionally omitted (low value; still reachable via
+    internal links, just not proactively submitted).
+    """
+    tomorrow = (datetime.strptime(today, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    entries, failed = [], []
+    for date_str in (today, tomorrow):
+        day_start = eastern_tz.localize(datetime.strptime(date_str, '%Y-%m-%d'))
+        for sport, sport_key in _MATCHUP_SPORT_KEYS.items():
+            try:
+                # None means the Odds API fetch failed (no games is an empty snapshot)
+                snapshot = get_odds_snapshot(sport_key, day_start)
+                if snapshot is None:
+                    failed.append(f'{sport} {date_str}')
+                    continue
+                for g in snapshot.games_on(day_start.date()):
+                    away_slug = team_slug(g.get('away_team', 'N/A'))
+                    home_slug = team_slug(g.get('home_team', 'N/A'))
+                    entries.append((f'/game-details/{sport}/{away_slug}-vs-{home_slug}-{date_str}', today, 'hourly', '0.75'))
+            except Exception as e:
+                logger.warning("Sitemap matchups for %s %s failed: %s", sport, date_str, e)
+                failed.append(f'{sport} {date_str}')
+    if failed:
+        raise SectionUnavailable(f"odds fetch failed for {', '.join(failed)}", entries)
+    return entries
+
+
+def _blog_entries(today: str) -> List[Entry]:
+    from api.services.blog_service import BlogService
+    posts, err = BlogService.get_published_sitemap_entries()
+    if err:
+        raise SectionUnavailable(f"published posts query failed: {err}", [])
+    return [
+        (f'/blog/{slug}', last_modified.strftime('%Y-%m-%d') if last_modified else today, 'monthly', '0.6')
+        for slug, last_modified in posts
+    ]
+
+
+_SECTION_BUILDERS = {
+    'pages': _page_entries,
+    'teams': _team_entries,
+    'matchups': _matchup_entries,
+    'blog': _blog_entries,
+}
+
+
+# -- XML ----------------------------------------------------------------------
+
+def _urlset(entries: Iterable[Entry]) -> str:
+    urls = [
+        f'  <url><loc>{SITE_URL}{path}</loc><lastmod>{lastmod}</lastmod>'
+        f'<changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>'
+        for path, lastmod, changefreq, priority in entries
+    ]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        + '\n'.join(urls)
+        + '\n</urlset>'
+    )
+
+
+def _sitemap_index(lastmods: Dict[str, str]) -> str:
+    sitemaps = [
+        f'  <sitemap><loc>{SITE_URL}/sitemap-{section}.xml</loc><lastmod>{lastmod}</lastmod></sitemap>'
+        for section, lastmod in lastmods.items()
+    ]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        + '\n'.join(sitemaps)
+        + '\n</sitemapindex>'
+    )
+
+
+def build_sitemap_files(previous: Optional[SitemapFiles] = None) -> SitemapFiles:
+    """
+    Build every section and the index, gzipped.
+
+    A section that raises SectionUnavailable keeps its file from ``previous``;
+    with no previous build it is published with the entries it did collect.
+    """
+    started = time.time()
+    today = datetime.now(eastern_tz).strftime('%Y-%m-%d')
+    files, lastmods = {}, {}
+    for section in SECTIONS:
+        try:
+            entries = _SECTION_BUILDERS[section](today)
+        except SectionUnavailable as e:
+            if previous is not None and section in previous.files:
+                logger.warning("Sitemap %s section kept from the last build: %s", section, e)
+                files[section] = previous.files[section]
+                lastmods[section] = previous.lastmods.get(section, today)
+                continue
+            logger.warning("Sitemap %s section is partial: %s", section, e)
+            entries = e.entries
+        files[section] = gzip.compress(_urlset(entries).encode('utf-8'))
+        # A section's lastmod is its newest page's (empty sections: the build date)
+        lastmods[section] = max((lastmod for _path, lastmod, _cf, _p in entries), default=today)
+    files[INDEX] = gzip.compress(_sitemap_index(lastmods).encode('utf-8'))
+    logger.info("Sitemap built in %.1fs: %s", time.time() - started,
+                ', '.join(f'{s} {len(files[s])}B' for s in SECTIONS))
+    return SitemapFiles(started, files, lastmods)
+
+
+# -- storage ------------------------------------------------------------------
+
+def _stored() -> Optional[SitemapFiles]:
+    stored = cache.get(_CACHE_KEY)
+    if stored is not None and len(stored) == len(SitemapFiles._fields):
+        return SitemapFiles(*stored)
+    return _latest
+
+
+def _store(built: SitemapFiles) -> None:
+    global _latest
+    _latest = built
+    # Kept well past the refresh interval so a stalled builder serves stale, not nothing
+    cache.set(_CACHE_KEY, tuple(built), timeout=max(SITEMAP_REFRESH_SECONDS * 24, 86400))
+
+
+def _is_stale(stored: Optional[SitemapFiles]) -> bool:
+    return stored is None or time.time() - stored.built_at >= SITEMAP_REFRESH_SECONDS
+
+
+def refresh_sitemap(force: bool = False) -> Optional[SitemapFiles]:
+    """Rebuild the stored files if stale and no other worker holds the build lock."""
+    stored = _stored()
+    if not force and not _is_stale(stored):
+        return stored
+    if not cache.add(_LOCK_KEY, os.getpid(), timeout=_LOCK_TIMEOUT):
+        return stored
+    try:
+        built = build_sitemap_files(stored)
+        _store(built)
+        return built
+    except Exception as e:
+        logger.error("Sitemap build failed: %s", e)
+        return stored
+    finally:
+        cache.delete(_LOCK_KEY)
+
+
+def get_sitemap_file(name: str) -> Optional[Tuple[bytes, float]]:
+    """(gzipped XML, built_at) for INDEX or a section; builds inline only on a cold cache."""
+    stored = _stored()
+    if stored is None:
+        with _build_lock:
+            stored = _stored()
+            if stored is None:
+                stored = build_sitemap_files()
+                _store(stored)
+    if name not in stored.files:
+        return None
+    return stored.files[name], stored.built_at
+
+
+def start_sitemap_builder(app) -> None:
+    """Start this worker's background builder thread (idempotent; called from the sitemap routes)."""
+    global _builder_started
+    with _start_lock:
+        if _builder_started:
+            return
+        _builder_started = True
+
+    def _run():
+        while True:
+            try:
+                with app.app_context():
+                    refresh_sitemap()
+            except Exception as e:
+                logger.error("Sitemap builder error: %s", e)
+            time.sleep(_CHECK_INTERVAL)
+
+    threading.Thread(target=_run, name='sitemap-builder', daemon=True).start()
@@ -0,0 +1,113 @@
+# ssr_shell.py - Precompiled index.html shell for the SSR meta routes
+"""Render the React shell with per-page meta tags without rescanning it.
+
+app.py serves getstam-react/build/index.html for every non-static path with
+that page's title, description, og tags, canonical link and JSON-LD filled
+in. ShellTemplate scans the file once at load and splits it into literal
+segments around the tags it rewrites:
+
+    <title>…</title>                          -> title
+    <meta name="description" …>               -> description
+    <meta property="og:title" …>              -> og_title
+    <meta property="og:description" …>        -> og_description
+    <meta property="og:image" …>              -> og_image
+    </head>                                   -> head_end (extra tags go first)
+
+so rendering a page is a single ''.join over segments and slot values.
+
+RenderedPageCache keeps finished pages in a per-process LRU keyed by
+(canonical path, hash of the meta), each with a strong ETag over its body, so
+the crawler re-requests of team and matchup pages skip rendering entirely and
+can be answered with a 304.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from metrics import record_cache
+
+# (slot, pattern) for the tags replaced in place, in the order they used to be
+# substituted; every occurrence of a tag becomes a slot.
+_SLOT_PATTERNS = (
+    ('title', re.compile(r'<title>[^<]*</title>')),
+    ('description', re.compile(r'<meta\s+name="description"\s+content="[^"]*"\s*/?>')),
+    ('og_title', re.compile(r'<meta\s+property="og:title"\s+content="[^"]*"\s*/?>')),
+    ('og_description', re.compile(r'<meta\s+property="og:description"\s+content="[^"]*"\s*/?>')),
+    ('og_image', re.compile(r'<meta\s+property="og:image"\s+content="[^"]*"\s*/?>')),
+)
+HEAD_END = '</head>'
+
+
+class ShellTemplate:
+    """index.html split into literal segments with named insertion points."""
+
+    def __init__(self, page_html: str):
+        spans: List[Tuple[int, int, str]] = []
+        for slot, pattern in _SLOT_PATTERNS:
+            spans.extend((m.start(), m.end(), slot) for m in pattern.finditer(page_html))
+        spans.sort()
+        head_end = page_html.find(HEAD_END)
+        if head_end != -1:
+            # Extra tags go right before </head>, which itself stays literal
+            spans.append((head_end, head_end, 'head_end'))
+            spans.sort()
+
+        self.segments: List[str] = []
+        self.slots: List[str] = []
+        pos = 0
+        for start, end, slot in spans:
+            self.segments.append(page_html[pos:start])
+            self.slots.append(slot)
+            pos = end
+        self.segments.append(page_html[pos:])
+
+    def render(self, values: Dict[str, str]) -> str:
+        parts = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            parts.append(values[slot])
+            parts.append(segment)
+        return ''.join(parts)
+
+
+class RenderedPage(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def meta_hash(meta: Dict) -> str:
+    return hashlib.sha1(json.dumps(meta, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class RenderedPageCache:
+    """Thread-safe LRU of rendered pages keyed by (canonical path, meta hash)."""
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._pages: 'OrderedDict[Tuple[str, str], RenderedPage]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[RenderedPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+        record_cache('ssr_page:', page is not None)
+        return page
+
+    def put(self, key: Tuple[str, str], body: str) -> RenderedPage:
+        data = body.encode('utf-8')
+        page = RenderedPage(data, hashlib.sha256(data).hexdigest()[:32])
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
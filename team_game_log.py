@@ -0,0 +1,187 @@
+# team_game_log.py - Team-perspective game log
+"""One row per team per game, for every sport.
+
+The ``*_games`` tables store a game once, from the home side. Anything that
+wants a team's history ("the Celtics' last 20 games") has to match the team on
+either side and then flip the columns for away games. ``team_game_log`` stores
+that flip once: each game appears twice, keyed by (sport, game_id, side), with
+the focal team's score, line and money line first.
+
+    (sport, team_id,   game_date DESC)   team history by id
+    (sport, team_name, game_date DESC)   team history by the stored name
+
+so "last N games for a team" is a single index range scan.
+
+The table is kept in sync by the database: statement-level triggers on every
+source table (see ``sync_trigger_statements``) upsert the log rows of inserted
+and updated games and delete those of deleted games, so games written by data
+migrations, one-off scripts or psql show up in team history like any other.
+The seed jobs also call ``sync_team_game_log(conn, sport)`` after inserting a
+day's games, which re-syncs the last SYNC_WINDOW_DAYS of the source table (and
+drops rows whose source game no longer exists) as a repair pass.
+
+``rebuild_team_game_log`` resyncs a whole sport; the migrations that create
+the table and its triggers run it to backfill anything already in place.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+# Days of source rows re-synced by each seed job run; covers late score/odds corrections
+SYNC_WINDOW_DAYS = 7
+
+# Source table per sport. Columns are home-side names; the away-side twin is
+# derived by swapping the home_/away_ prefix. None means the sport has no such column.
+SOURCES: Dict[str, Dict[str, Optional[str]]] = {
+    'mlb':         {'table': 'mlb_games',   'score': 'runs',   'line': 'line', 'total': 'total', 'start_time': 'start_time', 'league': None, 'draw_ml': None},
+    'nba':         {'table': 'nba_games_1', 'score': 'points', 'line': 'line', 'total': 'total', 'start_time': 'start_time', 'league': None, 'draw_ml': None},
+    'nfl':         {'table': 'nfl_games',   'score': 'points', 'line': 'line', 'total': 'total', 'start_time': 'start_time', 'league': None, 'draw_ml': None},
+    'ncaaf':       {'table': 'ncaaf_games', 'score': 'points', 'line': 'line', 'total': 'total', 'start_time': 'start_time', 'league': None, 'draw_ml': None},
+    'ncaab':       {'table': 'ncaab_games', 'score': 'points', 'line': 'line', 'total': 'total', 'start_time': 'start_time', 'league': None, 'draw_ml': None},
+    'nhl':         {'table': 'nhl_games',   'score': 'goals',  'line': None,   'total': 'total', 'start_time': None,         'league': None, 'draw_ml': None},
+    'soccer':      {'table': 'soccer_games',              'score': 'goals', 'line': 'spread', 'total': 'total_over_point', 'start_time': 'start_time', 'league': 'league', 'draw_ml': 'draw_money_line'},
+    'intl_soccer': {'table': 'international_soccer_games', 'score': 'goals', 'line': 'spread', 'total': 'total_over_point', 'start_time': 'start_time', 'league': 'league', 'draw_ml': 'draw_money_line'},
+}
+
+COLUMNS = (
+    'sport', 'game_id', 'side', 'game_date', 'start_time', 'league',
+    'team_id', 'team_name', 'opponent_id', 'opponent_name',
+    'scored', 'allowed', 'line', 'total',
+    'money_line', 'opponent_money_line', 'draw_money_line',
+)
+
+
+def _side_select(sport: str, side: str, source: Optional[str] = None) -> str:
+    """
+    SELECT producing the log rows for one side of every game in the sport's
+    table (filtered by the :since parameter), or of every row in ``source``
+    (a trigger's transition table) when given.
+    """
+    cfg = SOURCES[sport]
+    us, them = ('home', 'away') if side == 'home' else ('away', 'home')
+
+    def _or_null(column: Optional[str], cast: str) -> str:
+        return column if column else f'NULL::{cast}'
+
+    return f"""
+        SELECT '{sport}', game_id, '{side}', game_date,
+               {_or_null(cfg['start_time'], 'time')},
+               {_or_null(cfg['league'], 'varchar')},
+               {us}_team_id, {us}_team_name, {them}_team_id, {them}_team_name,
+               {us}_{cfg['score']}, {them}_{cfg['score']},
+               {_or_null(cfg['line'] and f"{us}_{cfg['line']}", 'float')},
+               {cfg['total']},
+               {us}_money_line, {them}_money_line,
+               {_or_null(cfg['draw_ml'], 'float')}
+        FROM {source or cfg['table']}
+        {'' if source else 'WHERE (CAST(:since AS date) IS NULL OR game_date >= :since)'}
+    """
+
+
+def _upsert_sql(sport: str, source: Optional[str] = None) -> str:
+    updates = ', '.join(f'{c} = EXCLUDED.{c}' for c in COLUMNS if c not in ('sport', 'game_id', 'side'))
+    return f"""
+        INSERT INTO team_game_log ({', '.join(COLUMNS)})
+        {_side_select(sport, 'home', source)}
+        UNION ALL
+        {_side_select(sport, 'away', source)}
+        ON CONFLICT (sport, game_id, side) DO UPDATE SET {updates}
+    """
+
+
+def _prune_sql(sport: str) -> str:
+    return f"""
+        DELETE FROM team_game_log t
+        WHERE t.sport = '{sport}'
+          AND (CAST(:since AS date) IS NULL OR t.game_date >= :since)
+          AND NOT EXISTS (SELECT 1 FROM {SOURCES[sport]['table']} g WHERE g.game_id = t.game_id)
+    """
+
+
+def _sync(conn, sport: str, since: Optional[date]) -> int:
+    if sport not in SOURCES:
+        raise ValueError(f"Unknown team_game_log sport: {sport}")
+    params = {'since': since}
+    conn.execute(text(_prune_sql(sport)).bindparams(**params))
+    result = conn.execute(text(_upsert_sql(sport)).bindparams(**params))
+    return result.rowcount
+
+
+def sync_team_game_log(conn, sport: str, since: Optional[date] = None) -> int:
+    """
+    Bring ``sport``'s recent rows in team_game_log in line with its source table.
+
+    ``conn`` is a SQLAlchemy connection; the caller owns the transaction, so a
+    seed job's inserts and the log update commit together. Games from the last
+    SYNC_WINDOW_DAYS are always re-synced; ``since`` reaches further back for
+    jobs that (re)seed older dates. Returns the number of log rows written.
+    """
+    window_start = date.today() - timedelta(days=SYNC_WINDOW_DAYS)
+    return _sync(conn, sport, min(since, window_start) if since else window_start)
+
+
+def rebuild_team_game_log(conn, sport: str) -> int:
+    """Resync every game of ``sport`` (backfills and repairs)."""
+    return _sync(conn, sport, None)
+
+
+def _trigger_function(sport: str) -> str:
+    return f'team_game_log_sync_{sport}'
+
+
+def sync_trigger_statements(sport: str) -> List[str]:
+    """
+    DDL installing the triggers that keep ``sport``'s log rows in sync with
+    its source table.
+
+    One plpgsql function per sport handles three statement-level triggers
+    (transition tables need one event per trigger): deleted and updated games
+    lose their old rows, inserted and updated games are upserted, so a bulk
+    seed costs one set-based upsert per statement rather than one per row.
+    """
+    table = SOURCES[sport]['table']
+    function = _trigger_function(sport)
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {function}() RETURNS trigger
+        LANGUAGE plpgsql AS $fn$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM team_game_log t USING old_rows o
+                WHERE t.sport = '{sport}' AND t.game_id = o.game_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                {_upsert_sql(sport, 'new_rows')};
+            END IF;
+            RETURN NULL;
+        END
+        $fn$
+        """,
+        f"""
+        CREATE TRIGGER {function}_insert AFTER INSERT ON {table}
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """,
+        f"""
+        CREATE TRIGGER {function}_update AFTER UPDATE ON {table}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """,
+        f"""
+        CREATE TRIGGER {function}_delete AFTER DELETE ON {table}
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """,
+    ]
+
+
+def drop_sync_trigger_statements(sport: str) -> List[str]:
+    """DDL removing what sync_trigger_statements installed."""
+    table = SOURCES[sport]['table']
+    function = _trigger_function(sport)
+    return [
+        *(f'DROP TRIGGER IF EXISTS {function}_{event} ON {table}' for event in ('insert', 'update', 'delete')),
+        f'DROP FUNCTION IF EXISTS {function}()',
+    ]